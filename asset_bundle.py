@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离线页面打包 / Offline Dashboard Bundle
+生成的页面和 integrated_dashboard.html 在打开时从 cdn.jsdelivr.net 加载 Chart.js、date-fns适配器和缩放插件，
+首屏前需要三个阻塞的跨域请求，在隔离的工厂网络中页面无法显示。
+这里把这些脚本固定版本保存到 vendor/（联网时 fetch 一次，之后提交到仓库），
+打包时以内容哈希文件名复制到 dist/assets/ 并改写页面中的CDN地址（或直接内联），
+同时生成长期缓存响应头，得到完全离线的目录
+The generated pages and integrated_dashboard.html load Chart.js, the date-fns adapter and the
+zoom plugin from cdn.jsdelivr.net when opened: three blocking cross-origin requests before
+first paint, and the pages break on air-gapped plant networks. This module pins those scripts
+in vendor/ (fetched once on a networked machine, then committed), copies them into
+dist/assets/ under content-hash file names at build time and rewrites the CDN URLs in the
+pages (or inlines the scripts), with long-cache response headers, giving a fully offline
+directory
+
+用法 / Usage:
+    python asset_bundle.py fetch                 # 联网下载并锁定哈希 / download and lock hashes (needs network)
+    python asset_bundle.py build                 # dist/：页面 + assets/<名称>.<哈希>.js + _headers
+    python asset_bundle.py build --inline        # 脚本内联到页面中 / scripts inlined into the pages
+    python asset_bundle.py serve --port 8000     # 带缓存响应头的本地服务 / local server with the cache headers
+    python asset_bundle.py timing --runs 5       # 对比CDN与离线包的首屏时间 / first paint with vs without the CDN
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from fetch_cache import USER_AGENT, TIME_FORMAT
+
+try:
+    from selenium import webdriver
+    HAS_SELENIUM = True
+except ImportError:  # pragma: no cover - 取决于环境 / depends on the environment
+    webdriver = None
+    HAS_SELENIUM = False
+
+VENDOR_DIR = "vendor"
+BUNDLE_DIR = "dist"
+ASSETS_SUBDIR = "assets"
+
+# 锁定文件：每个脚本的来源、版本和SHA-256 / Lock file: source, version and SHA-256 of every script
+VENDOR_LOCK_FILE = "assets.lock.json"
+
+# 页面中使用的CDN地址 -> 固定版本的下载地址 / CDN URL used in the pages -> pinned download URL
+VENDOR_ASSETS = [
+    {
+        'name': 'chart',
+        'version': '4.4.1',
+        'cdn': 'https://cdn.jsdelivr.net/npm/chart.js',
+        'url': 'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.js',
+    },
+    {
+        'name': 'chartjs-adapter-date-fns',
+        'version': '3.0.0',
+        'cdn': 'https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns/dist/chartjs-adapter-date-fns.bundle.min.js',
+        'url': 'https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns@3.0.0/dist/chartjs-adapter-date-fns.bundle.min.js',
+    },
+    {
+        'name': 'chartjs-plugin-zoom',
+        'version': '2.0.1',
+        'cdn': 'https://cdn.jsdelivr.net/npm/chartjs-plugin-zoom/dist/chartjs-plugin-zoom.min.js',
+        'url': 'https://cdn.jsdelivr.net/npm/chartjs-plugin-zoom@2.0.1/dist/chartjs-plugin-zoom.min.js',
+    },
+]
+
+# 打包的页面 / Pages in the bundle
+BUNDLE_PAGES = [
+    "rubber_price_visualization.html",
+    "exchange_rate_visualization.html",
+    "commodity_visualization.html",
+    "integrated_dashboard.html",
+]
+
+# 内容哈希文件名永不变化，可以长期缓存；页面每次重新验证
+# Content-hash file names never change, so they cache for a year; pages revalidate every time
+LONG_CACHE = 'public, max-age=31536000, immutable'
+PAGE_CACHE = 'no-cache'
+
+# 外部脚本标签（不含 async/defer，会阻塞首屏）/ External script tags (no async/defer, so they block first paint)
+SCRIPT_TAG = re.compile(r'<script\s+src="(https?://[^"]+)"\s*>\s*</script>')
+LOCAL_SCRIPT_TAG = re.compile(r'<script\s+src="(?!https?://)([^"]+)"\s*>\s*</script>')
+
+
+def sha256_hex(content):
+    """SHA-256十六进制字符串 / SHA-256 hex digest"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def vendor_file_name(asset):
+    """vendor/ 中的文件名 / File name in vendor/"""
+    return f"{asset['name']}-{asset['version']}.js"
+
+
+def fingerprint_name(name, content):
+    """内容哈希文件名 / Content-hash file name, e.g. chart.3f2a9c1b7d0e.js"""
+    return f"{name}.{sha256_hex(content)[:12]}.js"
+
+
+def load_lock(vendor_dir=VENDOR_DIR):
+    """读取锁定文件，不存在时返回空字典 / Load the lock file, or an empty dict if missing"""
+    try:
+        with open(os.path.join(vendor_dir, VENDOR_LOCK_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _write_lock(lock, vendor_dir):
+    path = os.path.join(vendor_dir, VENDOR_LOCK_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(lock, f, ensure_ascii=False, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def fetch_assets(vendor_dir=VENDOR_DIR, assets=VENDOR_ASSETS, update=False, timeout=30):
+    """
+    下载固定版本的脚本到 vendor/ 并锁定哈希 / Download the pinned scripts into vendor/ and lock their hashes
+
+    已锁定的脚本内容变化时报错（固定版本不应变化），除非 update=True。
+    A locked script whose content changed raises (a pinned version must not change) unless update=True.
+
+    Args:
+        vendor_dir (str): 保存目录
+        assets (list): 脚本清单
+        update (bool): 接受新内容并更新锁定文件
+        timeout (int): 请求超时（秒）
+
+    Returns:
+        list: 每个脚本一项 {'name', 'file', 'bytes', 'sha256', 'changed'}
+    """
+    os.makedirs(vendor_dir, exist_ok=True)
+    lock = load_lock(vendor_dir)
+    results = []
+    for asset in assets:
+        request = urllib.request.Request(asset['url'], headers={'User-Agent': USER_AGENT})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            content = response.read()
+        digest = sha256_hex(content)
+
+        locked = lock.get(asset['name'])
+        if locked and locked['url'] == asset['url'] and locked['sha256'] != digest and not update:
+            raise ValueError(f"{asset['url']} no longer matches the locked sha256 {locked['sha256']} "
+                             f"(got {digest}); re-run with --update to accept it")
+
+        file_name = vendor_file_name(asset)
+        with open(os.path.join(vendor_dir, file_name), 'wb') as f:
+            f.write(content)
+        lock[asset['name']] = {
+            'version': asset['version'],
+            'cdn': asset['cdn'],
+            'url': asset['url'],
+            'file': file_name,
+            'sha256': digest,
+            'bytes': len(content),
+            'fetched_at': datetime.now().strftime(TIME_FORMAT),
+        }
+        results.append({'name': asset['name'], 'file': file_name, 'bytes': len(content), 'sha256': digest,
+                        'changed': not locked or locked['sha256'] != digest})
+    _write_lock(lock, vendor_dir)
+    return results
+
+
+def load_vendored(vendor_dir=VENDOR_DIR):
+    """
+    读取并校验已保存的脚本（不访问网络）/ Read and verify the vendored scripts, without touching the network
+
+    Returns:
+        dict: {CDN地址: {'name', 'version', 'content'}}
+    """
+    lock = load_lock(vendor_dir)
+    if not lock:
+        raise FileNotFoundError(f"No vendored assets in {vendor_dir}/: run `python asset_bundle.py fetch` "
+                                f"on a machine with network access and commit {vendor_dir}/")
+    vendored = {}
+    for name, entry in lock.items():
+        with open(os.path.join(vendor_dir, entry['file']), 'rb') as f:
+            content = f.read()
+        if sha256_hex(content) != entry['sha256']:
+            raise ValueError(f"{vendor_dir}/{entry['file']} does not match its locked sha256")
+        vendored[entry['cdn']] = {'name': name, 'version': entry['version'], 'content': content}
+    return vendored
+
+
+def inline_script(asset):
+    """内联脚本标签（避免脚本中的 "</script" 提前结束标签）/ Inline script tag, keeping "</script" in the code from closing it"""
+    code = asset['content'].decode('utf-8').replace('</script', '<\\/script')
+    return f"<script>/* {asset['name']} {asset['version']} */\n{code}\n</script>"
+
+
+def rewrite_page(html, vendored, asset_paths=None):
+    """
+    把CDN脚本标签改为本地文件或内联脚本 / Point CDN script tags at local files, or inline them
+
+    Args:
+        html (str): 页面
+        vendored (dict): load_vendored 的结果
+        asset_paths (dict): {CDN地址: 相对路径}；为None时内联
+
+    Returns:
+        tuple: (改写后的页面, 仍然引用的外部脚本列表)
+    """
+    external = []
+
+    def replace(match):
+        url = match.group(1)
+        if url not in vendored:
+            external.append(url)
+            return match.group(0)
+        if asset_paths is None:
+            return inline_script(vendored[url])
+        return f'<script src="{asset_paths[url]}"></script>'
+
+    return SCRIPT_TAG.sub(replace, html), external
+
+
+def write_headers_file(out_dir):
+    """
+    静态托管的缓存响应头（Netlify/Cloudflare Pages 的 _headers 格式）
+    Cache headers for static hosting, in the Netlify/Cloudflare Pages _headers format
+    """
+    with open(os.path.join(out_dir, '_headers'), 'w', encoding='utf-8') as f:
+        f.write(f"/{ASSETS_SUBDIR}/*\n  Cache-Control: {LONG_CACHE}\n\n/*.html\n  Cache-Control: {PAGE_CACHE}\n")
+
+
+def build_bundle(pages=BUNDLE_PAGES, out_dir=BUNDLE_DIR, inline=False, vendor_dir=VENDOR_DIR):
+    """
+    生成离线包 / Build the offline bundle
+
+    Args:
+        pages (list): 页面路径
+        out_dir (str): 输出目录
+        inline (bool): 脚本内联到页面中，而不是引用 assets/ 下的文件
+        vendor_dir (str): 已保存脚本的目录
+
+    Returns:
+        dict: {'pages': [{'page', 'path', 'bytes', 'external'}], 'assets': [相对路径], 'offline': bool}
+    """
+    vendored = load_vendored(vendor_dir)
+    assets_dir = os.path.join(out_dir, ASSETS_SUBDIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    asset_paths = None
+    if not inline:
+        os.makedirs(assets_dir, exist_ok=True)
+        asset_paths = {}
+        for url, asset in vendored.items():
+            file_name = fingerprint_name(asset['name'], asset['content'])
+            path = os.path.join(assets_dir, file_name)
+            if not os.path.exists(path):
+                with open(path, 'wb') as f:
+                    f.write(asset['content'])
+            asset_paths[url] = f"{ASSETS_SUBDIR}/{file_name}"
+
+    # 删除旧版本的指纹文件（内联时全部删除）/ Drop fingerprinted files of older versions, or all of them when inlining
+    if os.path.isdir(assets_dir):
+        current = {os.path.basename(path) for path in (asset_paths or {}).values()}
+        for file_name in os.listdir(assets_dir):
+            if file_name not in current:
+                os.remove(os.path.join(assets_dir, file_name))
+
+    results = []
+    for page in pages:
+        with open(page, 'r', encoding='utf-8') as f:
+            html, external = rewrite_page(f.read(), vendored, asset_paths)
+        path = os.path.join(out_dir, os.path.basename(page))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        results.append({'page': page, 'path': path, 'bytes': len(html.encode('utf-8')), 'external': external})
+
+    write_headers_file(out_dir)
+    return {
+        'pages': results,
+        'assets': sorted((asset_paths or {}).values()),
+        'offline': not any(result['external'] for result in results),
+    }
+
+
+class CacheHeadersHandler(SimpleHTTPRequestHandler):
+    """按 _headers 规则设置缓存响应头的静态文件服务 / Static file handler applying the _headers cache rules"""
+
+    def end_headers(self):
+        path = self.path.split('?', 1)[0]
+        if path.startswith(f'/{ASSETS_SUBDIR}/'):
+            self.send_header('Cache-Control', LONG_CACHE)
+        elif path.endswith('.html') or path.endswith('/'):
+            self.send_header('Cache-Control', PAGE_CACHE)
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(directory, port=0):
+    """
+    在后台线程启动静态文件服务 / Start a static file server in a background thread
+
+    Returns:
+        ThreadingHTTPServer: server.server_address[1] 为实际端口
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), partial(CacheHeadersHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _timed_get(url, timeout):
+    """新连接下载一个URL（冷缓存），返回 (毫秒, 错误) / Download a URL on a fresh connection (cold cache): (ms, error)"""
+    start = time.perf_counter()
+    try:
+        request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+        error = None
+    except (urllib.error.URLError, OSError) as e:
+        error = str(getattr(e, 'reason', e))
+    return (time.perf_counter() - start) * 1000, error
+
+
+def estimate_first_paint(page_url, timeout=10):
+    """
+    没有浏览器时的首屏估算：页面下载时间 + 阻塞脚本并行下载中最慢的一个
+    First-paint estimate without a browser: page download plus the slowest of the blocking
+    scripts fetched in parallel
+
+    Returns:
+        dict: {'ms', 'blocking', 'errors'}
+    """
+    page_ms, error = _timed_get(page_url, timeout)
+    if error:
+        return {'ms': None, 'blocking': 0, 'errors': [error]}
+    with urllib.request.urlopen(page_url, timeout=timeout) as response:
+        html = response.read().decode('utf-8')
+
+    base = page_url.rsplit('/', 1)[0] + '/'
+    scripts = SCRIPT_TAG.findall(html) + [base + src for src in LOCAL_SCRIPT_TAG.findall(html)]
+    timings = [None] * len(scripts)
+    threads = [threading.Thread(target=lambda i=i, url=url: timings.__setitem__(i, _timed_get(url, timeout)))
+               for i, url in enumerate(scripts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 任何阻塞脚本失败时页面无法正常显示图表，记为失败 / A failed blocking script leaves the charts broken: count it as a failure
+    errors = [f"{url}: {error}" for url, (_, error) in zip(scripts, timings) if error]
+    ms = None if errors else page_ms + max((ms for ms, _ in timings), default=0.0)
+    return {'ms': ms, 'blocking': len(scripts), 'errors': errors}
+
+
+def browser_first_paint(driver, page_url):
+    """
+    无头Chrome实测 first-contentful-paint（禁用缓存）/ first-contentful-paint measured in headless Chrome with the cache disabled
+
+    Returns:
+        dict: {'ms', 'blocking', 'errors'}
+    """
+    driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
+    driver.get(page_url)
+    ms = driver.execute_script(
+        "const entry = performance.getEntriesByName('first-contentful-paint')[0];"
+        "return entry ? entry.startTime : null;")
+    blocking = driver.execute_script("return document.querySelectorAll('head script[src]').length;")
+    return {'ms': ms, 'blocking': blocking, 'errors': [] if ms is not None else ['no paint entry']}
+
+
+def _headless_chrome():
+    """无头Chrome，无法启动时返回None / Headless Chrome, or None if it cannot start"""
+    if not HAS_SELENIUM:
+        return None
+    options = webdriver.ChromeOptions()
+    for argument in ('--headless=new', '--no-sandbox', '--disable-dev-shm-usage'):
+        options.add_argument(argument)
+    try:
+        return webdriver.Chrome(options=options)
+    except Exception:
+        return None
+
+
+def time_first_paint(pages=BUNDLE_PAGES, bundle_dir=BUNDLE_DIR, runs=3, timeout=10):
+    """
+    对比原始页面（CDN脚本）与离线包页面的首屏时间（取中位数）
+    Compare first paint of the original pages (CDN scripts) with the bundled pages, as medians
+
+    有selenium和Chrome时在无头Chrome中实测 first-contentful-paint，否则按网络请求估算。
+    Measures first-contentful-paint in headless Chrome when selenium and Chrome are available,
+    otherwise estimates it from the network requests.
+
+    Returns:
+        tuple: (方法 'browser' 或 'estimate', [{'page', 'cdn', 'offline'}])
+    """
+    source_dir = os.path.dirname(os.path.abspath(pages[0]))
+    source_server = start_server(source_dir)
+    bundle_server = start_server(os.path.abspath(bundle_dir))
+    driver = _headless_chrome()
+    measure = partial(browser_first_paint, driver) if driver else partial(estimate_first_paint, timeout=timeout)
+
+    results = []
+    try:
+        for page in pages:
+            name = os.path.basename(page)
+            row = {'page': name}
+            for label, server in (('cdn', source_server), ('offline', bundle_server)):
+                url = f"http://127.0.0.1:{server.server_address[1]}/{name}"
+                samples = [measure(url) for _ in range(runs)]
+                times = [sample['ms'] for sample in samples if sample['ms'] is not None]
+                row[label] = {
+                    'ms': statistics.median(times) if times else None,
+                    'blocking': samples[0]['blocking'],
+                    'errors': sorted({error for sample in samples for error in sample['errors']}),
+                }
+            results.append(row)
+    finally:
+        if driver:
+            driver.quit()
+        source_server.shutdown()
+        bundle_server.shutdown()
+    return ('browser' if driver else 'estimate'), results
+
+
+def main():
+    """主函数 / Main function"""
+    parser = argparse.ArgumentParser(description="离线页面打包 / Offline Dashboard Bundle")
+    parser.add_argument('--vendor-dir', default=VENDOR_DIR, help="已保存脚本的目录 / vendored scripts directory")
+    parser.add_argument('--out', default=BUNDLE_DIR, help="离线包目录 / bundle directory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fetch_parser = subparsers.add_parser('fetch', help="下载固定版本的脚本 / download the pinned scripts")
+    fetch_parser.add_argument('--update', action='store_true', help="接受内容变化并更新锁定 / accept changed content")
+
+    build_parser = subparsers.add_parser('build', help="生成离线包 / build the offline bundle")
+    build_parser.add_argument('pages', nargs='*', default=BUNDLE_PAGES)
+    build_parser.add_argument('--inline', action='store_true', help="脚本内联到页面中 / inline the scripts")
+
+    serve_parser = subparsers.add_parser('serve', help="带缓存响应头的本地服务 / serve the bundle with cache headers")
+    serve_parser.add_argument('--port', type=int, default=8000)
+
+    timing_parser = subparsers.add_parser('timing', help="对比首屏时间 / compare first paint")
+    timing_parser.add_argument('pages', nargs='*', default=BUNDLE_PAGES)
+    timing_parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == 'fetch':
+        for result in fetch_assets(args.vendor_dir, update=args.update):
+            status = "更新 / updated" if result['changed'] else "未变化 / unchanged"
+            print(f"📦 {result['file']}: {result['bytes'] / 1024:.1f} KB, sha256 {result['sha256'][:12]} ({status})")
+        print(f"✅ 已保存到 / Vendored into: {args.vendor_dir}/")
+
+    elif args.command == 'build':
+        try:
+            report = build_bundle(args.pages, args.out, inline=args.inline, vendor_dir=args.vendor_dir)
+        except (OSError, ValueError) as e:
+            print(f"❌ 离线包生成失败 / Offline bundle failed: {e}")
+            return 1
+        for asset in report['assets']:
+            print(f"📦 {asset}")
+        for page in report['pages']:
+            print(f"📄 {page['path']}: {page['bytes'] / 1024:.1f} KB")
+            for url in page['external']:
+                print(f"   ⚠️ 未打包的外部脚本 / External script not bundled: {url}")
+        if not report['offline']:
+            print("❌ 离线包仍依赖外部脚本 / The bundle still depends on external scripts")
+            return 1
+        print(f"✅ 离线包已生成 / Offline bundle ready: {args.out}/")
+
+    elif args.command == 'serve':
+        server = ThreadingHTTPServer(('127.0.0.1', args.port), partial(CacheHeadersHandler, directory=args.out))
+        print(f"🌐 http://127.0.0.1:{args.port}/ ({args.out}/, Ctrl+C 停止 / to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.shutdown()
+
+    elif args.command == 'timing':
+        method, results = time_first_paint(args.pages, args.out, runs=args.runs)
+        label = "无头Chrome实测 / headless Chrome FCP" if method == 'browser' else "网络请求估算 / network estimate"
+        print(f"⏱️ 首屏时间（{args.runs}次中位数）/ First paint, median of {args.runs} runs: {label}")
+        for row in results:
+            cells = []
+            for key in ('cdn', 'offline'):
+                result = row[key]
+                value = f"{result['ms']:8.1f} ms" if result['ms'] is not None else "  failed   "
+                cells.append(f"{key} {value} ({result['blocking']} blocking)")
+            print(f"   {row['page']:<36} {'  '.join(cells)}")
+            for key in ('cdn', 'offline'):
+                for error in row[key]['errors']:
+                    print(f"      ⚠️ {key}: {error}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
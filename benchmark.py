@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能基准测试 / Performance Benchmarks
+在合成数据上对比数据管道各环节新旧实现的耗时，并校验输出一致
+Compares old and new implementations of pipeline steps on synthetic data and checks
+that their outputs match
+
+用法 / Usage:
+    python benchmark.py txt --lines 2000000
+    python benchmark.py provenance --rows 50000
+    python benchmark.py excel --rows 1000000
+    python benchmark.py comparisons --series 1000
+    python benchmark.py payload --series 500
+    python benchmark.py templates --pages 500
+    python benchmark.py lttb --points 1000000 --max-points 500
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from frame_accumulator import concat_frames, peak_rss_mb
+from output_sinks import ExcelSink
+from txt_parser import read_txt_columns
+from provenance import add_provenance, split_provenance, memory_per_row, as_object_columns
+from chart_payload import aligned_payload, encode_payload, series_payload, lttb_indices
+from series_analytics import latest_comparisons, comparison_table, year_month_pivot, period_labels, change_points, heatmap_html
+from page_templates import load_template, render_page, number_display, change_slots, generated_at
+
+
+def legacy_read_txt_data(file_path):
+    """
+    逐行解析的旧版文本读取（作为参考实现）/ Line-by-line text reader (reference implementation)
+    """
+    data = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                if ':' in line:
+                    parts = line.split(':', 1)
+                    if len(parts) == 2:
+                        date_str = parts[0].strip()
+                        value_str = parts[1].strip()
+                        try:
+                            value = float(value_str.split()[0])
+                            data.append({'Date': date_str, 'Value': value})
+                        except:
+                            pass
+    return pd.DataFrame(data)
+
+
+def write_synthetic_txt(file_path, lines, seed=0):
+    """
+    生成rubber_prices.txt格式的合成文件，混入注释、空行和无效数值
+    Write a synthetic rubber_prices.txt-style file mixed with comments, blank lines and invalid values
+    """
+    rng = random.Random(seed)
+    noise = ['', '# comment', '   ', 'no colon here', '2001M01:', '2001M02: n/a $/kg', '  # indented: 1.0']
+    with open(file_path, 'w', encoding='utf-8') as f:
+        for i in range(lines):
+            if i % 1000 == 999:
+                f.write(rng.choice(noise) + '\n')
+                continue
+            year = 1999 + (i // 12) % 200
+            month = i % 12 + 1
+            f.write(f"{year}M{month:02d}: {rng.uniform(0.3, 3.0):.4f} $/kg\n")
+
+
+def timed(func, *args):
+    """返回 (结果, 耗时秒数) / Return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_txt(args):
+    """文本解析基准 / Text parser benchmark"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'rubber_prices.txt')
+        print(f"📝 生成合成文件 / Writing synthetic file: {args.lines:,} 行 / lines")
+        write_synthetic_txt(file_path, args.lines)
+        print(f"   文件大小 / File size: {os.path.getsize(file_path) / 1024 / 1024:.1f} MB")
+
+        legacy_df, legacy_seconds = timed(legacy_read_txt_data, file_path)
+        new_df, new_seconds = timed(read_txt_columns, file_path)
+
+    pd.testing.assert_frame_equal(legacy_df, new_df)
+    print(f"✅ 输出一致 / Outputs identical: {len(new_df):,} 行 / rows")
+    print(f"   逐行解析 / Line-by-line: {legacy_seconds:.3f}s")
+    print(f"   向量化解析 / Vectorized:  {new_seconds:.3f}s ({legacy_seconds / new_seconds:.1f}x)")
+
+
+def synthetic_module_frames(rows, seed=0):
+    """
+    两个模块共享一个工作表的合成数据（带数据源信息列）/ Synthetic frames of two modules sharing a sheet, with provenance
+    """
+    rng = random.Random(seed)
+    frames = []
+    for source_file, data_source in [('combined_data.xlsx', 'BLS Data Scraper'),
+                                     ('PCU314994314994_processed.xlsx', 'FRED Data Scraper')]:
+        count = rows // 2
+        df = pd.DataFrame({
+            'Date': [f"{1999 + i // 12 % 200}M{i % 12 + 1:02d}" for i in range(count)],
+            'Value': [round(rng.uniform(50, 300), 1) for _ in range(count)],
+        })
+        add_provenance(df, source_file, data_source, '2025-07-02 10:27:31')
+        frames.append(df)
+    return concat_frames(frames)
+
+
+def bench_provenance(args):
+    """数据源信息列内存和文件大小对比 / Provenance column memory and file size comparison"""
+    data = synthetic_module_frames(args.rows)
+    legacy = as_object_columns(data)
+    compact, runs = split_provenance('Commodity_Data', data)
+
+    print(f"🧮 每行内存 / Memory per row ({len(data):,} 行 / rows):")
+    print(f"   逐行字符串 / Per-row strings: {memory_per_row(legacy):.1f} B")
+    print(f"   分类列 / Categorical:         {memory_per_row(data):.1f} B")
+    print(f"   拆分后数据 / Split data:       {memory_per_row(compact):.1f} B (+ {len(runs)} 个行段 / row runs)")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sizes = {}
+        for label, sheets in [('legacy', {'Commodity_Data': legacy}),
+                              ('split', {'Commodity_Data': compact, 'Provenance': runs})]:
+            xlsx_path = os.path.join(tmp_dir, f'{label}.xlsx')
+            with pd.ExcelWriter(xlsx_path, engine='openpyxl') as writer:
+                for sheet_name, df in sheets.items():
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+            csv_size = 0
+            for sheet_name, df in sheets.items():
+                csv_path = os.path.join(tmp_dir, f'{label}_{sheet_name}.csv')
+                df.to_csv(csv_path, index=False, encoding='utf-8')
+                csv_size += os.path.getsize(csv_path)
+            sizes[label] = (os.path.getsize(xlsx_path), csv_size)
+
+    for label, (xlsx_size, csv_size) in sizes.items():
+        print(f"   {label:7s} xlsx: {xlsx_size / 1024:8.1f} KB   csv: {csv_size / 1024:8.1f} KB")
+
+
+def synthetic_sheet(rows, seed=0):
+    """整合工作表形状的合成数据 / Synthetic data shaped like an integrated sheet"""
+    rng = random.Random(seed)
+    index = range(rows)
+    return pd.DataFrame({
+        'Date': [f"{1999 + i // 12 % 200}M{i % 12 + 1:02d}" for i in index],
+        'Series_Id': [f"PCU{325211 + i % 500}" for i in index],
+        'Value': [round(rng.uniform(50, 300), 1) for _ in index],
+        'Change': [rng.uniform(-5, 5) for _ in index],
+        'Unit': ['Index'] * rows,
+    })
+
+
+def excel_write_worker(args):
+    """
+    在独立进程中写出一次工作簿并输出耗时和峰值内存（JSON）
+    Write the workbook once in a fresh process and print wall time and peak RSS as JSON
+    """
+    data = synthetic_sheet(args.rows)
+    baseline = peak_rss_mb()
+    sheets = {
+        'Summary': pd.DataFrame({'Module': ['Synthetic'], 'Records_Count': [len(data)]}),
+        'Commodity_Data': data,
+        'Empty_Sheet': pd.DataFrame({'Status': ['No data available'], 'Message': ['No output data found'],
+                                     'Generated_At': ['2025-07-02 10:27:31']}),
+    }
+    sink = ExcelSink(args.output, prime_cache=False, streaming=args.mode == 'streaming')
+    start = time.perf_counter()
+    sink.write(sheets)
+    seconds = time.perf_counter() - start
+    print(json.dumps({'seconds': seconds, 'baseline_rss_mb': baseline, 'peak_rss_mb': peak_rss_mb()}))
+
+
+def bench_excel(args):
+    """标准与流式Excel写出对比 / Standard vs streaming Excel writer comparison"""
+    print(f"📝 写出合成工作表 / Writing synthetic sheet: {args.rows:,} 行 / rows")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mode in ('standard', 'streaming'):
+            output = os.path.join(tmp_dir, f'{mode}.xlsx')
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '_excel_worker', '--mode', mode,
+                 '--rows', str(args.rows), '--output', output],
+                capture_output=True, text=True, check=True
+            )
+            results[mode] = json.loads(completed.stdout.strip().splitlines()[-1])
+            results[mode]['size_mb'] = os.path.getsize(output) / 1024 / 1024
+
+        standard = pd.read_excel(os.path.join(tmp_dir, 'standard.xlsx'), sheet_name=None)
+        streaming = pd.read_excel(os.path.join(tmp_dir, 'streaming.xlsx'), sheet_name=None)
+    for sheet_name, df in standard.items():
+        pd.testing.assert_frame_equal(df, streaming[sheet_name])
+    print(f"✅ 内容一致 / Contents identical: {', '.join(standard)}")
+
+    for mode, result in results.items():
+        print(f"   {mode:9s} {result['seconds']:8.2f}s   峰值内存 / peak RSS: {result['peak_rss_mb']} MB "
+              f"(数据 / data: {result['baseline_rss_mb']} MB)   {result['size_mb']:.1f} MB")
+
+
+def legacy_latest_comparisons(df):
+    """
+    逐个序列排序、布尔筛选的旧版同比环比（作为参考实现）/ Per-series sort and mask-scan comparisons (reference implementation)
+    """
+    comparisons = {}
+    for product in df['Product'].unique():
+        product_data = df[df['Product'] == product].sort_values(['Year', 'Month'])
+        latest = product_data.iloc[-1]
+        prev_month_value = product_data.iloc[-2]['Value'] if len(product_data) >= 2 else None
+        same_month_last_year = product_data[(product_data['Year'] == latest['Year'] - 1) &
+                                            (product_data['Month'] == latest['Month'])]
+        same_month_last_year_value = same_month_last_year.iloc[0]['Value'] if not same_month_last_year.empty else None
+        mom_change = ((latest['Value'] - prev_month_value) / prev_month_value * 100) if prev_month_value is not None else None
+        yoy_change = ((latest['Value'] - same_month_last_year_value) / same_month_last_year_value * 100) \
+            if same_month_last_year_value is not None else None
+        comparisons[product] = {
+            'latest': {'year': int(latest['Year']), 'month': int(latest['Month']), 'value': float(latest['Value']),
+                       'date_str': f"{latest['Year']}年{latest['Month']}月"},
+            'prev_month': {'value': float(prev_month_value) if prev_month_value is not None else None,
+                           'change': float(mom_change) if mom_change is not None else None},
+            'same_month_last_year': {'value': float(same_month_last_year_value) if same_month_last_year_value is not None else None,
+                                     'change': float(yoy_change) if yoy_change is not None else None},
+        }
+    return comparisons
+
+
+def synthetic_products(series, months=120, seed=0):
+    """
+    多个产品的月度合成数据（随机缺失约5%的月份）/ Monthly synthetic data of many products, with about 5% of months missing
+    """
+    rng = np.random.default_rng(seed)
+    index = np.arange(series * months)
+    df = pd.DataFrame({
+        'Year': 2015 + (index % months) // 12,
+        'Month': (index % months) % 12 + 1,
+        'Value': rng.uniform(50, 300, len(index)).round(1),
+        'Product': np.char.add('P', (index // months).astype(str)),
+    })
+    return df[rng.random(len(df)) >= 0.05].sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def bench_comparisons(args):
+    """同比环比计算基准 / Comparison engine benchmark"""
+    timings = {}
+    for series in (max(1, args.series // 10), args.series):
+        df = synthetic_products(series, args.months)
+        result, timings[series] = timed(latest_comparisons, df, 'Product')
+        print(f"   向量化 / Vectorized: {series:,} 个序列 / series, {len(df):,} 行 / rows: {timings[series]:.3f}s")
+
+    legacy, legacy_seconds = timed(legacy_latest_comparisons, df)
+    assert legacy == result, "comparison results differ"
+    print(f"✅ 输出一致 / Outputs identical: {len(result):,} 个序列 / series")
+    print(f"   逐序列筛选 / Per-series scan: {legacy_seconds:.3f}s")
+    print(f"   向量化 / Vectorized:          {timings[args.series]:.3f}s ({legacy_seconds / timings[args.series]:.1f}x)")
+    history, history_seconds = timed(comparison_table, df, 'Product')
+    pivot, pivot_seconds = timed(year_month_pivot, history, 'yoy_change')
+    print(f"   完整历史 / Full history: {len(history):,} 行 / rows in {history_seconds:.3f}s, "
+          f"年×月透视 / year x month pivot: {len(pivot):,} 行 / rows in {pivot_seconds:.3f}s")
+    small, large = sorted(timings)
+    if small != large:
+        print(f"   序列数 ×{large // small}，耗时 ×{timings[large] / timings[small]:.1f} / "
+              f"{large // small}x series, {timings[large] / timings[small]:.1f}x time")
+
+
+def legacy_line_datasets(df, colors):
+    """
+    逐产品筛选、iterrows逐行构建的旧版图表数据（作为参考实现）/ Per-product filter and iterrows payload (reference implementation)
+    """
+    chart_datasets = []
+    for i, product in enumerate(df['Product'].unique()):
+        product_data = df[df['Product'] == product].sort_values(['Year', 'Month'], kind='stable')
+        chart_data = []
+        for _, row in product_data.iterrows():
+            chart_data.append({
+                'x': f"{int(row['Year'])}-{int(row['Month']):02d}",
+                'y': float(row['Value'])
+            })
+        chart_datasets.append({
+            'label': product,
+            'data': chart_data,
+            'borderColor': colors[i % len(colors)],
+            'backgroundColor': colors[i % len(colors)] + '20',
+            'fill': False,
+            'tension': 0.4
+        })
+    return chart_datasets
+
+
+def bench_payload(args):
+    """图表数据序列化基准 / Chart payload serialization benchmark"""
+    colors = ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF']
+    df = synthetic_products(args.series, args.months)
+    print(f"📝 合成数据 / Synthetic data: {args.series:,} 个序列 / series, {len(df):,} 行 / rows")
+
+    legacy, legacy_seconds = timed(lambda: json.dumps(legacy_line_datasets(df, colors), indent=8))
+    compact, compact_seconds = timed(
+        lambda: encode_payload(aligned_payload(df['Product'], df['Year'], df['Month'], df['Value'], decimals=3)))
+
+    # 解码后逐点核对 / Decode and compare point by point
+    payload = json.loads(compact)
+    for dataset in json.loads(legacy):
+        values = dict(zip(payload['labels'], payload['series'][dataset['label']]))
+        assert all(values[point['x']] == round(point['y'], 3) for point in dataset['data']), "chart payloads differ"
+        assert sum(value is not None for value in values.values()) == len(dataset['data']), "chart payloads differ"
+    print(f"✅ 数据一致 / Same points: {len(payload['series']):,} 个序列 / series")
+    print(f"   iterrows + indent=8:  {legacy_seconds:.3f}s  {len(legacy.encode('utf-8')) / 1024:9.1f} KB")
+    print(f"   紧凑列式 / Compact:    {compact_seconds:.3f}s  {len(compact.encode('utf-8')) / 1024:9.1f} KB "
+          f"({legacy_seconds / compact_seconds:.1f}x, {len(legacy) / len(compact):.1f}x smaller)")
+
+
+def page_contexts(df):
+    """
+    每个合成序列一页（橡胶价格页面）的插槽 / Slots of one rubber-style page per synthetic series
+    """
+    history = comparison_table(df, key='Product')
+    pivot = year_month_pivot(history, 'yoy_change')
+    latest = latest_comparisons(df, key='Product')
+    contexts = []
+    for product, table in history.groupby('key', sort=False):
+        comp = latest[product]
+        contexts.append({
+            'latest_value': f"{comp['latest']['value']:.4f}",
+            'latest_date': comp['latest']['date_str'],
+            'first_year': int(table['year'].min()),
+            'latest_year': comp['latest']['year'],
+            'mom_value': number_display(comp['prev_month']['value'], '.4f'),
+            'yoy_value': number_display(comp['same_month_last_year']['value'], '.4f'),
+            **change_slots(comp['prev_month']['change'], 'mom'),
+            **change_slots(comp['same_month_last_year']['change'], 'yoy'),
+            'chart_data': series_payload(period_labels(table), table['value'], decimals=4),
+            'yoy_data': change_points(table, 'yoy_change'),
+            'yoy_heatmap': heatmap_html(pivot.loc[product].dropna(how='all')),
+            'generated_at': generated_at(),
+        })
+    return contexts
+
+
+def bench_templates(args):
+    """页面模板渲染基准 / Page template rendering benchmark"""
+    df = synthetic_products(args.pages, args.months)
+    contexts = page_contexts(df)
+    print(f"📝 合成数据 / Synthetic data: {len(contexts):,} 个页面 / pages, {len(df):,} 行 / rows")
+
+    def recompiled():
+        # 每页重新读取并编译模板（相当于每次调用都重建整个骨架）/ Re-read and compile per page, like rebuilding the whole skeleton on every call
+        pages = []
+        for context in contexts:
+            load_template.cache_clear()
+            pages.append(render_page('rubber_price.html', **context))
+        return pages
+
+    legacy, legacy_seconds = timed(recompiled)
+    cached, cached_seconds = timed(lambda: [render_page('rubber_price.html', **context) for context in contexts])
+    assert legacy == cached, "rendered pages differ"
+
+    print(f"✅ 页面一致 / Pages identical: {len(cached):,}, 平均 / average {sum(map(len, cached)) / len(cached) / 1024:.1f} KB")
+    print(f"   每页编译 / Compile per page:  {legacy_seconds:.3f}s  ({len(contexts) / legacy_seconds:,.0f} pages/s)")
+    print(f"   编译一次 / Compiled once:     {cached_seconds:.3f}s  ({len(contexts) / cached_seconds:,.0f} pages/s, "
+          f"{legacy_seconds / cached_seconds:.1f}x)")
+
+
+def legacy_lttb(y, max_points):
+    """
+    逐点循环的经典LTTB（作为参考实现）/ Classic point-by-point LTTB loop (reference implementation)
+    """
+    n = len(y)
+    if n <= max_points:
+        return list(range(n))
+    edges = [int(1 + b * (n - 2) / (max_points - 2)) for b in range(max_points - 1)]
+    edges[-1] = n - 1
+    selected = [0]
+    a = 0
+    for b in range(max_points - 2):
+        if b < max_points - 3:
+            lo, hi = edges[b + 1], edges[b + 2]
+            next_x = sum(range(lo, hi)) / (hi - lo)
+            next_y = sum(y[lo:hi]) / (hi - lo)
+        else:
+            next_x, next_y = n - 1, y[n - 1]
+        best, best_area = edges[b], -1.0
+        for i in range(edges[b], edges[b + 1]):
+            area = abs((a - next_x) * (y[i] - y[a]) - (a - i) * (next_y - y[a]))
+            if area > best_area:
+                best, best_area = i, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def bench_lttb(args):
+    """LTTB降采样基准 / LTTB downsampling benchmark"""
+    rng = np.random.default_rng(0)
+    y = np.cumsum(rng.normal(0, 1, args.points))
+    print(f"📝 合成数据 / Synthetic data: {args.points:,} 个点 / points, 预算 / budget {args.max_points:,}")
+
+    legacy, legacy_seconds = timed(legacy_lttb, y.tolist(), args.max_points)
+    vectorized, vectorized_seconds = timed(lttb_indices, y, args.max_points)
+    assert legacy == vectorized.tolist(), "selected points differ"
+
+    print(f"✅ 保留点一致 / Same points kept: {len(vectorized):,}")
+    print(f"   逐点循环 / Point loop:    {legacy_seconds:.3f}s")
+    print(f"   向量化 / Vectorized:      {vectorized_seconds:.3f}s ({legacy_seconds / vectorized_seconds:.1f}x)")
+
+
+def main():
+    """主函数 / Main function"""
+    parser = argparse.ArgumentParser(description="性能基准测试 / Performance Benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    txt_parser = subparsers.add_parser('txt', help="rubber_prices.txt 解析 / rubber_prices.txt parsing")
+    txt_parser.add_argument('--lines', type=int, default=2_000_000)
+    txt_parser.set_defaults(func=bench_txt)
+
+    provenance_parser = subparsers.add_parser('provenance', help="数据源信息列内存 / provenance column memory")
+    provenance_parser.add_argument('--rows', type=int, default=50_000)
+    provenance_parser.set_defaults(func=bench_provenance)
+
+    excel_parser = subparsers.add_parser('excel', help="标准与流式Excel写出 / standard vs streaming Excel writer")
+    excel_parser.add_argument('--rows', type=int, default=1_000_000)
+    excel_parser.set_defaults(func=bench_excel)
+
+    comparisons_parser = subparsers.add_parser('comparisons', help="同比环比计算 / MoM and YoY comparisons")
+    comparisons_parser.add_argument('--series', type=int, default=1000)
+    comparisons_parser.add_argument('--months', type=int, default=120)
+    comparisons_parser.set_defaults(func=bench_comparisons)
+
+    payload_parser = subparsers.add_parser('payload', help="图表数据序列化 / chart payload serialization")
+    payload_parser.add_argument('--series', type=int, default=500, help="默认为当前产品数的100倍 / default is 100x today's products")
+    payload_parser.add_argument('--months', type=int, default=130)
+    payload_parser.set_defaults(func=bench_payload)
+
+    templates_parser = subparsers.add_parser('templates', help="页面模板渲染 / page template rendering")
+    templates_parser.add_argument('--pages', type=int, default=500)
+    templates_parser.add_argument('--months', type=int, default=130)
+    templates_parser.set_defaults(func=bench_templates)
+
+    lttb_parser = subparsers.add_parser('lttb', help="LTTB降采样 / LTTB downsampling")
+    lttb_parser.add_argument('--points', type=int, default=1_000_000)
+    lttb_parser.add_argument('--max-points', type=int, default=500)
+    lttb_parser.set_defaults(func=bench_lttb)
+
+    worker_parser = subparsers.add_parser('_excel_worker')
+    worker_parser.add_argument('--mode', choices=['standard', 'streaming'], required=True)
+    worker_parser.add_argument('--rows', type=int, required=True)
+    worker_parser.add_argument('--output', required=True)
+    worker_parser.set_defaults(func=excel_write_worker)
+
+    args = parser.parse_args()
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可视化页面构建 / Visualization Page Build
+一个入口生成三个可视化页面：构建清单为每个HTML记录输入数据、生成脚本（含其导入的本地模块）
+和页面模板的内容哈希以及输出文件的哈希，都未变化的页面直接跳过，类似make但按内容判断
+One entry point for the three visualization pages: the build manifest records, for every HTML
+output, content hashes of its input data, its generator script (with the local modules
+it imports) and its page template, plus the output's own hash; pages where none of them
+changed are skipped, like make but content-hashed
+
+输入 / Inputs:
+    页面实际读取的序列行（数据库或列式数据集中该页面的序列、列和年份）的内容哈希；
+    没有序列数据时为页面回退读取的CSV文件
+    A content hash of the series rows the page actually reads (its series, columns and years
+    from the database or the columnar store), or the CSV files the page falls back to when there
+    is no series data
+
+用法 / Usage:
+    python build.py                      # 只重建输入变化的页面 / rebuild only pages whose inputs changed
+    python build.py commodity --force    # 强制重建指定页面 / force-rebuild the given page
+    python build.py --bundle --inline    # 之后生成离线包 / then build the offline bundle
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib
+import json
+import os
+import sys
+from datetime import datetime
+
+from asset_bundle import BUNDLE_DIR, BUNDLE_PAGES, build_bundle
+from output_sinks import frame_hash
+from page_templates import template_digest
+
+# 页面生成脚本（模块名）/ Page generator scripts, by module name
+PAGES = [
+    'rubber_price_visualization',
+    'exchange_rate_visualization',
+    'commodity_visualization',
+]
+
+MANIFEST_FILE = "build_manifest.json"
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def file_digest(path):
+    """
+    文件内容哈希；目录为所有文件相对路径和内容的哈希 / Content hash of a file, or of every file's relative path and content for a directory
+
+    Returns:
+        str: SHA-256十六进制字符串；不存在时为None
+    """
+    if os.path.isdir(path):
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for file_name in sorted(files):
+                file_path = os.path.join(root, file_name)
+                digest.update(os.path.relpath(file_path, path).replace(os.sep, '/').encode('utf-8'))
+                digest.update(file_digest(file_path).encode('ascii'))
+        return digest.hexdigest()
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def local_modules(module_name, found=None):
+    """
+    脚本及其递归导入的本地模块（项目目录中的.py文件）/ A script and the local modules (.py files in the project) it imports, recursively
+
+    Returns:
+        list: 模块名（排序）
+    """
+    found = set() if found is None else found
+    path = os.path.join(PROJECT_DIR, f"{module_name}.py")
+    if module_name in found or not os.path.exists(path):
+        return sorted(found)
+    found.add(module_name)
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            local_modules(name.split('.')[0], found)
+    return sorted(found)
+
+
+def generator_digest(module_name):
+    """生成脚本版本：脚本和本地模块源码的哈希 / Generator version: hash of the script's and its local modules' sources"""
+    digest = hashlib.sha256()
+    for name in local_modules(module_name):
+        digest.update(name.encode('utf-8'))
+        digest.update(file_digest(os.path.join(PROJECT_DIR, f"{name}.py")).encode('ascii'))
+    return digest.hexdigest()
+
+
+def page_inputs(module):
+    """
+    页面实际读取的输入及其哈希 / The inputs a page actually reads, with their hashes
+
+    有序列数据时为页面读取的行（read_page_series 的结果，只含页面的序列、列和年份），
+    其他序列或页面范围之外的修订不会触发重建；没有时为页面回退读取的CSV文件
+    With series data this is the rows the page reads (read_page_series: only the page's series,
+    columns and years), so other series or revisions outside the page's window do not trigger a
+    rebuild; otherwise it is the CSV files the page falls back to
+
+    Returns:
+        dict: {输入: SHA-256 或 None（不存在）}
+    """
+    series = module.read_page_series()
+    if series is not None and not series.empty:
+        return {f"{module.INTEGRATED_FILE}#series": frame_hash(series.reset_index(drop=True))}
+    return {path: file_digest(path) for path in module.CSV_FILES}
+
+
+def page_state(module_name):
+    """
+    页面当前的输入和版本 / Current inputs and versions of a page
+
+    Returns:
+        dict: {'inputs', 'generator', 'template'}
+    """
+    module = importlib.import_module(module_name)
+    return {
+        'inputs': page_inputs(module),
+        'generator': generator_digest(module_name),
+        'template': template_digest(module.TEMPLATE),
+    }
+
+
+def load_manifest(manifest_file=MANIFEST_FILE):
+    """读取构建清单，不存在或损坏时返回空字典 / Load the build manifest, or an empty dict if missing or corrupt"""
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, manifest_file=MANIFEST_FILE):
+    """原子写入构建清单 / Atomically write the build manifest"""
+    with open(manifest_file + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(manifest_file + '.tmp', manifest_file)
+
+
+def stale_reason(entry, state, output_file):
+    """
+    需要重建的原因，不需要时为None / Why a page must be rebuilt, or None if it is up to date
+
+    Returns:
+        str: 'new'、'inputs'、'generator'、'template' 或 'output'
+    """
+    if not entry:
+        return 'new'
+    for key in ('inputs', 'generator', 'template'):
+        if entry.get(key) != state[key]:
+            return key
+    # 输出被删除或手工修改 / Output deleted or edited by hand
+    if entry.get('output') != file_digest(output_file):
+        return 'output'
+    return None
+
+
+def build_pages(pages=PAGES, manifest_file=MANIFEST_FILE, force=False):
+    """
+    重建输入或版本变化的页面 / Rebuild pages whose inputs or versions changed
+
+    Args:
+        pages (list): 生成脚本模块名
+        manifest_file (str): 构建清单路径
+        force (bool): 忽略清单，全部重建
+
+    Returns:
+        list: 每个页面一项 {'page', 'output', 'reason', 'built', 'status'}；reason为None表示已跳过
+    """
+    manifest = load_manifest(manifest_file)
+    results = []
+    for module_name in pages:
+        module = importlib.import_module(module_name)
+        state = page_state(module_name)
+        reason = 'force' if force else stale_reason(manifest.get(module.OUTPUT_FILE), state, module.OUTPUT_FILE)
+        result = {'page': module_name, 'output': module.OUTPUT_FILE, 'reason': reason, 'built': False, 'status': 0}
+
+        if reason is not None:
+            result['status'] = module.main()
+            result['built'] = result['status'] == 0
+            if result['built']:
+                manifest[module.OUTPUT_FILE] = {
+                    'generator_module': module_name,
+                    **state,
+                    'output': file_digest(module.OUTPUT_FILE),
+                    'built_at': datetime.now().strftime(TIME_FORMAT),
+                }
+                # 每个页面完成后保存，中断时已完成的页面不会重建 / Save after every page so an interrupted build keeps finished pages
+                save_manifest(manifest, manifest_file)
+        results.append(result)
+    return results
+
+
+def resolve_pages(names):
+    """命令行页面名（模块名、简称或HTML文件名）转换为模块名 / Command-line page names (module, short name or HTML file) to module names"""
+    resolved = []
+    for name in names:
+        stem = os.path.splitext(os.path.basename(name))[0]
+        matches = [page for page in PAGES if page in (stem, f"{stem}_visualization")]
+        if not matches:
+            raise ValueError(f"Unknown page: {name} (available: {', '.join(PAGES)})")
+        resolved.extend(matches)
+    return resolved
+
+
+def main():
+    """主函数 / Main function"""
+    parser = argparse.ArgumentParser(description="可视化页面构建 / Visualization Page Build")
+    parser.add_argument('pages', nargs='*', help="页面（默认全部）/ pages, all by default")
+    parser.add_argument('--force', action='store_true', help="忽略构建清单，全部重建 / ignore the manifest and rebuild")
+    parser.add_argument('--manifest', default=MANIFEST_FILE, help="构建清单路径 / build manifest path")
+    parser.add_argument('--bundle', action='store_true', help="之后生成离线包 / then build the offline bundle")
+    parser.add_argument('--inline', action='store_true', help="离线包内联脚本 / inline scripts in the bundle")
+    parser.add_argument('--out', default=BUNDLE_DIR, help="离线包目录 / bundle directory")
+    args = parser.parse_args()
+
+    pages = resolve_pages(args.pages) if args.pages else PAGES
+    results = build_pages(pages, args.manifest, force=args.force)
+
+    print("=" * 60)
+    print("🏗️ 构建结果 / Build results:")
+    for result in results:
+        if result['reason'] is None:
+            print(f"   ⏭️ {result['output']}: 输入未变化，跳过 / inputs unchanged, skipped")
+        elif result['built']:
+            print(f"   ✅ {result['output']}: 已重建 / rebuilt ({result['reason']})")
+        else:
+            print(f"   ❌ {result['output']}: 生成失败 / generation failed ({result['reason']})")
+    failed = [result for result in results if result['reason'] is not None and not result['built']]
+
+    offline = True
+    if args.bundle and not failed:
+        try:
+            report = build_bundle(BUNDLE_PAGES, args.out, inline=args.inline)
+        except (OSError, ValueError) as e:
+            # 没有已保存或校验不通过的脚本 / Vendored scripts missing or failing their locked hash
+            print(f"❌ 离线包生成失败 / Offline bundle failed: {e}")
+            offline = False
+        else:
+            offline = report['offline']
+            print(f"📦 离线包 / Offline bundle: {args.out}/ ({len(report['pages'])} 个页面 / pages)")
+            if not offline:
+                print("❌ 离线包仍依赖外部脚本 / The bundle still depends on external scripts")
+
+    print("=" * 60)
+    return 1 if failed or not offline else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+紧凑图表数据 / Compact Chart Payload
+直接从带类型的列（numpy数组）生成图表数据，不再用 iterrows 逐行构建字典。
+每个图表只有一条共用的时间轴，每个序列一个固定精度的数值数组（缺失为null），
+序列化时不缩进，嵌入页面的数据比每个点一个 {"x": ..., "y": ...} 对象小一个数量级
+Builds chart data straight from typed columns (numpy arrays) instead of walking rows
+with iterrows. Each chart has one shared period axis and one fixed-precision value array
+per series (null where missing), serialized without indentation, so the embedded data is
+an order of magnitude smaller than one {"x": ..., "y": ...} object per point
+
+格式 / Format:
+    单个序列 / single series:  {"labels": ["2015-01", ...], "values": [1.4198, ...]}
+    多个序列 / several series: {"labels": ["2015-01", ...], "series": {"名称": [98.7, null, ...], ...}}
+    超过点数预算时 / over the point budget: 另加 / plus "overview": [0, 7, ...], "maxPoints": 500
+
+长序列用LTTB（Largest-Triangle-Three-Buckets）降采样：总览只绘制 overview 中的点，
+完整数据仍在页面中，缩放后按可见范围换成完整分辨率的切片（见 templates/_charts.js）
+Long series are downsampled with LTTB (Largest-Triangle-Three-Buckets): the overview only
+draws the points listed in overview, while the full data stays in the page and zooming
+swaps in full-resolution slices of the visible range (see templates/_charts.js)
+
+用法 / Usage:
+    payload = series_payload(month_labels(df['Year'], df['Month']), df['Value'], decimals=4)
+    payload = aligned_payload(df['Product'], df['Year'], df['Month'], df['Value'], decimals=3)
+    payload = downsample(payload, max_points=500)
+    html = f"const chartData = {encode_payload(payload)};"
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+# 图表默认点数预算（每个序列）/ Default chart point budget, per series
+DEFAULT_MAX_POINTS = 500
+
+
+def month_labels(years, months):
+    """
+    年、月列转换为 'YYYY-MM' 标签 / Year and month columns to 'YYYY-MM' labels
+
+    Returns:
+        list: 标签列表
+    """
+    codes = np.asarray(years, dtype=np.int64) * 100 + np.asarray(months, dtype=np.int64)
+    text = pd.Series(codes).astype(str)
+    return (text.str[:-2] + '-' + text.str[-2:]).tolist()
+
+
+def fixed_values(values, decimals):
+    """
+    按固定精度取整的数值列表，缺失为None / Values rounded to a fixed precision, None where missing
+
+    Args:
+        values: 数值列（转换为float64）
+        decimals (int): 保留的小数位数
+
+    Returns:
+        list: float 或 None
+    """
+    values = np.asarray(values, dtype=np.float64).round(decimals)
+    missing = np.isnan(values)
+    if not missing.any():
+        return values.tolist()
+    return np.where(missing, None, values).tolist()
+
+
+def series_payload(labels, values, decimals):
+    """
+    单个序列的图表数据 / Chart payload of a single series
+
+    Args:
+        labels (list): 时间轴标签
+        values: 数值列
+        decimals (int): 保留的小数位数
+
+    Returns:
+        dict: {'labels': [...], 'values': [...]}
+    """
+    return {'labels': list(labels), 'values': fixed_values(values, decimals)}
+
+
+def aligned_payload(keys, years, months, values, decimals):
+    """
+    多个序列对齐到同一时间轴的图表数据（序列按首次出现的顺序；同一序列同一月份重复时取第一条）
+    Chart payload of several series aligned on one period axis, in first-appearance order;
+    the first row wins for a duplicate series and month
+
+    Args:
+        keys: 序列列
+        years: 年份列
+        months: 月份列
+        values: 数值列
+        decimals (int): 保留的小数位数
+
+    Returns:
+        dict: {'labels': [...], 'series': {序列: [...]}}
+    """
+    codes, uniques = pd.factorize(pd.Series(np.asarray(keys)))
+    periods = np.asarray(years, dtype=np.int64) * 12 + np.asarray(months, dtype=np.int64) - 1
+    axis, positions = np.unique(periods, return_inverse=True)
+
+    matrix = np.full((len(uniques), len(axis)), np.nan)
+    # 倒序赋值，使重复时第一条生效 / Assign in reverse so the first of any duplicates wins
+    matrix[codes[::-1], positions[::-1]] = np.asarray(values, dtype=np.float64)[::-1]
+
+    return {
+        'labels': month_labels(axis // 12, axis % 12 + 1),
+        'series': {key: fixed_values(row, decimals) for key, row in zip(uniques, matrix)},
+    }
+
+
+def encode_payload(payload):
+    """
+    序列化为紧凑JSON（无缩进、无多余空格），可直接嵌入 <script>
+    Serialize to compact JSON (no indentation or extra spaces) that can be embedded in a <script>
+
+    Returns:
+        str: JSON文本
+    """
+    text = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), allow_nan=False)
+    # 避免数据中的 "</" 提前结束脚本 / Keep "</" in the data from closing the script early
+    return text.replace('</', '<\\/')
+
+
+def lttb_indices(y, max_points, x=None):
+    """
+    Largest-Triangle-Three-Buckets 降采样选出的点 / Points kept by Largest-Triangle-Three-Buckets downsampling
+
+    首尾两点保留，中间的点平均分入 max_points-2 个桶，每个桶保留与上一个保留点、下一个桶平均点
+    构成的三角形面积最大的点。桶的平均点由累计和一次算出，每个桶的面积是一次数组运算。
+    The first and last points are kept; the points between are split evenly into max_points-2
+    buckets, and each bucket keeps the point forming the largest triangle with the previously
+    kept point and the next bucket's average. Bucket averages come from one cumulative sum and
+    each bucket's areas are one array operation.
+
+    Args:
+        y: 数值（不能含NaN）
+        max_points (int): 保留的点数上限（小于3时不降采样）
+        x: 横坐标（默认为位置 0..n-1）
+
+    Returns:
+        np.ndarray: 保留点的位置（升序）
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if max_points is None or max_points < 3 or n <= max_points:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    # 桶边界：第b个桶为 [edges[b], edges[b+1]) / Bucket b is [edges[b], edges[b+1])
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    sum_x = np.concatenate(([0.0], np.cumsum(x)))
+    sum_y = np.concatenate(([0.0], np.cumsum(y)))
+    counts = np.diff(edges)
+    mean_x = (sum_x[edges[1:]] - sum_x[edges[:-1]]) / counts
+    mean_y = (sum_y[edges[1:]] - sum_y[edges[:-1]]) / counts
+    # 每个桶的“下一个桶平均点”，最后一个桶为末点 / Next bucket's average for every bucket; the last point for the last bucket
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for b in range(max_points - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((x[a] - next_x[b]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[b] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[b + 1] = a
+    return selected
+
+
+def _finite_lttb(values, max_points):
+    """忽略缺失值做LTTB，返回完整数组中的位置 / LTTB over the non-missing values, as positions in the full array"""
+    values = np.asarray(values, dtype=np.float64)  # None -> NaN
+    finite = np.flatnonzero(~np.isnan(values))
+    return finite[lttb_indices(values[finite], max_points, x=finite)]
+
+
+def downsample(payload, max_points=DEFAULT_MAX_POINTS):
+    """
+    超过点数预算时加上LTTB总览 / Add an LTTB overview when the payload exceeds the point budget
+
+    多个序列时每个序列各自降采样，总览取所有序列保留点的并集；首尾两点始终保留。
+    With several series each one is downsampled on its own and the overview is the union of
+    their kept points; the first and last points are always kept.
+
+    Args:
+        payload (dict): series_payload 或 aligned_payload 的结果
+        max_points (int): 每个序列的点数预算；None表示不降采样
+
+    Returns:
+        dict: 未超预算时原样返回；否则为带 'overview'（保留点在 labels 中的位置）和 'maxPoints' 的新字典
+    """
+    n = len(payload['labels'])
+    if max_points is None or n <= max_points:
+        return payload
+    columns = [payload['values']] if 'values' in payload else list(payload['series'].values())
+    kept = np.concatenate([_finite_lttb(values, max_points) for values in columns] + [np.array([0, n - 1])])
+    return {**payload, 'overview': np.unique(kept).tolist(), 'maxPoints': int(max_points)}
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模块结果检查点存储 / Module Result Checkpoint Store
+按运行ID保存每个模块解析后的DataFrame，使失败的整合运行可以只重跑失败或缺失的模块
+Saves each module's parsed DataFrame keyed by run ID, so a failed integration run can
+re-execute only the failed or missing modules
+
+目录结构 / Layout:
+    checkpoints/<run_id>/manifest.json     运行清单（各模块状态）/ run manifest (module status)
+    checkpoints/<run_id>/<module_key>.pkl  模块数据 / module data
+
+只保留最近的若干次运行（见 prune）；跳过的模块也会写入当前运行，最近一次运行总是包含所有成功模块的结果
+Only the most recent runs are kept (see prune); skipped modules are saved into the current run
+too, so the latest run always holds every successful module's result
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+STATUS_SUCCESS = 'success'
+STATUS_FAILED = 'failed'
+
+
+def module_key(config):
+    """
+    根据模块配置生成文件名安全的键 / Build a filename-safe key from a module config
+
+    Args:
+        config (dict): 脚本配置
+
+    Returns:
+        str: 例如 'bls_data_scraper'
+    """
+    return re.sub(r'[^a-z0-9]+', '_', config['name'].lower()).strip('_')
+
+
+class CheckpointStore:
+    """检查点存储类 / Checkpoint Store Class"""
+
+    def __init__(self, root_dir="checkpoints"):
+        self.root_dir = root_dir
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_run_id():
+        """生成新的运行ID / Generate a new run ID"""
+        return datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+
+    def run_dir(self, run_id):
+        """运行目录 / Directory of a run"""
+        return os.path.join(self.root_dir, run_id)
+
+    def list_runs(self):
+        """
+        列出所有运行ID（按时间升序）/ List all run IDs in chronological order
+
+        Returns:
+            list: 运行ID列表
+        """
+        if not os.path.isdir(self.root_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root_dir)
+            if os.path.exists(os.path.join(self.root_dir, name, 'manifest.json'))
+        )
+
+    def latest_run_id(self):
+        """最近一次运行的ID，没有时返回None / ID of the most recent run, or None"""
+        runs = self.list_runs()
+        return runs[-1] if runs else None
+
+    def load_manifest(self, run_id):
+        """
+        读取运行清单 / Load a run manifest
+
+        Returns:
+            dict: 清单；不存在时返回空清单
+        """
+        path = os.path.join(self.run_dir(run_id), 'manifest.json')
+        if not os.path.exists(path):
+            return {'run_id': run_id, 'modules': {}}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_manifest(self, run_id, manifest):
+        """原子写入运行清单 / Atomically write a run manifest"""
+        path = os.path.join(self.run_dir(run_id), 'manifest.json')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def save_module(self, run_id, config, success, data):
+        """
+        保存模块结果 / Save a module result
+
+        Args:
+            run_id (str): 运行ID
+            config (dict): 脚本配置
+            success (bool): 模块是否成功
+            data (pd.DataFrame): 解析后的数据
+        """
+        key = module_key(config)
+        run_dir = self.run_dir(run_id)
+        os.makedirs(run_dir, exist_ok=True)
+
+        entry = {
+            'name': config['name'],
+            'sheet_name': config['sheet_name'],
+            'status': STATUS_SUCCESS if success else STATUS_FAILED,
+            'records': int(len(data)) if data is not None else 0,
+            'saved_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'file': None,
+        }
+
+        if success and data is not None:
+            file_name = f"{key}.pkl"
+            tmp_path = os.path.join(run_dir, file_name + '.tmp')
+            data.to_pickle(tmp_path)
+            os.replace(tmp_path, os.path.join(run_dir, file_name))
+            entry['file'] = file_name
+
+        with self._lock:
+            manifest = self.load_manifest(run_id)
+            manifest.setdefault('created_at', entry['saved_at'])
+            manifest['modules'][key] = entry
+            self._write_manifest(run_id, manifest)
+
+    def load_module(self, run_id, config):
+        """
+        读取成功模块的缓存数据 / Load cached data of a successful module
+
+        Returns:
+            pd.DataFrame: 缓存的数据；模块失败或缺失时返回None
+        """
+        entry = self.load_manifest(run_id)['modules'].get(module_key(config))
+        if not entry or entry.get('status') != STATUS_SUCCESS or not entry.get('file'):
+            return None
+
+        path = os.path.join(self.run_dir(run_id), entry['file'])
+        if not os.path.exists(path):
+            return None
+        return pd.read_pickle(path)
+
+    def latest_successful(self, config, exclude_run_id=None):
+        """
+        查找该模块最近一次成功的缓存数据 / Find the most recent successful cached data of a module
+
+        Args:
+            config (dict): 脚本配置
+            exclude_run_id (str): 跳过的运行ID（通常是当前运行）
+
+        Returns:
+            tuple: (运行ID, 数据框)；没有时返回 (None, None)
+        """
+        for run_id in reversed(self.list_runs()):
+            if run_id == exclude_run_id:
+                continue
+            data = self.load_module(run_id, config)
+            if data is not None:
+                return run_id, data
+        return None, None
+
+    def prune(self, keep, protect=None):
+        """
+        删除较早的运行，只保留最近 keep 次 / Delete older runs, keeping only the most recent keep
+
+        Args:
+            keep (int): 保留的运行数；小于1时不删除
+            protect (str): 不删除的运行ID（通常是当前运行）
+
+        Returns:
+            list: 删除的运行ID
+        """
+        if not keep or keep < 1:
+            return []
+        with self._lock:
+            runs = self.list_runs()
+            removed = [run_id for run_id in runs[:-keep] if run_id != protect]
+            for run_id in removed:
+                shutil.rmtree(self.run_dir(run_id), ignore_errors=True)
+        return removed
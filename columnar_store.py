@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分区列式序列存储 / Partitioned Columnar Series Store
+把规范化后的长格式序列按 series_id/year 分区写成Parquet数据集（带类型的日期和浮点数），
+读取时只加载需要的列，并把序列和年份条件下推到分区，不读取无关文件
+Writes the normalized long-format series as a Parquet dataset partitioned by
+series_id/year (typed dates and floats); reads project only the needed columns and push
+series and year predicates down to the partitions so unrelated files are never opened
+
+目录结构 / Layout:
+    integrated_data.store/series_id=RUBBER_TSR20/year=2015/<part>.parquet
+
+回退 / Fallback:
+    没有写出数据集时（未启用 parquet 输出），读取 .series.parquet 并在内存中筛选
+    Without a dataset (the 'parquet' output not enabled) reads load the .series.parquet file
+    and filter it in memory
+
+用法 / Usage:
+    df = read_series_store("integrated_data.xlsx", ['RUBBER_TSR20'], columns=['period', 'value'], min_year=2015)
+"""
+
+import os
+import shutil
+
+import pandas as pd
+
+from series_schema import load_series
+
+PARTITION_COLUMNS = ['series_id', 'year']
+
+
+def store_path(output_filename):
+    """
+    整合Excel旁边的数据集目录 / Dataset directory next to the integrated workbook
+
+    例如 integrated_data.xlsx -> integrated_data.store
+    """
+    return os.path.splitext(output_filename)[0] + '.store'
+
+
+def write_store(series, root):
+    """
+    写出分区数据集（先写临时目录再替换，读取方不会看到半成品）
+    Write the partitioned dataset into a temporary directory and swap it in, so readers never see a partial store
+
+    Args:
+        series (pd.DataFrame): 规范化序列（SERIES_COLUMNS）
+        root (str): 数据集目录
+
+    Returns:
+        str: 数据集目录
+    """
+    table = series.assign(year=series['period'].dt.year.astype('int32'))
+    tmp_root = root + '.tmp'
+    old_root = root + '.old'
+    for path in (tmp_root, old_root):
+        shutil.rmtree(path, ignore_errors=True)
+
+    table.to_parquet(tmp_root, index=False, partition_cols=PARTITION_COLUMNS)
+
+    if os.path.exists(root):
+        os.replace(root, old_root)
+    os.replace(tmp_root, root)
+    shutil.rmtree(old_root, ignore_errors=True)
+    return root
+
+
+def read_series_store(output_filename="integrated_data.xlsx", series_ids=None, columns=None, min_year=None):
+    """
+    读取序列，列投影并下推筛选条件 / Read series with column projection and predicate pushdown
+
+    Args:
+        output_filename (str): 整合Excel文件路径（在其旁边查找数据集）
+        series_ids (list): 只读取这些序列（可选）
+        columns (list): 只读取这些列（可选；series_id 始终包含）
+        min_year (int): 只读取该年份及以后的数据（可选）
+
+    Returns:
+        pd.DataFrame: 按 series_id、period 排序；没有任何数据文件时返回None
+    """
+    if columns is not None and 'series_id' not in columns:
+        columns = ['series_id'] + list(columns)
+
+    root = store_path(output_filename)
+    if os.path.isdir(root):
+        filters = []
+        if series_ids is not None:
+            filters.append(('series_id', 'in', list(series_ids)))
+        if min_year is not None:
+            filters.append(('year', '>=', int(min_year)))
+        df = pd.read_parquet(root, columns=columns, filters=filters or None)
+        # 分区列读回为分类类型 / Partition columns come back as categoricals
+        df['series_id'] = df['series_id'].astype(str)
+        if 'year' in df.columns:
+            df['year'] = df['year'].astype('int64')
+    else:
+        df = load_series(output_filename, series_ids)
+        if df is None:
+            return None
+        if min_year is not None:
+            df = df[df['period'].dt.year >= min_year]
+        if columns is not None:
+            df = df.assign(year=df['period'].dt.year.astype('int64'))[columns]
+
+    sort_columns = [column for column in ('series_id', 'period') if column in df.columns]
+    return df.sort_values(sort_columns, kind='stable').reset_index(drop=True)
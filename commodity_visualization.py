@@ -7,470 +7,178 @@ Generate comprehensive Canvas charts with analysis based on FRED_Data.csv and BL
 """
 
 import pandas as pd
-import json
-from datetime import datetime
 import os
-import re
+
+from series_db import read_series
+from chart_payload import aligned_payload, downsample, DEFAULT_MAX_POINTS
+from series_analytics import latest_comparisons, comparison_table, aligned_points, year_month_pivot, heatmap_html
+from page_templates import render_page, load_template, change_slots, generated_at
+
+# 整合Excel文件（时间序列数据库和列式数据集保存在其旁边）/ Integrated workbook; the series database and columnar store sit next to it
+INTEGRATED_FILE = "integrated_data.xlsx"
+
+# 每个序列的图表点数预算；超过预算时用LTTB降采样，缩放后显示完整分辨率
+# Per-series chart point budget; longer series are LTTB-downsampled and zooming shows full resolution
+MAX_CHART_POINTS = DEFAULT_MAX_POINTS
+
+# 图表起始年份 / First charted year
+MIN_YEAR = 2015
+
+# 没有序列数据时读取的CSV（FRED、BLS）、页面模板和输出文件 / CSVs (FRED, BLS) read when there is no series data, page template and output file
+CSV_FILES = ["csv_output/FRED_Data.csv", "csv_output/BLS_Data.csv"]
+TEMPLATE = 'commodity.html'
+OUTPUT_FILE = "commodity_visualization.html"
+
+# CSV回退解析的年月格式（例如 2012M01）和FRED "年月 数值" 行的格式
+# CSV fallback formats: the period (e.g. 2012M01) and FRED "period value" rows
+PERIOD_PATTERN = r'^(\d{4})M(\d{2})$'
+FRED_ROW_PATTERN = r'^(\d{4})M(\d{2})\s+([\d.]+)$'
+
+# 序列代码与产品名称 / Series codes and product names
+SERIES_PRODUCTS = {
+    'PCU314994314994': {'name': '轮胎帘子布生产者价格指数', 'name_en': 'Tire Cord PPI', 'source': 'FRED'},
+    'PCU325212325212P': {'name': '合成橡胶制造', 'name_en': 'Synthetic Rubber', 'source': 'BLS'},
+    'PCU325211325211': {'name': '塑料原料和树脂制造', 'name_en': 'Plastics & Resin', 'source': 'BLS'},
+    'PCU332618332618': {'name': '其他制造金属丝产品', 'name_en': 'Wire Products', 'source': 'BLS'},
+    'PCU3251803251806': {'name': '炭黑制造', 'name_en': 'Carbon Black', 'source': 'BLS'}
+}
+
+def series_to_frame(series):
+    """
+    把规范化序列转换为图表使用的数据框 / Convert normalized series into the frame used by the charts
+    """
+    series = series[series['period'].dt.year >= MIN_YEAR].copy()
+    
+    # 按产品顺序、时间排序（与CSV解析结果的产品顺序一致）
+    order = {series_id: i for i, series_id in enumerate(SERIES_PRODUCTS)}
+    series['order'] = series['series_id'].map(order)
+    series = series.sort_values(['order', 'period'], kind='stable')
+    
+    products = pd.DataFrame.from_dict(SERIES_PRODUCTS, orient='index')
+    return pd.DataFrame({
+        'Year': series['period'].dt.year.astype('int64'),
+        'Month': series['period'].dt.month.astype('int64'),
+        'Value': series['value'],
+        'Product': series['series_id'].map(products['name']),
+        'Product_EN': series['series_id'].map(products['name_en']),
+        'Source': series['series_id'].map(products['source'])
+    }).reset_index(drop=True)
 
 def parse_fred_data(df):
     """
     解析FRED数据 / Parse FRED data
+
+    首列整列用正则提取年月和数值，数值整列转换，按年份掩码筛选
+    The first column is matched as a whole for period and value, values are converted column-wise and filtered by a year mask
     """
-    data_records = []
-    
-    for _, row in df.iterrows():
-        first_col = str(row.iloc[0])
-        
-        # 匹配年月数据格式 (例如: 2012M01 97.9)
-        if re.match(r'^\d{4}M\d{2}\s+[\d.]+$', first_col):
-            parts = first_col.split()
-            date_str = parts[0]
-            value = float(parts[1])
-            
-            year = int(date_str[:4])
-            month = int(date_str[5:7])
-            
-            # 只取2015年及以后的数据
-            if year >= 2015:
-                data_records.append({
-                    'Year': year,
-                    'Month': month,
-                    'Value': value,
-                    'Product': '轮胎帘子布生产者价格指数',
-                    'Product_EN': 'Tire Cord PPI',
-                    'Source': 'FRED'
-                })
-    
-    return pd.DataFrame(data_records)
+    # 匹配年月数据格式 (例如: 2012M01 97.9)
+    parts = df.iloc[:, 0].astype(str).str.extract(FRED_ROW_PATTERN).dropna()
+    year = parts[0].astype('int64')
+    value = pd.to_numeric(parts[2], errors='coerce').astype('float64')
+    product = SERIES_PRODUCTS['PCU314994314994']
+
+    # 只取2015年及以后的数据
+    keep = (year >= MIN_YEAR) & value.notna()
+    return pd.DataFrame({
+        'Year': year[keep],
+        'Month': parts.loc[keep, 1].astype('int64'),
+        'Value': value[keep],
+        'Product': product['name'],
+        'Product_EN': product['name_en'],
+        'Source': 'FRED'
+    }).reset_index(drop=True)
 
 def parse_bls_data(df):
     """
     解析BLS数据 / Parse BLS data
+
+    年月列整列匹配，各产品列整列转换为数值，按行展开（与逐行解析的记录顺序一致）
+    The period column is matched as a whole and every product column converted at once, then
+    stacked row by row (the same record order as the row-by-row parser)
     """
-    data_records = []
-    
     # 获取产品名称
-    products = {
-        'PCU325212325212P': {'name': '合成橡胶制造', 'name_en': 'Synthetic Rubber'},
-        'PCU325211325211': {'name': '塑料原料和树脂制造', 'name_en': 'Plastics & Resin'},
-        'PCU332618332618': {'name': '其他制造金属丝产品', 'name_en': 'Wire Products'},
-        'PCU3251803251806': {'name': '炭黑制造', 'name_en': 'Carbon Black'}
-    }
+    products = {code: info for code, info in SERIES_PRODUCTS.items() if info['source'] == 'BLS'}
     
     # 跳过前6行（标题行）
-    for i, row in df.iterrows():
-        if i < 6:
-            continue
-            
-        date_str = str(row.iloc[0])
-        if re.match(r'^\d{4}M\d{2}$', date_str):
-            year = int(date_str[:4])
-            month = int(date_str[5:7])
-            
-            # 只取2015年及以后的数据
-            if year >= 2015:
-                for j, (product_code, product_info) in enumerate(products.items()):
-                    value_str = str(row.iloc[j + 1])
-                    if value_str and value_str != 'nan' and value_str != '':
-                        try:
-                            value = float(value_str)
-                            data_records.append({
-                                'Year': year,
-                                'Month': month,
-                                'Value': value,
-                                'Product': product_info['name'],
-                                'Product_EN': product_info['name_en'],
-                                'Source': 'BLS'
-                            })
-                        except ValueError:
-                            pass
-    
-    return pd.DataFrame(data_records)
+    body = df.iloc[6:]
+    dates = body.iloc[:, 0].astype(str).str.extract(PERIOD_PATTERN).dropna()
+    
+    # 只取2015年及以后的数据
+    dates = dates[dates[0].astype('int64') >= MIN_YEAR]
+    values = body.loc[dates.index].iloc[:, 1:len(products) + 1].apply(pd.to_numeric, errors='coerce')
+    values.columns = list(products)
+    
+    # 按行、产品顺序展开，丢弃空值和无法转换的值 / Stack by row then product, dropping blanks and unparseable values
+    stacked = values.stack().dropna()
+    rows = dates.loc[stacked.index.get_level_values(0)]
+    codes = stacked.index.get_level_values(1)
+    info = pd.DataFrame.from_dict(products, orient='index')
+    return pd.DataFrame({
+        'Year': rows[0].astype('int64').to_numpy(),
+        'Month': rows[1].astype('int64').to_numpy(),
+        'Value': stacked.to_numpy(dtype='float64'),
+        'Product': info.loc[codes, 'name'].to_numpy(),
+        'Product_EN': info.loc[codes, 'name_en'].to_numpy(),
+        'Source': 'BLS'
+    })
 
 def calculate_latest_comparisons(df):
     """
     计算最新数据的同比环比 / Calculate latest data comparisons
     """
-    comparisons = {}
-    
-    for product in df['Product'].unique():
-        product_data = df[df['Product'] == product].sort_values(['Year', 'Month'])
-        
-        if len(product_data) == 0:
-            continue
-            
-        # 获取最新数据
-        latest = product_data.iloc[-1]
-        latest_year = latest['Year']
-        latest_month = latest['Month']
-        latest_value = latest['Value']
-        
-        # 上月数据 (环比)
-        prev_month = None
-        prev_month_value = None
-        if len(product_data) >= 2:
-            prev_month = product_data.iloc[-2]
-            prev_month_value = prev_month['Value']
-        
-        # 去年同月数据 (同比)
-        same_month_last_year = product_data[
-            (product_data['Year'] == latest_year - 1) & 
-            (product_data['Month'] == latest_month)
-        ]
-        same_month_last_year_value = None
-        if not same_month_last_year.empty:
-            same_month_last_year_value = same_month_last_year.iloc[0]['Value']
-        
-        # 计算变化率
-        mom_change = None
-        yoy_change = None
-        
-        if prev_month_value is not None:
-            mom_change = ((latest_value - prev_month_value) / prev_month_value * 100)
-        
-        if same_month_last_year_value is not None:
-            yoy_change = ((latest_value - same_month_last_year_value) / same_month_last_year_value * 100)
-        
-        comparisons[product] = {
-            'latest': {
-                'year': int(latest_year),
-                'month': int(latest_month),
-                'value': float(latest_value),
-                'date_str': f"{latest_year}年{latest_month}月"
-            },
-            'prev_month': {
-                'value': float(prev_month_value) if prev_month_value is not None else None,
-                'change': float(mom_change) if mom_change is not None else None
-            },
-            'same_month_last_year': {
-                'value': float(same_month_last_year_value) if same_month_last_year_value is not None else None,
-                'change': float(yoy_change) if yoy_change is not None else None
-            }
-        }
-    
-    return comparisons
+    return latest_comparisons(df, key='Product')
 
-def generate_html_visualization(df, comparisons):
+def generate_html_visualization(df, comparisons, max_points=MAX_CHART_POINTS):
     """
     生成HTML Canvas可视化页面 / Generate HTML Canvas visualization page
-    """
     
-    # 准备图表数据 - 按产品分组
-    chart_datasets = []
-    colors = ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF']
+    Args:
+        max_points (int): 每个图表序列的点数预算（None表示不降采样）
+    """
     
-    for i, product in enumerate(df['Product'].unique()):
-        product_data = df[df['Product'] == product].sort_values(['Year', 'Month'])
-        
-        chart_data = []
-        for _, row in product_data.iterrows():
-            chart_data.append({
-                'x': f"{int(row['Year'])}-{int(row['Month']):02d}",
-                'y': float(row['Value'])
-            })
-        
-        chart_datasets.append({
-            'label': product,
-            'data': chart_data,
-            'borderColor': colors[i % len(colors)],
-            'backgroundColor': colors[i % len(colors)] + '20',
-            'fill': False,
-            'tension': 0.4
+    # 准备图表数据 - 各产品共用时间轴，指数保留3位小数；超过点数预算时附带LTTB总览
+    chart_data = downsample(aligned_payload(df['Product'], df['Year'], df['Month'], df['Value'], decimals=3), max_points)
+    
+    # 完整历史的同比变化（趋势线和各产品热力图）
+    history = comparison_table(df, key='Product')
+    yoy_data = downsample(aligned_points(history, 'yoy_change'), max_points)
+    yoy_pivot = year_month_pivot(history, 'yoy_change')
+    
+    # 每个产品一张卡片、一个热力图（片段模板同样只编译一次）
+    product_card = load_template('_product_card.html')
+    heatmap_details = load_template('_heatmap_details.html')
+    cards = ''.join(
+        product_card.render({
+            'product': product,
+            'latest_value': f"{comp['latest']['value']:.2f}",
+            'latest_date': comp['latest']['date_str'],
+            **change_slots(comp['prev_month']['change'], 'mom'),
+            **change_slots(comp['same_month_last_year']['change'], 'yoy'),
         })
-    
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>轮胎相关商品价格指数可视化 / Tire-Related Commodity Price Index Visualization</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }}
-        
-        .header {{
-            background: linear-gradient(135deg, #FF6B6B 0%, #4ECDC4 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-        
-        .header h1 {{
-            margin: 0;
-            font-size: 2.5em;
-            font-weight: 300;
-        }}
-        
-        .header p {{
-            margin: 10px 0 0 0;
-            opacity: 0.9;
-            font-size: 1.1em;
-        }}
-        
-        .cards-container {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 15px;
-            padding: 30px;
-            background: #f8f9fa;
-        }}
-        
-        .card {{
-            background: white;
-            border-radius: 10px;
-            padding: 20px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-            transition: transform 0.3s ease;
-        }}
-        
-        .card:hover {{
-            transform: translateY(-5px);
-        }}
-        
-        .card-title {{
-            font-size: 0.9em;
-            color: #666;
-            margin: 0 0 10px 0;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-            font-weight: bold;
-        }}
-        
-        .card-value {{
-            font-size: 1.8em;
-            font-weight: bold;
-            margin: 0 0 8px 0;
-            color: #FF6B6B;
-        }}
-        
-        .card-meta {{
-            font-size: 0.8em;
-            color: #888;
-            margin: 0 0 10px 0;
-        }}
-        
-        .card-change {{
-            font-size: 1em;
-            font-weight: 600;
-            margin: 0;
-        }}
-        
-        .change-positive {{
-            color: #4CAF50;
-        }}
-        
-        .change-negative {{
-            color: #F44336;
-        }}
-        
-        .change-neutral {{
-            color: #FF9800;
-        }}
-        
-        .chart-container {{
-            padding: 30px;
-            background: white;
-        }}
-        
-        .chart-title {{
-            text-align: center;
-            margin-bottom: 30px;
-            font-size: 1.5em;
-            color: #333;
-        }}
-        
-        #commodityChart {{
-            max-height: 500px;
-        }}
-        
-        .footer {{
-            background: #333;
-            color: white;
-            text-align: center;
-            padding: 20px;
-            font-size: 0.9em;
-        }}
-        
-        .trend-arrow {{
-            font-size: 1.2em;
-            margin-left: 8px;
-        }}
-        
-        .source-links {{
-            margin-top: 10px;
-        }}
-        
-        .source-links a {{
-            color: #4ECDC4;
-            text-decoration: none;
-            margin: 0 10px;
-        }}
-        
-        .source-links a:hover {{
-            text-decoration: underline;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>轮胎相关商品价格指数分析</h1>
-            <p>Tire-Related Commodity Price Index Analysis Dashboard</p>
-        </div>
-        
-        <div class="cards-container">"""
-    
-    # 生成每个产品的卡片
-    for product, comp in comparisons.items():
-        # 预处理显示数据
-        mom_change_display = f"{comp['prev_month']['change']:+.2f}%" if comp['prev_month']['change'] is not None else 'N/A'
-        mom_change_class = 'change-positive' if comp['prev_month']['change'] and comp['prev_month']['change'] > 0 else 'change-negative' if comp['prev_month']['change'] and comp['prev_month']['change'] < 0 else 'change-neutral'
-        mom_arrow = '↗️' if comp['prev_month']['change'] and comp['prev_month']['change'] > 0 else '↘️' if comp['prev_month']['change'] and comp['prev_month']['change'] < 0 else '➡️'
-        
-        yoy_change_display = f"{comp['same_month_last_year']['change']:+.2f}%" if comp['same_month_last_year']['change'] is not None else 'N/A'
-        yoy_change_class = 'change-positive' if comp['same_month_last_year']['change'] and comp['same_month_last_year']['change'] > 0 else 'change-negative' if comp['same_month_last_year']['change'] and comp['same_month_last_year']['change'] < 0 else 'change-neutral'
-        yoy_arrow = '↗️' if comp['same_month_last_year']['change'] and comp['same_month_last_year']['change'] > 0 else '↘️' if comp['same_month_last_year']['change'] and comp['same_month_last_year']['change'] < 0 else '➡️'
-        
-        html_content += f"""
-            <div class="card">
-                <h3 class="card-title">{product}</h3>
-                <div class="card-value">{comp['latest']['value']:.2f}</div>
-                <p class="card-meta">{comp['latest']['date_str']} | 基准指数</p>
-                <div style="display: flex; justify-content: space-between; margin-top: 15px;">
-                    <div>
-                        <small style="color: #666;">环比 MoM</small>
-                        <p class="card-change {mom_change_class}" style="margin: 2px 0;">
-                            {mom_change_display} <span class="trend-arrow">{mom_arrow}</span>
-                        </p>
-                    </div>
-                    <div>
-                        <small style="color: #666;">同比 YoY</small>
-                        <p class="card-change {yoy_change_class}" style="margin: 2px 0;">
-                            {yoy_change_display} <span class="trend-arrow">{yoy_arrow}</span>
-                        </p>
-                    </div>
-                </div>
-            </div>"""
-    
-    html_content += f"""
-        </div>
-        
-        <div class="chart-container">
-            <h2 class="chart-title">轮胎相关商品价格指数趋势图 / Tire-Related Commodity Price Index Trend Chart</h2>
-            <canvas id="commodityChart"></canvas>
-        </div>
-        
-        <div class="footer">
-            <p>数据来源 / Data Sources:</p>
-            <div class="source-links">
-                <a href="https://fred.stlouisfed.org/series/PCU314994314994" target="_blank">FRED - Producer Price Index by Industry: Rope, Twine, Tire Cord, and Tire Fabric Mills</a>
-                <a href="https://data.bls.gov/toppicks?survey=pc" target="_blank">BLS - Producer Price Index Industry Data</a>
-                <a href="https://www.worldbank.org/en/research/commodity-markets" target="_blank">World Bank - Commodity Markets Research</a>
-            </div>
-            <p style="margin-top: 15px; font-size: 0.8em; color: #ccc;">
-                <strong>数据说明 / Data Description:</strong><br>
-                • FRED数据: 轮胎帘子布生产者价格指数 (基准期: 2011年12月=100) / FRED Data: Tire Cord Producer Price Index (Base: Dec 2011=100)<br>
-                • BLS数据: 相关制造业生产者价格指数 / BLS Data: Related Manufacturing Producer Price Indexes<br>
-                • 世界银行: 全球商品市场研究与价格监测 / World Bank: Global Commodity Markets Research & Price Monitoring
-            </p>
-            <p style="margin-top: 10px;">生成时间 / Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        </div>
-    </div>
+        for product, comp in comparisons.items()
+    )
+    yoy_heatmaps = ''.join(
+        heatmap_details.render({'product': product, 'heatmap': heatmap_html(yoy_pivot.loc[product].dropna(how='all'))})
+        for product in yoy_data['series']
+    )
+    
+    return render_page(
+        TEMPLATE,
+        cards=cards,
+        chart_data=chart_data,
+        yoy_data=yoy_data,
+        yoy_heatmaps=yoy_heatmaps,
+        generated_at=generated_at()
+    )
 
-    <script>
-        // 图表配置和数据
-        const ctx = document.getElementById('commodityChart').getContext('2d');
-        const chartDatasets = {json.dumps(chart_datasets, indent=8)};
-        
-        const chart = new Chart(ctx, {{
-            type: 'line',
-            data: {{
-                datasets: chartDatasets
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                parsing: {{
-                    xAxisKey: 'x',
-                    yAxisKey: 'y'
-                }},
-                plugins: {{
-                    legend: {{
-                        display: true,
-                        position: 'top',
-                        labels: {{
-                            usePointStyle: true,
-                            padding: 20,
-                            font: {{
-                                size: 12
-                            }}
-                        }}
-                    }},
-                    tooltip: {{
-                        mode: 'index',
-                        intersect: false,
-                        backgroundColor: 'rgba(0,0,0,0.8)',
-                        titleColor: '#fff',
-                        bodyColor: '#fff',
-                        borderColor: '#FF6B6B',
-                        borderWidth: 1,
-                        callbacks: {{
-                            label: function(context) {{
-                                return context.dataset.label + ': ' + context.parsed.y.toFixed(2);
-                            }}
-                        }}
-                    }}
-                }},
-                scales: {{
-                    x: {{
-                        type: 'category',
-                        grid: {{
-                            color: 'rgba(0,0,0,0.1)'
-                        }},
-                        ticks: {{
-                            maxTicksLimit: 20
-                        }}
-                    }},
-                    y: {{
-                        grid: {{
-                            color: 'rgba(0,0,0,0.1)'
-                        }},
-                        ticks: {{
-                            callback: function(value) {{
-                                return value.toFixed(1);
-                            }}
-                        }}
-                    }}
-                }},
-                interaction: {{
-                    mode: 'nearest',
-                    axis: 'x',
-                    intersect: false
-                }}
-            }}
-        }});
-    </script>
-</body>
-</html>
-"""
-    
-    return html_content
+def read_page_series():
+    """
+    页面使用的规范化序列（只读取需要的列和年份） / The normalized series this page charts, only the needed columns and years
+
+    Returns:
+        pd.DataFrame: 没有序列数据时为None或空数据框（此时读取CSV_FILES）
+    """
+    return read_series(INTEGRATED_FILE, list(SERIES_PRODUCTS), columns=['period', 'value'], min_year=MIN_YEAR)
 
 def main():
     """主函数 / Main function"""
@@ -478,28 +186,35 @@ def main():
     print("📊 轮胎相关商品价格指数可视化 / Tire-Related Commodity Price Index Visualization")
     print("=" * 70)
     
-    # 读取FRED数据
-    fred_file = "csv_output/FRED_Data.csv"
-    bls_file = "csv_output/BLS_Data.csv"
-    
-    if not os.path.exists(fred_file):
-        print(f"❌ 错误：找不到FRED数据文件 / Error: FRED data file not found: {fred_file}")
-        return 1
+    # 优先按索引范围查询时间序列数据库（已带类型，只读取需要的列和年份）
+    series = read_page_series()
+    if series is not None and not series.empty:
+        print(f"📄 读取序列数据 / Reading series data next to: {INTEGRATED_FILE}")
+        combined_df = series_to_frame(series)
+        fred_df = combined_df[combined_df['Source'] == 'FRED']
+        bls_df = combined_df[combined_df['Source'] == 'BLS']
+    else:
+        # 读取FRED数据
+        fred_file, bls_file = CSV_FILES
+        
+        if not os.path.exists(fred_file):
+            print(f"❌ 错误：找不到FRED数据文件 / Error: FRED data file not found: {fred_file}")
+            return 1
+            
+        if not os.path.exists(bls_file):
+            print(f"❌ 错误：找不到BLS数据文件 / Error: BLS data file not found: {bls_file}")
+            return 1
         
-    if not os.path.exists(bls_file):
-        print(f"❌ 错误：找不到BLS数据文件 / Error: BLS data file not found: {bls_file}")
-        return 1
-    
-    print(f"📄 读取FRED数据文件 / Reading FRED data file: {fred_file}")
-    fred_df_raw = pd.read_csv(fred_file)
-    fred_df = parse_fred_data(fred_df_raw)
-    
-    print(f"📄 读取BLS数据文件 / Reading BLS data file: {bls_file}")
-    bls_df_raw = pd.read_csv(bls_file)
-    bls_df = parse_bls_data(bls_df_raw)
-    
-    # 合并数据
-    combined_df = pd.concat([fred_df, bls_df], ignore_index=True)
+        print(f"📄 读取FRED数据文件 / Reading FRED data file: {fred_file}")
+        fred_df_raw = pd.read_csv(fred_file)
+        fred_df = parse_fred_data(fred_df_raw)
+        
+        print(f"📄 读取BLS数据文件 / Reading BLS data file: {bls_file}")
+        bls_df_raw = pd.read_csv(bls_file)
+        bls_df = parse_bls_data(bls_df_raw)
+        
+        # 合并数据
+        combined_df = pd.concat([fred_df, bls_df], ignore_index=True)
     
     print(f"📊 数据概况 / Data overview:")
     print(f"   - FRED数据记录数 / FRED records: {len(fred_df)}")
@@ -525,7 +240,7 @@ def main():
     html_content = generate_html_visualization(combined_df, comparisons)
     
     # 保存HTML文件
-    output_file = "commodity_visualization.html"
+    output_file = OUTPUT_FILE
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(html_content)
     
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel解析结果旁路缓存 / Parsed-Excel Sidecar Cache
+把每个已解析的工作表保存为二进制旁路文件，以文件路径、修改时间、大小和内容哈希为键；
+工作簿未变化时直接从旁路文件加载，无需再次解析xlsx的XML
+Stores every parsed worksheet as a binary sidecar file keyed by path, mtime, size and
+content hash; unchanged workbooks load from the sidecar without re-parsing the xlsx XML
+
+旁路格式 / Sidecar format:
+    Parquet（列式）；Parquet无法无损保存的数据框（例如混合类型的object列）使用pickle
+    Parquet (columnar); frames Parquet cannot store losslessly (e.g. mixed-type object columns) are pickled
+
+用法 / Usage:
+    df = read_excel_cached("func2/output/combined_data.xlsx")             # 第一个工作表 / first sheet
+    sheets = read_excel_cached("integrated_data.xlsx", sheet_name=None)   # 所有工作表 / all sheets
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+DEFAULT_CACHE_DIR = ".excel_cache"
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def file_sha256(file_path, chunk_size=1 << 20):
+    """计算文件内容的SHA-256 / SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _path_lock(key):
+    """每个工作簿一把锁，避免并发线程重复解析 / One lock per workbook so concurrent threads do not parse twice"""
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def _cell_values(column):
+    """
+    一列写入单元格后由pd.read_excel读回的原始值 / The raw values pd.read_excel reads back for a column written to cells
+
+    写出时NaN为空单元格，无穷大为 inf / -inf 文本，其他数值保留16位有效数字（openpyxl）；
+    pandas的openpyxl读取器把空单元格读为""，整数值的数值读为int；分类列为其取值
+    On write NaN becomes an empty cell, infinities inf / -inf text and other numbers keep 16
+    significant digits (openpyxl); pandas' openpyxl reader reads empty cells as "" and whole numbers
+    as int; categoricals are their values
+    """
+    numeric = pd.api.types.is_float_dtype(column.dtype) or (
+        pd.api.types.is_integer_dtype(column.dtype) and (column.abs() >= 10 ** 16).any())
+    if numeric:
+        floats = column.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        finite = np.isfinite(floats)
+        floats[finite] = np.char.mod('%.16g', floats[finite]).astype(np.float64)
+        values = floats.astype(object)
+        whole = finite & (floats == np.trunc(floats))
+        values[whole] = [int(value) for value in floats[whole]]
+        values[np.isnan(floats)] = ''
+        values[np.isposinf(floats)] = 'inf'
+        values[np.isneginf(floats)] = '-inf'
+        return values
+    values = column.astype(object).to_numpy(dtype=object, copy=True)
+    values[pd.isna(column).to_numpy()] = ''
+    return values
+
+
+def as_parsed_sheet(df):
+    """
+    数据框转换为pd.read_excel解析其工作表得到的结果 / A frame as pd.read_excel returns it after parsing its sheet
+
+    单元格原始值交给pd.read_excel使用的同一个TextParser推断类型，例如整数值的浮点列读回为int，
+    分类列和object字符串列读回为str，预填充的缓存与解析结果完全一致。
+    The raw cell values go through the same TextParser pd.read_excel uses to infer dtypes (whole-number
+    float columns come back as int, categorical and object string columns as str), so a primed cache
+    matches a parse exactly.
+
+    Args:
+        df (pd.DataFrame): 以index=False写入工作表的数据框
+
+    Returns:
+        pd.DataFrame
+    """
+    if df.columns.empty:
+        # 空工作表 / An empty sheet
+        return pd.DataFrame()
+    columns = [_cell_values(df.iloc[:, i]) for i in range(df.shape[1])]
+    rows = [list(df.columns)] + [list(row) for row in zip(*columns)]
+    # 参数与pd.read_excel一致 / Same arguments as pd.read_excel
+    return TextParser(rows, header=0, skip_blank_lines=False).read()
+
+
+class ExcelSidecarCache:
+    """Excel旁路缓存类 / Excel Sidecar Cache Class"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def _base(self, abs_path):
+        """工作簿对应的旁路文件前缀 / Sidecar file prefix of a workbook"""
+        name = os.path.splitext(os.path.basename(abs_path))[0]
+        digest = hashlib.sha1(abs_path.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{name}_{digest}")
+
+    def _load_meta(self, base):
+        path = base + '.json'
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, base, meta):
+        tmp_path = base + '.json.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, base + '.json')
+
+    def _sheet_file(self, base, index, fmt):
+        return f"{base}.{index}.{'parquet' if fmt == 'parquet' else 'pkl'}"
+
+    def _write_sheet(self, base, index, df):
+        """
+        写出单个工作表旁路文件，优先Parquet / Write one sheet sidecar, preferring Parquet
+
+        Returns:
+            str: 使用的格式 'parquet' 或 'pickle'
+        """
+        path = self._sheet_file(base, index, 'parquet')
+        try:
+            df.to_parquet(path + '.tmp', index=True)
+            if pd.read_parquet(path + '.tmp').equals(df):
+                os.replace(path + '.tmp', path)
+                return 'parquet'
+        except Exception:
+            pass
+        if os.path.exists(path + '.tmp'):
+            os.remove(path + '.tmp')
+
+        path = self._sheet_file(base, index, 'pickle')
+        df.to_pickle(path + '.tmp')
+        os.replace(path + '.tmp', path)
+        return 'pickle'
+
+    def _read_sheet(self, base, index, fmt):
+        path = self._sheet_file(base, index, fmt)
+        if fmt == 'parquet':
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def _validate(self, abs_path, meta):
+        """
+        判断旁路文件是否仍然有效，必要时更新修改时间 / Check the sidecar is still valid, refreshing mtime if needed
+
+        修改时间和大小一致时直接命中；否则比较内容哈希（例如文件被重新复制但内容未变）。
+        Matching mtime and size is a hit; otherwise the content hash decides (e.g. a file re-copied unchanged).
+
+        Returns:
+            tuple: 有效时为 (True, 需要写回的清单或None)；无效时为 (False, 已计算的内容哈希或None)
+        """
+        if meta is None:
+            return False, None
+        stat = os.stat(abs_path)
+        if meta.get('mtime_ns') == stat.st_mtime_ns and meta.get('size') == stat.st_size:
+            return True, None
+        if meta.get('size') != stat.st_size:
+            return False, None
+        content_hash = file_sha256(abs_path)
+        if content_hash == meta.get('sha256'):
+            meta['mtime_ns'] = stat.st_mtime_ns
+            return True, meta
+        return False, content_hash
+
+    def read(self, file_path, sheet_name=0):
+        """
+        读取工作表，优先使用旁路缓存 / Read worksheets, using the sidecar cache when valid
+
+        Args:
+            file_path (str): 工作簿路径
+            sheet_name (int|str|None): 与pd.read_excel相同；None表示返回所有工作表的字典
+
+        Returns:
+            pd.DataFrame 或 dict: 与pd.read_excel相同
+        """
+        abs_path = os.path.abspath(file_path)
+        base = self._base(abs_path)
+
+        with _path_lock(base):
+            meta = self._load_meta(base)
+            valid, extra = self._validate(abs_path, meta)
+            if valid:
+                if extra is not None:
+                    self._write_meta(base, extra)
+                sheets = self._select(meta['sheets'], sheet_name)
+                if sheets is not None:
+                    self.stats['hits'] += 1
+                    frames = {name: self._read_sheet(base, meta['sheets'].index(name), meta['formats'][name])
+                              for name in sheets}
+                    return frames if sheet_name is None else frames[sheets[0]]
+
+            self.stats['misses'] += 1
+            return self._parse_and_store(abs_path, base, sheet_name, None if valid else extra)
+
+    def store(self, file_path, frames):
+        """
+        为刚写出的工作簿直接写入旁路文件（无需再解析）/ Write sidecars for a workbook that was just written, without parsing it
+
+        数据框先转换为pd.read_excel的结果（as_parsed_sheet），命中与未命中读取结果相同
+        Frames are first converted to what pd.read_excel returns (as_parsed_sheet), so hits and misses read the same
+
+        Args:
+            file_path (str): 工作簿路径（必须已写出）
+            frames (dict): {工作表名称: 写入该工作表的数据框}，顺序与工作簿一致
+        """
+        abs_path = os.path.abspath(file_path)
+        base = self._base(abs_path)
+        with _path_lock(base):
+            self._store_frames(abs_path, base, {name: as_parsed_sheet(df) for name, df in frames.items()}, None)
+
+    @staticmethod
+    def _select(sheet_names, sheet_name):
+        """解析sheet_name参数为工作表名称列表 / Resolve sheet_name into a list of sheet names"""
+        if sheet_name is None:
+            return list(sheet_names)
+        if isinstance(sheet_name, int):
+            return [sheet_names[sheet_name]] if 0 <= sheet_name < len(sheet_names) else None
+        return [sheet_name] if sheet_name in sheet_names else None
+
+    def _parse_and_store(self, abs_path, base, sheet_name, content_hash):
+        """
+        解析整个工作簿并写出所有工作表的旁路文件 / Parse the whole workbook and write sidecars for every sheet
+        """
+        frames = pd.read_excel(abs_path, sheet_name=None)
+        self._store_frames(abs_path, base, frames, content_hash)
+
+        if sheet_name is None:
+            return frames
+        names = self._select(list(frames), sheet_name)
+        if names is None:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        return frames[names[0]]
+
+    def _store_frames(self, abs_path, base, frames, content_hash):
+        """写出所有工作表的旁路文件和清单 / Write sidecars for every sheet plus the manifest"""
+        stat = os.stat(abs_path)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        formats = {}
+        for index, (name, df) in enumerate(frames.items()):
+            formats[name] = self._write_sheet(base, index, df)
+
+        self._write_meta(base, {
+            'path': abs_path,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': content_hash or file_sha256(abs_path),
+            'sheets': list(frames),
+            'formats': formats,
+        })
+
+
+_default_cache = None
+
+
+def _cache(cache_dir):
+    global _default_cache
+    if _default_cache is None or _default_cache.cache_dir != cache_dir:
+        _default_cache = ExcelSidecarCache(cache_dir)
+    return _default_cache
+
+
+def read_excel_cached(file_path, sheet_name=0, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    带旁路缓存的pd.read_excel / pd.read_excel backed by the sidecar cache
+
+    Args:
+        file_path (str): 工作簿路径
+        sheet_name (int|str|None): 工作表；None返回所有工作表
+        cache_dir (str): 缓存目录
+
+    Returns:
+        pd.DataFrame 或 dict
+    """
+    return _cache(cache_dir).read(file_path, sheet_name)
+
+
+def prime_excel_cache(file_path, frames, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    用写出工作簿时的数据框预先填充旁路缓存 / Prime the sidecar cache with the frames a workbook was written from
+
+    之后读取该工作簿（如export_to_csv）直接命中，不再解析xlsx。
+    Later reads of the workbook (e.g. export_to_csv) hit the cache instead of parsing the xlsx.
+
+    Args:
+        file_path (str): 已写出的工作簿路径
+        frames (dict): {工作表名称: 数据框}
+        cache_dir (str): 缓存目录
+    """
+    _cache(cache_dir).store(file_path, frames)
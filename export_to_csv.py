@@ -4,13 +4,21 @@
 Excel工作表导出为CSV / Excel Worksheet Export to CSV
 将integrated_data.xlsx中的各个工作表（除Summary外）导出为独立的CSV文件
 Export each worksheet (except Summary) in integrated_data.xlsx to separate CSV files
+
+main.py 默认已在同一次运行中直接从内存写出CSV；本脚本用于单独重新导出。
+由main.py写出的工作簿，其数据已预先存入旁路缓存，导出时无需解析xlsx。
+main.py already writes the CSVs straight from memory in the same run by default; this script
+re-exports on its own. Workbooks written by main.py have their frames pre-stored in the
+sidecar cache, so exporting them skips xlsx parsing.
 """
 
-import pandas as pd
 import os
 import sys
 from datetime import datetime
 
+from excel_cache import read_excel_cached
+from output_sinks import CsvSink
+
 def export_excel_to_csv(excel_file="integrated_data.xlsx", output_dir="csv_output"):
     """
     将Excel文件中的工作表导出为CSV文件
@@ -32,46 +40,45 @@ def export_excel_to_csv(excel_file="integrated_data.xlsx", output_dir="csv_outpu
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
         print(f"📁 创建输出目录 / Created output directory: {output_dir}")
+    sink = CsvSink(output_dir)
     
     try:
-        # 读取Excel文件 / Read Excel file
+        # 读取Excel文件（未变化时从旁路缓存加载）/ Read Excel file (from the sidecar cache when unchanged)
         print(f"🔍 读取Excel文件 / Reading Excel file...")
-        excel = pd.ExcelFile(excel_file)
+        workbook = read_excel_cached(excel_file, sheet_name=None)
         
         # 获取所有工作表名称 / Get all worksheet names
-        sheets = excel.sheet_names
+        sheets = list(workbook)
         print(f"📋 找到工作表 / Found worksheets: {sheets}")
         
-        # 导出每个工作表（除Summary外）/ Export each worksheet (except Summary)
-        exported_count = 0
+        # 导出每个工作表（除Summary外）；内容未变化的工作表跳过，变化的工作表并发写出
+        # Export each worksheet (except Summary); unchanged sheets are skipped, changed ones are written concurrently
         for sheet in sheets:
-            if sheet.lower() == "summary":
+            if not sink.exports(sheet):
                 print(f"⏭️  跳过Summary工作表 / Skipping Summary worksheet")
-                continue
-                
-            # 修正工作表名称 (如果是Rubber_Prices，则输出文件名改为Rubber_TSR20.csv)
-            output_sheet_name = "Rubber_TSR20" if sheet == "Rubber_Prices" else sheet
-                
-            print(f"📤 导出工作表 / Exporting worksheet: {sheet}")
-            
-            # 读取工作表数据 / Read worksheet data
-            df = pd.read_excel(excel, sheet_name=sheet)
-            
-            # 构建CSV文件名 / Build CSV filename
-            csv_file = os.path.join(output_dir, f"{output_sheet_name}.csv")
-            
-            # 导出到CSV / Export to CSV
-            df.to_csv(csv_file, index=False, encoding='utf-8')
+        
+        # Rubber_Prices输出为Rubber_TSR20.csv / Rubber_Prices becomes Rubber_TSR20.csv
+        results = sink.export(workbook)
+        
+        exported_count = 0
+        skipped_count = 0
+        for result in results:
+            csv_file = result['path']
             
             # 获取文件大小 / Get file size
             file_size = os.path.getsize(csv_file)
             file_size_kb = file_size / 1024
             
-            print(f"✅ 已导出 / Exported: {csv_file} ({file_size_kb:.2f} KB, {len(df)} 行记录 / rows)")
-            exported_count += 1
+            if result['written']:
+                print(f"✅ 已导出 / Exported: {csv_file} ({file_size_kb:.2f} KB, {result['rows']} 行记录 / rows)")
+                exported_count += 1
+            else:
+                print(f"⏭️  内容未变化，跳过 / Unchanged, skipped: {csv_file} ({file_size_kb:.2f} KB)")
+                skipped_count += 1
         
         print(f"\n🎉 导出完成 / Export completed!")
         print(f"📊 总计导出 / Total exported: {exported_count} 个CSV文件 / CSV files")
+        print(f"⏭️  未变化跳过 / Unchanged skipped: {skipped_count} 个CSV文件 / CSV files")
         print(f"📁 输出目录 / Output directory: {os.path.abspath(output_dir)}")
         
         return True
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+上游数据源变更检测缓存 / Upstream Source Change-Detection Cache
+按URL保存ETag/Last-Modified、内容哈希和TTL，用于判断数据源自上次成功抓取后是否发生变化
+Stores ETag/Last-Modified, content hash and TTL per URL to decide whether a source has
+changed since the last successful fetch
+
+用法 / Usage:
+    cache = FetchCache("fetch_cache.json")
+    probe = cache.probe(url, ttl_hours=24)
+    if probe['changed']:
+        ...  # 重新抓取 / re-scrape
+        cache.commit(probe)  # 仅在抓取成功后提交 / commit only after a successful scrape
+
+    changed, content = cache.fetch(url)  # 下载并立即提交 / download and commit immediately
+"""
+
+import hashlib
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+USER_AGENT = 'Mozilla/5.0 (compatible; RMI-Monthly-Update/1.0)'
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class FetchCache:
+    """抓取缓存类 / Fetch Cache Class"""
+
+    def __init__(self, cache_file="fetch_cache.json", default_ttl_hours=24, timeout=30):
+        self.cache_file = cache_file
+        self.default_ttl_hours = default_ttl_hours
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        """读取缓存文件 / Load the cache file"""
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """原子写入缓存文件 / Atomically write the cache file"""
+        directory = os.path.dirname(self.cache_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.cache_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.cache_file)
+
+    def get(self, url):
+        """已提交的缓存条目，没有时返回None / Committed cache entry, or None"""
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+
+    def _request(self, url, entry):
+        """
+        发送条件GET请求 / Send a conditional GET request
+
+        Returns:
+            tuple: (状态码, 响应头, 内容)；304时内容为None
+        """
+        headers = {'User-Agent': USER_AGENT}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return 304, e.headers, None
+            raise
+
+    def probe(self, url, ttl_hours=None):
+        """
+        检查数据源是否变化，不修改已提交的缓存 / Check whether a source changed without touching committed entries
+
+        判断顺序 / Decision order:
+            1. 缓存在TTL内 -> 未变化，不发请求 / entry within TTL -> unchanged, no request
+            2. 服务器返回304 -> 未变化 / server answers 304 -> unchanged
+            3. 内容哈希相同 -> 未变化 / same content hash -> unchanged
+            4. 其他情况（包括请求失败）-> 视为已变化 / anything else (including errors) -> treated as changed
+
+        Args:
+            url (str): 数据源URL
+            ttl_hours (float): 缓存有效期（小时），默认使用default_ttl_hours
+
+        Returns:
+            dict: {'url', 'changed', 'reason', 'entry'}，entry为待提交的新缓存条目（只含哈希和长度，不保存内容）
+        """
+        return self._probe(url, ttl_hours)[0]
+
+    def _probe(self, url, ttl_hours=None):
+        """
+        probe() 的实现，另外返回下载的内容 / probe() that also returns the downloaded content
+
+        内容不放在探测结果中：main在运行前探测所有模块，结果保留到模块完成
+        The content stays out of the probe result: main probes every module up front and keeps the
+        results until the modules finish
+
+        Returns:
+            tuple: (探测结果, 内容)；未下载内容（TTL内、304或请求失败）时内容为None
+        """
+        ttl_hours = self.default_ttl_hours if ttl_hours is None else ttl_hours
+        entry = self.get(url)
+        now = datetime.now()
+
+        if entry and ttl_hours > 0:
+            checked_at = datetime.strptime(entry['checked_at'], TIME_FORMAT)
+            if now - checked_at < timedelta(hours=ttl_hours):
+                return {'url': url, 'changed': False, 'reason': 'ttl', 'entry': entry}, None
+
+        try:
+            status, headers, content = self._request(url, entry)
+        except Exception as e:
+            return {'url': url, 'changed': True, 'reason': f'error: {e}', 'entry': None}, None
+
+        new_entry = dict(entry) if entry else {}
+        new_entry['checked_at'] = now.strftime(TIME_FORMAT)
+        new_entry['ttl_hours'] = ttl_hours
+
+        if status == 304:
+            return {'url': url, 'changed': False, 'reason': 'not_modified', 'entry': new_entry}, None
+
+        content_hash = hashlib.sha256(content).hexdigest()
+        new_entry.update({
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'content_hash': content_hash,
+            'content_length': len(content),
+        })
+
+        if entry and entry.get('content_hash') == content_hash:
+            return {'url': url, 'changed': False, 'reason': 'same_hash', 'entry': new_entry}, content
+
+        new_entry['changed_at'] = new_entry['checked_at']
+        return {'url': url, 'changed': True, 'reason': 'new' if not entry else 'content_changed', 'entry': new_entry}, content
+
+    def commit(self, probe_result):
+        """
+        提交探测结果，使其成为下一次比较的基准 / Commit a probe result as the baseline for the next comparison
+
+        Args:
+            probe_result (dict): probe() 的返回值
+        """
+        entry = probe_result.get('entry')
+        if not entry:
+            return
+        with self._lock:
+            self._entries[probe_result['url']] = dict(entry)
+            self._save()
+
+    def invalidate(self, url=None):
+        """清除单个或全部缓存条目 / Drop one or all cache entries"""
+        with self._lock:
+            if url is None:
+                self._entries = {}
+            else:
+                self._entries.pop(url, None)
+            self._save()
+
+    def fetch(self, url, ttl_hours=None):
+        """
+        下载数据源并立即提交缓存，供子模块替代"文件存在即跳过"的逻辑
+        Download a source and commit immediately; lets sub-modules replace "skip if the file exists"
+
+        Returns:
+            tuple: (是否变化, 内容)；未变化或仍在TTL内时内容为None
+        """
+        result, content = self._probe(url, ttl_hours=ttl_hours)
+        if result['entry'] is None:
+            raise RuntimeError(f"下载失败 / Download failed: {url}: {result['reason']}")
+        self.commit(result)
+        return result['changed'], content if result['changed'] else None
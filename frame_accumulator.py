@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按工作表累积数据框 / Per-Sheet DataFrame Accumulator
+只追加不复制地收集各模块的数据框，在写出前每个工作表只做一次拼接，避免重复pd.concat带来的二次方复制
+Collects module frames append-only and concatenates each sheet exactly once before writing,
+avoiding the quadratic copying of repeated pd.concat calls
+"""
+
+import threading
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def align_categories(frames):
+    """
+    统一各数据框同名分类列的类别，使拼接结果仍为分类列 / Give same-named categorical columns identical
+    categories so the concatenated column stays categorical instead of falling back to object strings
+
+    Args:
+        frames (list): 数据框列表
+
+    Returns:
+        list: 新的数据框列表（只替换分类列，不复制其他数据）
+    """
+    categories = {}
+    for df in frames:
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                categories.setdefault(column, {}).update(dict.fromkeys(df[column].cat.categories))
+
+    if not categories:
+        return frames
+
+    aligned = []
+    for df in frames:
+        columns = [column for column in categories
+                   if column in df.columns and isinstance(df[column].dtype, pd.CategoricalDtype)]
+        if columns:
+            df = df.copy(deep=False)
+            for column in columns:
+                df[column] = df[column].cat.set_categories(list(categories[column]))
+        aligned.append(df)
+    return aligned
+
+
+def concat_frames(frames):
+    """
+    一次性拼接数据框列表，跳过空数据框 / Concatenate a list of frames in one pass, skipping empty ones
+
+    Args:
+        frames (list): 数据框列表
+
+    Returns:
+        pd.DataFrame: 拼接结果；只有一个非空数据框时直接返回它（不复制）
+    """
+    frames = [df for df in frames if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(align_categories(frames), ignore_index=True)
+
+
+def peak_rss_mb():
+    """
+    当前进程的峰值常驻内存（MB），不支持的平台返回None / Peak resident memory of this process in MB, or None
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS以字节为单位，Linux以KB为单位 / bytes on macOS, kilobytes on Linux
+    divisor = 1024 * 1024 if peak > 1 << 32 else 1024
+    return round(peak / divisor, 1)
+
+
+class FrameAccumulator:
+    """数据框累积器类 / Frame Accumulator Class"""
+
+    def __init__(self):
+        self._frames = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'frames_appended': 0,
+            'rows_appended': 0,
+            'concat_calls': 0,
+            'rows_copied': 0,
+            'bytes_copied': 0,
+        }
+
+    def add(self, sheet_name, df):
+        """
+        追加数据框（不复制）/ Append a frame without copying
+
+        Args:
+            sheet_name (str): 工作表名称
+            df (pd.DataFrame): 数据框；空数据框只登记工作表
+        """
+        with self._lock:
+            frames = self._frames.setdefault(sheet_name, [])
+            if df is not None and not df.empty:
+                frames.append(df)
+                self.stats['frames_appended'] += 1
+                self.stats['rows_appended'] += len(df)
+
+    def ensure(self, sheet_name):
+        """登记工作表（即使没有数据）/ Register a sheet even if it has no data"""
+        with self._lock:
+            self._frames.setdefault(sheet_name, [])
+
+    def __contains__(self, sheet_name):
+        return sheet_name in self._frames
+
+    def materialize(self):
+        """
+        每个工作表拼接一次并返回结果 / Concatenate each sheet once and return the result
+
+        Returns:
+            dict: {工作表名称: 数据框}，顺序与首次登记顺序一致
+        """
+        with self._lock:
+            items = [(name, list(frames)) for name, frames in self._frames.items()]
+
+        all_data = {}
+        for sheet_name, frames in items:
+            data = concat_frames(frames)
+            if len(frames) > 1:
+                self.stats['concat_calls'] += 1
+                self.stats['rows_copied'] += len(data)
+                self.stats['bytes_copied'] += int(data.memory_usage(deep=True).sum())
+            all_data[sheet_name] = data
+        return all_data
+
+    def report(self):
+        """
+        累积统计（包含当前峰值内存）/ Accumulation statistics including current peak memory
+
+        Returns:
+            dict: 统计信息
+        """
+        stats = dict(self.stats)
+        stats['sheets'] = len(self._frames)
+        stats['peak_rss_mb'] = peak_rss_mb()
+        return stats
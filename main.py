@@ -2,8 +2,8 @@
 # -*- coding: utf-8 -*-
 """
 主程序 / Main Program
-依次执行四个子模块的数据爬取脚本，并将结果合并到一个Excel文件中
-Execute four sub-module data scraping scripts sequentially and merge results into one Excel file
+并发执行四个子模块的数据爬取脚本，并将结果合并到一个Excel文件中
+Execute four sub-module data scraping scripts concurrently and merge results into one Excel file
 
 作者: AI Assistant
 日期: 2025-07-01
@@ -18,11 +18,30 @@ from datetime import datetime
 import logging
 from pathlib import Path
 import traceback
+import argparse
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from module_plugins import PLUGIN_ENTRY_POINT, load_plugin, call_plugin
+from checkpoint_store import CheckpointStore
+from fetch_cache import FetchCache
+from run_report import RunReport
+from txt_parser import read_txt_columns
+from frame_accumulator import FrameAccumulator, concat_frames
+from excel_cache import read_excel_cached
+from series_schema import normalize_module, series_path, write_series, empty_series
+from series_db import SeriesDB, db_path
+from snapshot_archive import SnapshotArchive
+from output_sinks import create_sinks
+from provenance import PROVENANCE_SHEET, RUN_COLUMNS, add_provenance, split_provenance, memory_per_row, as_object_columns
 
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format='%(asctime)s - %(levelname)s - [%(threadName)s] %(message)s',
     handlers=[
         logging.FileHandler('main_execution.log', encoding='utf-8'),
         logging.StreamHandler()
@@ -30,48 +49,157 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 子进程输出保留的末尾行数（用于错误报告）/ Tail lines of subprocess output kept for error reports
+OUTPUT_TAIL_LINES = 200
+
+# 子进程结束后等待输出读取线程的秒数（孙进程可能继承管道而一直不关闭）
+# Seconds to wait for the output readers once the script has exited (a grandchild may inherit the pipes and keep them open)
+READER_JOIN_TIMEOUT = 5
+
 class DataIntegrator:
     """数据整合器类 / Data Integrator Class"""
     
-    def __init__(self, output_filename="integrated_data.xlsx"):
+    def __init__(self, output_filename="integrated_data.xlsx", max_workers=4, checkpoint_dir="checkpoints",
+                 keep_checkpoints=5, fetch_cache_file="fetch_cache.json", detect_changes=True, report_dir="run_reports",
+                 outputs=('parquet', 'xlsx', 'csv'), csv_dir="csv_output", streaming_excel=False,
+                 snapshot_dir="snapshots"):
         self.output_filename = output_filename
+        # 输出：同一组内存数据一次写入Parquet数据集、xlsx和CSV / Outputs written from the same in-memory frames in one pass
+        # streaming_excel: 以只写模式逐行写出xlsx，内存与行数无关 / write the xlsx row by row in constant memory
+        self.sinks = create_sinks(outputs, output_filename=output_filename, csv_dir=csv_dir,
+                                  streaming_excel=streaming_excel)
+        # 规范化长格式数据，保存在整合Excel旁边 / Normalized long-format data stored next to the workbook
+        self.series_filename = series_path(output_filename)
+        # 嵌入式时间序列数据库，只写入新增或修订的观测值 / Embedded series database; only new or revised observations are written
+        self.series_db = SeriesDB(db_path(output_filename))
+        # 每次运行的内容寻址快照，相同的历史数据块只保存一次 / Content-addressed snapshot per run; identical history chunks are stored once
+        self.snapshots = SnapshotArchive(snapshot_dir)
+        # 并发执行模块的最大线程数 / Maximum number of modules executed concurrently
+        self.max_workers = max_workers
+        # 模块结果检查点，用于失败后续跑 / Module result checkpoints used to resume failed runs
+        self.checkpoints = CheckpointStore(checkpoint_dir)
+        # 保留最近几次运行的检查点（0表示全部保留）/ Number of recent runs whose checkpoints are kept; 0 keeps all
+        self.keep_checkpoints = keep_checkpoints
+        self.run_id = None
+        # 上游数据源变更检测，未变化的模块直接复用上次结果 / Upstream change detection; unchanged modules reuse the last result
+        self.fetch_cache = FetchCache(fetch_cache_file)
+        self.detect_changes = detect_changes
+        # 分阶段计时报告 / Per-phase timing report
+        self.report_dir = report_dir
+        self.report = RunReport()
         self.scripts_config = [
             {
                 'name': 'Commodity Price Crawler',
                 'name_cn': '商品价格爬虫',
                 'script_path': 'func1/commodity_price_crawler.py',
                 'output_files': ['func1/rubber_prices.txt'],
-                'sheet_name': 'Rubber_TSR20'
+                'sheet_name': 'Rubber_TSR20',
+                'series_format': 'date_value',
+                'series_id': 'RUBBER_TSR20',
+                'unit': 'USD/kg',
+                'source_url': 'https://www.worldbank.org/en/research/commodity-markets',
+                # 变更检测只看数据文件本身（与func1下载的文件相同）/ Change detection probes the data file func1 downloads
+                'change_urls': ['https://thedocs.worldbank.org/en/doc/5d903e848db1d1b83e0ec8f744e55570-0350012021/related/CMO-Historical-Data-Monthly.xlsx'],
+                'cache_ttl_hours': 24
             },
             {
                 'name': 'BLS Data Scraper',
                 'name_cn': 'BLS数据爬虫',
                 'script_path': 'func2/bls_scraper_auto.py',
                 'output_files': ['func2/output/combined_data.xlsx', 'func2/bls_data.xlsx'],
-                'sheet_name': 'Commodity_Data'
+                'sheet_name': 'Commodity_Data',
+                'series_format': 'bls_wide',
+                'unit': 'Index',
+                'source_url': 'https://data.bls.gov/toppicks?survey=pc',
+                # 没有可探测的数据文件（页面动态生成），总是执行 / No data file to probe (dynamic page), so it always runs
+                'cache_ttl_hours': 24
             },
             {
                 'name': 'Exchange Rate Scraper',
                 'name_cn': '汇率数据爬虫',
                 'script_path': 'func3/exchange_rate_scraper.py',
                 'output_files': ['func3/exchange_rates.xlsx', 'func3/exchange_rates.txt'],
-                'sheet_name': 'Exchange_Rates'
+                'sheet_name': 'Exchange_Rates',
+                'series_format': 'fx_rates',
+                'series_id': 'USD/EUR',
+                'unit': 'EUR per USD',
+                'source_url': 'https://www.x-rates.com/average/',
+                # 没有可探测的数据文件（页面动态生成），总是执行 / No data file to probe (dynamic page), so it always runs
+                'cache_ttl_hours': 24
             },
             {
                 'name': 'FRED Data Scraper',
                 'name_cn': 'FRED数据爬虫',
                 'script_path': 'func4/run.py',
                 'output_files': ['func4/output/PCU314994314994_processed.xlsx', 'func4/output/PCU314994314994.xlsx'],
-                'sheet_name': 'Commodity_Data'
+                'sheet_name': 'Commodity_Data',
+                'series_format': 'fred_text',
+                'series_id': 'PCU314994314994',
+                'unit': 'Index',
+                'source_url': 'https://fred.stlouisfed.org/series/PCU314994314994',
+                'change_urls': ['https://fred.stlouisfed.org/graph/fredgraph.csv?id=PCU314994314994'],
+                'cache_ttl_hours': 24
             }
         ]
         
-    def execute_script(self, script_path):
+    def stream_output(self, stream, log, prefix, tail):
+        """
+        逐行读取子进程输出并写入日志 / Read subprocess output line by line and log it
+        
+        只保留有界的末尾缓冲，内存占用与输出总量无关。
+        Only a bounded tail buffer is kept, so memory does not grow with the output size.
+        
+        Args:
+            stream: 子进程的stdout或stderr
+            log (callable): 日志函数，如 logger.info
+            prefix (str): 日志行前缀
+            tail (deque): 有界的末尾缓冲
         """
-        执行单个脚本 / Execute single script
+        try:
+            for line in iter(stream.readline, ''):
+                line = line.rstrip('\r\n')
+                tail.append(line)
+                log(f"{prefix} {line}")
+        finally:
+            stream.close()
+    
+    @staticmethod
+    def join_readers(readers, timeout=READER_JOIN_TIMEOUT):
+        """等待输出读取线程，总共最多 timeout 秒 / Wait for the output readers, at most timeout seconds in total"""
+        deadline = time.monotonic() + timeout
+        for reader in readers:
+            reader.join(max(0.0, deadline - time.monotonic()))
+    
+    @staticmethod
+    def kill_process_tree(process):
+        """
+        结束子进程及其启动的所有进程（如chromedriver）/ Kill the script and every process it started, such as chromedriver
+        
+        Args:
+            process (subprocess.Popen): 以新进程组启动的子进程
+        """
+        if os.name == 'nt':
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+    
+    def execute_script(self, script_path, timeout=600):
+        """
+        以子进程执行单个旧式脚本 / Execute a single legacy script in a subprocess
+        
+        stdout/stderr实时逐行写入日志，失败时只报告末尾OUTPUT_TAIL_LINES行。
+        stdout/stderr are streamed into the log line by line; failures report only the last OUTPUT_TAIL_LINES lines.
         
         Args:
             script_path (str): 脚本路径
+            timeout (int): 超时时间（秒），默认10分钟
             
         Returns:
             bool: 执行成功返回True，失败返回False
@@ -83,81 +211,90 @@ class DataIntegrator:
             script_dir = os.path.dirname(script_path)
             script_name = os.path.basename(script_path)
             
-            # 切换到脚本目录执行
-            original_cwd = os.getcwd()
+            # 在脚本目录中执行（通过cwd参数，不修改进程工作目录，保证并发安全）
+            # Run inside the script directory via cwd= instead of os.chdir, so concurrent modules do not interfere
             if script_dir:
-                os.chdir(script_dir)
-                logger.info(f"切换到目录 / Changed to directory: {script_dir}")
+                logger.info(f"工作目录 / Working directory: {script_dir}")
+            
+            # 关闭子进程输出缓冲，保证日志实时
+            env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
             
             # 执行脚本
-            result = subprocess.run(
+            process = subprocess.Popen(
                 [sys.executable, script_name],
-                capture_output=True,
+                cwd=script_dir or None,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=600  # 10分钟超时
+                encoding='utf-8',
+                errors='replace',
+                env=env,
+                # 独立进程组，超时时可以连同孙进程一起结束 / Own process group so a timeout also kills grandchildren
+                start_new_session=os.name != 'nt',
+                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == 'nt' else 0
             )
             
-            # 切换回原目录
-            os.chdir(original_cwd)
+            prefix = f"[{script_name}]"
+            stdout_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+            stderr_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+            readers = [
+                threading.Thread(target=self.stream_output, args=(process.stdout, logger.info, prefix, stdout_tail),
+                                 name=f"{script_name}-stdout", daemon=True),
+                threading.Thread(target=self.stream_output, args=(process.stderr, logger.warning, prefix, stderr_tail),
+                                 name=f"{script_name}-stderr", daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
             
-            if result.returncode == 0:
+            try:
+                returncode = process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.kill_process_tree(process)
+                self.join_readers(readers)
+                logger.error(f"脚本执行超时 / Script execution timeout: {script_path}")
+                if stderr_tail:
+                    logger.error(f"错误信息末尾 / Error output tail:\n" + "\n".join(stderr_tail))
+                if stdout_tail:
+                    logger.error(f"标准输出末尾 / Standard output tail:\n" + "\n".join(stdout_tail))
+                return False
+            
+            # 读取线程是守护线程，孙进程占用管道时不再等待 / Readers are daemons; stop waiting if a grandchild holds the pipes
+            self.join_readers(readers)
+            
+            if returncode == 0:
                 logger.info(f"脚本执行成功 / Script executed successfully: {script_path}")
-                if result.stdout:
-                    logger.info(f"输出 / Output:\n{result.stdout}")
                 return True
             else:
                 logger.error(f"脚本执行失败 / Script execution failed: {script_path}")
-                logger.error(f"错误码 / Return code: {result.returncode}")
-                if result.stderr:
-                    logger.error(f"错误信息 / Error output:\n{result.stderr}")
-                if result.stdout:
-                    logger.error(f"标准输出 / Standard output:\n{result.stdout}")
+                logger.error(f"错误码 / Return code: {returncode}")
+                if stderr_tail:
+                    logger.error(f"错误信息末尾 / Error output tail:\n" + "\n".join(stderr_tail))
+                if stdout_tail:
+                    logger.error(f"标准输出末尾 / Standard output tail:\n" + "\n".join(stdout_tail))
                 return False
                 
-        except subprocess.TimeoutExpired:
-            logger.error(f"脚本执行超时 / Script execution timeout: {script_path}")
-            return False
         except Exception as e:
             logger.error(f"执行脚本时发生异常 / Exception during script execution: {script_path}")
             logger.error(f"异常信息 / Exception details: {str(e)}")
             logger.error(f"堆栈跟踪 / Stack trace:\n{traceback.format_exc()}")
             return False
-        finally:
-            # 确保回到原目录
-            try:
-                os.chdir(original_cwd)
-            except:
-                pass
     
     def read_txt_data(self, file_path):
         """
         读取文本文件数据 / Read text file data
         
+        一次性读入整个文件并按列解析（见txt_parser），结果与逐行解析一致。
+        Loads the whole file in one pass and parses it column-wise (see txt_parser); the output
+        matches the line-by-line reader.
+        
         Args:
             file_path (str): 文件路径
             
         Returns:
-            pd.DataFrame: 数据框
+            pd.DataFrame: 数据框（Date, Value）
         """
         try:
-            data = []
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        if ':' in line:
-                            parts = line.split(':', 1)
-                            if len(parts) == 2:
-                                date_str = parts[0].strip()
-                                value_str = parts[1].strip()
-                                # 提取数值（去掉单位）
-                                try:
-                                    value = float(value_str.split()[0])
-                                    data.append({'Date': date_str, 'Value': value})
-                                except:
-                                    pass
-            
-            return pd.DataFrame(data)
+            return read_txt_columns(file_path)
             
         except Exception as e:
             logger.error(f"读取文本文件失败 / Failed to read text file {file_path}: {e}")
@@ -175,10 +312,11 @@ class DataIntegrator:
             pd.DataFrame: 数据框
         """
         try:
+            # 工作簿未变化时从旁路缓存加载，避免重复解析xlsx
             if sheet_name:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
+                df = read_excel_cached(file_path, sheet_name=sheet_name)
             else:
-                df = pd.read_excel(file_path)
+                df = read_excel_cached(file_path)
             
             logger.info(f"成功读取Excel文件 / Successfully read Excel file: {file_path}")
             logger.info(f"数据形状 / Data shape: {df.shape}")
@@ -199,7 +337,7 @@ class DataIntegrator:
             pd.DataFrame: 处理后的数据框
         """
         output_files = config['output_files']
-        combined_data = pd.DataFrame()
+        frames = []
         
         for file_path in output_files:
             if not os.path.exists(file_path):
@@ -207,153 +345,581 @@ class DataIntegrator:
                 continue
                 
             try:
-                if file_path.endswith('.txt'):
-                    df = self.read_txt_data(file_path)
-                elif file_path.endswith(('.xlsx', '.xls')):
-                    df = self.read_excel_data(file_path)
-                else:
-                    logger.warning(f"不支持的文件格式 / Unsupported file format: {file_path}")
-                    continue
+                with self.report.timer('read', config['name']):
+                    if file_path.endswith('.txt'):
+                        df = self.read_txt_data(file_path)
+                    elif file_path.endswith(('.xlsx', '.xls')):
+                        df = self.read_excel_data(file_path)
+                    else:
+                        logger.warning(f"不支持的文件格式 / Unsupported file format: {file_path}")
+                        continue
                 
                 if not df.empty:
-                    # 添加数据源信息
-                    df['Source_File'] = os.path.basename(file_path)
-                    df['Data_Source'] = config['name']
-                    df['Generated_At'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    
-                    if combined_data.empty:
-                        combined_data = df
-                    else:
-                        combined_data = pd.concat([combined_data, df], ignore_index=True)
+                    with self.report.timer('parse', config['name']):
+                        # 添加数据源信息
+                        self.add_source_info(df, os.path.basename(file_path), config)
+                        frames.append(df)
                 
             except Exception as e:
                 logger.error(f"处理输出文件时发生错误 / Error processing output file {file_path}: {e}")
         
-        return combined_data
+        # 所有输出文件只拼接一次
+        with self.report.timer('parse', config['name']):
+            return concat_frames(frames)
+    
+    def add_source_info(self, df, source_file, config):
+        """
+        为数据框添加数据源信息列（分类类型）/ Add data source information columns (categorical) to a DataFrame
+        
+        Args:
+            df (pd.DataFrame): 数据框（原地修改）
+            source_file (str): 来源文件名
+            config (dict): 脚本配置
+        """
+        # 分类列：每个取值只保存一次，而不是每行一个字符串对象
+        add_provenance(df, source_file, config['name'], datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    
+    def execute_plugin(self, plugin, config):
+        """
+        在进程内执行插件模块 / Execute a plugin module in-process
+        
+        插件直接返回DataFrame，无需经过txt/xlsx文件中转；模块目录通过work_dir参数显式传入。
+        The plugin returns DataFrames directly, skipping the txt/xlsx round trip; the module
+        directory is passed explicitly as work_dir.
+        
+        Args:
+            plugin (callable): 插件入口函数
+            config (dict): 脚本配置
+            
+        Returns:
+            tuple: (是否成功, 数据框)
+        """
+        script_path = config['script_path']
+        try:
+            logger.info(f"进程内执行插件 / Running plugin in-process: {script_path}")
+            with self.report.timer('execute', config['name']):
+                frames = call_plugin(plugin, script_path)
+        except Exception as e:
+            logger.error(f"插件执行失败 / Plugin execution failed: {script_path}")
+            logger.error(f"异常信息 / Exception details: {str(e)}")
+            logger.error(f"堆栈跟踪 / Stack trace:\n{traceback.format_exc()}")
+            return False, pd.DataFrame()
+        
+        with self.report.timer('parse', config['name']):
+            annotated = []
+            for source_file, df in frames:
+                if df.empty:
+                    continue
+                df = df.copy()
+                self.add_source_info(df, source_file, config)
+                annotated.append(df)
+            combined_data = concat_frames(annotated)
+        
+        logger.info(f"插件执行成功 / Plugin executed successfully: {script_path}")
+        return True, combined_data
     
-    def create_integrated_excel(self, all_data):
+    def execute_module(self, config):
         """
-        创建整合的Excel文件 / Create integrated Excel file
+        执行模块：优先使用进程内插件，旧式脚本回退到子进程 / Execute a module: prefer the in-process plugin, fall back to a subprocess for legacy scripts
+        
+        Args:
+            config (dict): 脚本配置，可选键 'entry_point' 指定插件入口函数名
+            
+        Returns:
+            tuple: (是否成功, 数据框)
+        """
+        script_path = config['script_path']
+        entry_point = config.get('entry_point', PLUGIN_ENTRY_POINT)
+        
+        try:
+            plugin = load_plugin(script_path, entry_point)
+        except Exception as e:
+            logger.warning(f"插件加载失败，回退到子进程 / Plugin load failed, falling back to subprocess: {script_path}: {e}")
+            plugin = None
+        
+        if plugin is not None:
+            return self.execute_plugin(plugin, config)
+        
+        # 旧式脚本：子进程执行并读取输出文件
+        with self.report.timer('execute', config['name']):
+            success = self.execute_script(script_path)
+        if not success:
+            return False, pd.DataFrame()
+        
+        logger.info(f"📤 处理输出文件 / Processing output files: {config['name']}")
+        return True, self.process_output_files(config)
+    
+    def build_output_sheets(self, all_data):
+        """
+        构建输出工作表（Summary、各数据工作表、Provenance）/ Build the output sheets (Summary, data sheets, Provenance)
         
         Args:
             all_data (dict): 所有数据字典
+            
+        Returns:
+            dict: {工作表名称: 数据框}，顺序即工作簿顺序
+        """
+        sheets = {}
+        
+        # 创建汇总sheet
+        summary_data = []
+        for config in self.scripts_config:
+            sheet_name = config['sheet_name']
+            data = all_data.get(sheet_name, pd.DataFrame())
+            timings = self.report.module_timings(config['name'])
+            
+            summary_data.append({
+                'Module': config['name'],
+                'Module_CN': config['name_cn'],
+                'Sheet_Name': sheet_name,
+                'Records_Count': len(data),
+                'Status': 'Success' if not data.empty else 'No Data',
+                'Source_URL': config.get('source_url', ''),
+                'Generated_At': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'Execute_Seconds': timings['execute'],
+                'Read_Seconds': timings['read'],
+                'Parse_Seconds': timings['parse'],
+                'Merge_Seconds': timings['merge'],
+                'Total_Seconds': timings['total']
+            })
+        
+        sheets['Summary'] = pd.DataFrame(summary_data)
+        logger.info("创建汇总工作表 / Created summary worksheet")
+        
+        # 各个模块的数据（只为每个唯一的sheet_name创建一个工作表）
+        # 数据源信息列不逐行写出，而是按连续行段写入Provenance工作表
+        provenance_runs = []
+        for config in self.scripts_config:
+            sheet_name = config['sheet_name']
+            
+            # 跳过已经处理过的sheet
+            if sheet_name in sheets:
+                continue
+            
+            data = all_data.get(sheet_name, pd.DataFrame())
+            
+            if not data.empty:
+                data, runs = split_provenance(sheet_name, data)
+                provenance_runs.append(runs)
+                sheets[sheet_name] = data
+                logger.info(f"写入数据到工作表 / Wrote data to worksheet: {sheet_name} ({len(data)} 行记录 / records)")
+            else:
+                # 创建空的工作表并添加说明
+                sheets[sheet_name] = pd.DataFrame({
+                    'Status': ['No data available'],
+                    'Message': [f'No output data found for sheet: {sheet_name}'],
+                    'Generated_At': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+                })
+                logger.warning(f"创建空工作表 / Created empty worksheet: {sheet_name}")
+        
+        # Metadata工作表已移除，根据用户需求
+        
+        # 数据源信息（每个连续行段一行）
+        provenance_df = concat_frames(provenance_runs)
+        if not provenance_df.empty:
+            sheets[PROVENANCE_SHEET] = provenance_df[RUN_COLUMNS]
+            logger.info(f"写入数据源信息 / Wrote provenance: {PROVENANCE_SHEET} ({len(provenance_df)} 个行段 / row runs)")
+        
+        return sheets
+    
+    def create_integrated_excel(self, all_data, series=None):
+        """
+        创建整合输出：同一组数据一次性写入所有输出（Parquet数据集、xlsx、CSV）
+        Create the integrated outputs: the same data is written to every sink (Parquet dataset, xlsx, CSV) in one pass
+        
+        Args:
+            all_data (dict): 所有数据字典
+            series (pd.DataFrame): 规范化序列（供分区列式数据集使用）
         """
         try:
-            with pd.ExcelWriter(self.output_filename, engine='openpyxl') as writer:
-                # 创建汇总sheet
-                summary_data = []
-                for config in self.scripts_config:
-                    sheet_name = config['sheet_name']
-                    data = all_data.get(sheet_name, pd.DataFrame())
-                    
-                    # 添加数据来源网站
-                    data_source_url = {
-                        'Commodity Price Crawler': 'https://www.worldbank.org/en/research/commodity-markets',
-                        'BLS Data Scraper': 'https://data.bls.gov/toppicks?survey=pc',
-                        'Exchange Rate Scraper': 'https://www.x-rates.com/average/',
-                        'FRED Data Scraper': 'https://fred.stlouisfed.org/series/PCU314994314994'
-                    }
-                    
-                    summary_data.append({
-                        'Module': config['name'],
-                        'Module_CN': config['name_cn'],
-                        'Sheet_Name': sheet_name,
-                        'Records_Count': len(data),
-                        'Status': 'Success' if not data.empty else 'No Data',
-                        'Source_URL': data_source_url.get(config['name'], ''),
-                        'Generated_At': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    })
-                
-                summary_df = pd.DataFrame(summary_data)
-                summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                logger.info("创建汇总工作表 / Created summary worksheet")
-                
-                # 写入各个模块的数据（只为每个唯一的sheet_name创建一个工作表）
-                processed_sheets = set()
-                for config in self.scripts_config:
-                    sheet_name = config['sheet_name']
-                    
-                    # 跳过已经处理过的sheet
-                    if sheet_name in processed_sheets:
-                        continue
-                    
-                    processed_sheets.add(sheet_name)
-                    data = all_data.get(sheet_name, pd.DataFrame())
-                    
-                    if not data.empty:
-                        data.to_excel(writer, sheet_name=sheet_name, index=False)
-                        logger.info(f"写入数据到工作表 / Wrote data to worksheet: {sheet_name} ({len(data)} 行记录 / records)")
-                    else:
-                        # 创建空的工作表并添加说明
-                        empty_df = pd.DataFrame({
-                            'Status': ['No data available'],
-                            'Message': [f'No output data found for sheet: {sheet_name}'],
-                            'Generated_At': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
-                        })
-                        empty_df.to_excel(writer, sheet_name=sheet_name, index=False)
-                        logger.warning(f"创建空工作表 / Created empty worksheet: {sheet_name}")
-                
-                # Metadata工作表已移除，根据用户需求
+            sheets = self.build_output_sheets(all_data)
             
-            logger.info(f"整合Excel文件创建成功 / Integrated Excel file created successfully: {self.output_filename}")
+            for sink in self.sinks:
+                with self.report.timer(f'write_{sink.name}'):
+                    paths = sink.write(sheets, series)
+                if paths:
+                    logger.info(f"输出写入成功 / Output written ({sink.name}): {', '.join(paths)}")
+                else:
+                    logger.warning(f"⚠️  输出未写出（没有数据）/ Output skipped, no data: {sink.name}")
+            
+            logger.info(f"整合输出创建成功 / Integrated outputs created successfully: {', '.join(sink.name for sink in self.sinks)}")
             
         except Exception as e:
             logger.error(f"创建整合Excel文件失败 / Failed to create integrated Excel file: {e}")
             raise
     
-    def run(self):
+    def measure_memory(self, all_data):
+        """
+        记录各工作表每行内存占用（分类列 vs 逐行字符串）/ Record memory per row per sheet (categorical vs per-row strings)
+        
+        Args:
+            all_data (dict): 所有数据字典
+            
+        Returns:
+            dict: {工作表名称: {'rows', 'categorical_bytes_per_row', 'object_bytes_per_row'}}
+        """
+        usage = {}
+        for sheet_name, data in all_data.items():
+            if data.empty:
+                continue
+            usage[sheet_name] = {
+                'rows': len(data),
+                'categorical_bytes_per_row': round(memory_per_row(data), 1),
+                'object_bytes_per_row': round(memory_per_row(as_object_columns(data)), 1),
+            }
+            logger.info(f"🧮 每行内存 / Memory per row: {sheet_name}: "
+                        f"{usage[sheet_name]['categorical_bytes_per_row']} B "
+                        f"(逐行字符串 / per-row strings: {usage[sheet_name]['object_bytes_per_row']} B)")
+        self.report.set_metric('memory_per_row', usage)
+        return usage
+    
+    def create_series_store(self, module_results):
+        """
+        把各模块数据规范化为统一长格式并写出 / Normalize every module into the canonical long format and write it
+        
+        Args:
+            module_results (list): 与scripts_config顺序一致的 (是否成功, 数据框) 列表
+            
+        Returns:
+            pd.DataFrame: 规范化后的数据
+        """
+        frames = []
+        for config, (success, data) in zip(self.scripts_config, module_results):
+            if not success or data.empty:
+                continue
+            try:
+                series = normalize_module(config, data)
+            except Exception as e:
+                logger.warning(f"⚠️  规范化失败 / Failed to normalize {config['name']}: {e}")
+                continue
+            logger.info(f"🧾 规范化 / Normalized: {config['name']} -> {series['series_id'].nunique()} 个序列 / series, "
+                        f"{len(series)} 条记录 / records")
+            frames.append(series)
+        
+        series = concat_frames(frames)
+        if series.empty:
+            series = empty_series()
+        write_series(series, self.series_filename)
+        logger.info(f"整合序列文件创建成功 / Normalized series file created: {self.series_filename}")
+        return series
+    
+    def run_module(self, index, config):
+        """
+        执行单个模块并处理其输出文件 / Execute a single module and process its output files
+        
+        Args:
+            index (int): 模块序号（从1开始）
+            config (dict): 脚本配置
+            
+        Returns:
+            tuple: (是否成功, 数据框)
+        """
+        total = len(self.scripts_config)
+        logger.info(f"\n📊 [{index}/{total}] 执行模块 / Executing module: {config['name']} ({config['name_cn']})")
+        logger.info(f"📁 脚本路径 / Script path: {config['script_path']}")
+        
+        # 执行模块（插件或子进程）
+        success, data = self.execute_module(config)
+        self.report.set_status(config['name'], 'executed' if success else 'failed')
+        self.save_checkpoint(config, success, data)
+        
+        if not success:
+            logger.error(f"❌ 模块执行失败 / Module execution failed: {config['name']}")
+            return False, pd.DataFrame()
+        
+        logger.info(f"✅ 模块执行成功 / Module executed successfully: {config['name']}")
+        
+        if not data.empty:
+            logger.info(f"📈 {config['name']} 获取到 {len(data)} 条数据记录 / Retrieved {len(data)} data records")
+        else:
+            logger.warning(f"⚠️  {config['name']} 未获取到有效数据 / No valid data retrieved")
+        
+        return True, data
+    
+    def save_checkpoint(self, config, success, data):
+        """
+        保存模块检查点，失败时只记录警告 / Save a module checkpoint; failures only log a warning
+        
+        Args:
+            config (dict): 脚本配置
+            success (bool): 模块是否成功
+            data (pd.DataFrame): 解析后的数据
+        """
+        if self.run_id is None:
+            return
+        try:
+            self.checkpoints.save_module(self.run_id, config, success, data)
+        except Exception as e:
+            logger.warning(f"⚠️  保存检查点失败 / Failed to save checkpoint for {config['name']}: {e}")
+    
+    def schedule_modules(self, modules=None):
+        """
+        在有界线程池中并发执行所有模块 / Execute all modules concurrently in a bounded thread pool
+        
+        各模块相互独立，耗时由最慢的模块决定；结果按scripts_config顺序返回，
+        因此共享同一工作表的模块（如BLS和FRED）始终以确定的顺序合并。
+        Modules are independent, so wall-clock time is bounded by the slowest one; results are
+        returned in scripts_config order so modules sharing a sheet (e.g. BLS and FRED) merge deterministically.
+        
+        Args:
+            modules (list): 要执行的 (序号, 配置) 列表，默认为全部模块
+            
+        Returns:
+            list: 与modules顺序一致的 (是否成功, 数据框) 列表
+        """
+        if modules is None:
+            modules = list(enumerate(self.scripts_config, 1))
+        if not modules:
+            return []
+        
+        workers = max(1, min(self.max_workers or 1, len(modules)))
+        logger.info(f"⚙️  并发执行模块 / Running modules concurrently: {len(modules)} 个模块 / modules, {workers} 个线程 / workers")
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='module') as executor:
+            futures = [
+                executor.submit(self.run_module, i, config)
+                for i, config in modules
+            ]
+            results = []
+            for (_, config), future in zip(modules, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"❌ 模块执行异常 / Module raised an exception: {config['name']}: {e}")
+                    results.append((False, pd.DataFrame()))
+        
+        return results
+    
+    def restore_checkpoints(self, resume):
+        """
+        从检查点恢复已成功的模块 / Restore successful modules from checkpoints
+        
+        Args:
+            resume (str|bool): 要续跑的运行ID；True或'latest'表示最近一次运行
+            
+        Returns:
+            dict: {模块序号: 数据框}，只包含已成功的模块
+        """
+        run_id = self.checkpoints.latest_run_id() if resume in (True, 'latest') else resume
+        if not run_id or not os.path.isdir(self.checkpoints.run_dir(run_id)):
+            logger.warning(f"⚠️  未找到可续跑的检查点，执行完整运行 / No checkpoint found to resume, running all modules: {resume}")
+            return {}
+        
+        self.run_id = run_id
+        logger.info(f"♻️  从检查点续跑 / Resuming from checkpoint: {run_id}")
+        
+        restored = {}
+        for i, config in enumerate(self.scripts_config, 1):
+            try:
+                data = self.checkpoints.load_module(run_id, config)
+            except Exception as e:
+                logger.warning(f"⚠️  读取检查点失败 / Failed to load checkpoint for {config['name']}: {e}")
+                data = None
+            if data is not None:
+                restored[i] = data
+                self.report.set_status(config['name'], 'restored')
+                logger.info(f"♻️  使用缓存结果 / Using cached result: {config['name']} ({len(data)} 条记录 / records)")
+        
+        return restored
+    
+    def probe_sources(self, config):
+        """
+        探测模块的上游数据文件是否变化 / Probe whether a module's upstream data files changed
+        
+        只探测 'change_urls' 中的数据文件。'source_url' 是给人看的页面：动态页面每次请求都不同，
+        静态页面不变时其背后的数据文件仍可能已更新，因此没有配置 'change_urls' 的模块总是执行。
+        Only the data files in 'change_urls' are probed. 'source_url' is a human landing page: a
+        dynamic one differs on every request and a static one can stay the same while the data
+        file behind it changes, so modules without 'change_urls' always run.
+        
+        Args:
+            config (dict): 脚本配置
+            
+        Returns:
+            tuple: (是否全部未变化, 探测结果列表)
+        """
+        urls = config.get('change_urls') or []
+        if not urls:
+            return False, []
+        
+        probes = [self.fetch_cache.probe(url, ttl_hours=config.get('cache_ttl_hours')) for url in urls]
+        for probe in probes:
+            logger.info(f"🔎 数据源检测 / Source check: {config['name']}: {probe['url']} -> "
+                        f"{'changed' if probe['changed'] else 'unchanged'} ({probe['reason']})")
+        return not any(probe['changed'] for probe in probes), probes
+    
+    def skip_unchanged_modules(self, modules):
+        """
+        跳过上游数据源未变化的模块，复用最近一次成功的检查点
+        Skip modules whose upstream is unchanged, reusing their latest successful checkpoint
+        
+        Args:
+            modules (list): 待执行的 (序号, 配置) 列表
+            
+        Returns:
+            tuple: ({序号: 数据框} 已跳过的模块, {序号: 探测结果列表} 需在执行成功后提交的探测结果)
+        """
+        if not modules:
+            return {}, {}
+        
+        workers = max(1, min(self.max_workers or 1, len(modules)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='probe') as executor:
+            checks = list(executor.map(lambda item: self.probe_sources(item[1]), modules))
+        
+        skipped, pending_probes = {}, {}
+        for (i, config), (unchanged, probes) in zip(modules, checks):
+            if unchanged:
+                previous_run, data = self.checkpoints.latest_successful(config, exclude_run_id=self.run_id)
+                if data is not None:
+                    logger.info(f"⏭️  数据源未变化，跳过模块 / Upstream unchanged, skipping module: {config['name']} "
+                                f"(复用 / reusing {previous_run}, {len(data)} 条记录 / records)")
+                    skipped[i] = data
+                    self.report.set_status(config['name'], 'skipped')
+                    self.save_checkpoint(config, True, data)
+                    for probe in probes:
+                        self.fetch_cache.commit(probe)
+                    continue
+            pending_probes[i] = probes
+        
+        return skipped, pending_probes
+    
+    def write_run_report(self):
+        """
+        写出分阶段计时报告并输出到日志 / Write the per-phase timing report and log it
+        """
+        self.report.finish()
+        try:
+            report_path = self.report.write(self.report_dir)
+        except Exception as e:
+            logger.warning(f"⚠️  写入计时报告失败 / Failed to write timing report: {e}")
+            return
+        
+        logger.info(f"⏱️  计时报告 / Timing report: {report_path}")
+        for config in self.scripts_config:
+            timings = self.report.module_timings(config['name'])
+            logger.info(f"   {config['name']}: " + ", ".join(f"{phase}={seconds:.3f}s" for phase, seconds in timings.items()))
+        for step, seconds in self.report.steps.items():
+            logger.info(f"   {step}: {seconds:.3f}s")
+    
+    def run(self, resume=None):
         """
         运行主程序 / Run main program
+        
+        Args:
+            resume (str|bool): 续跑模式，只重新执行失败或缺失的模块；
+                               传入运行ID，或True/'latest'表示最近一次运行
+                               Resume mode re-executes only failed or missing modules;
+                               pass a run ID, or True/'latest' for the most recent run
         """
         logger.info("=" * 80)
         logger.info("🚀 数据整合程序启动 / Data Integration Program Started")
         logger.info("=" * 80)
         
         start_time = datetime.now()
-        all_data = {}
+        accumulator = FrameAccumulator()
         execution_results = {}
         
         try:
-            # 依次执行各个脚本
-            for i, config in enumerate(self.scripts_config, 1):
-                logger.info(f"\n📊 [{i}/{len(self.scripts_config)}] 执行模块 / Executing module: {config['name']} ({config['name_cn']})")
-                logger.info(f"📁 脚本路径 / Script path: {config['script_path']}")
-                
-                # 执行脚本
-                success = self.execute_script(config['script_path'])
+            self.run_id = None
+            self.report = RunReport()
+            restored = self.restore_checkpoints(resume) if resume else {}
+            if self.run_id is None:
+                self.run_id = self.checkpoints.new_run_id()
+            self.report.run_id = self.run_id
+            logger.info(f"🆔 运行ID / Run ID: {self.run_id}")
+            
+            # 跳过上游未变化的模块
+            pending = [(i, config) for i, config in enumerate(self.scripts_config, 1) if i not in restored]
+            if self.detect_changes:
+                skipped, pending_probes = self.skip_unchanged_modules(pending)
+                restored.update(skipped)
+                pending = [(i, config) for i, config in pending if i not in skipped]
+            else:
+                pending_probes = {}
+            
+            # 并发执行其余模块，按配置顺序合并结果
+            executed = dict(zip((i for i, _ in pending), self.schedule_modules(pending)))
+            
+            # 模块成功后才提交数据源检测结果，失败的模块下次仍会重新执行
+            for i, (success, _) in executed.items():
+                if success:
+                    for probe in pending_probes.get(i, []):
+                        self.fetch_cache.commit(probe)
+            
+            module_results = [
+                (True, restored[i]) if i in restored else executed[i]
+                for i in range(1, len(self.scripts_config) + 1)
+            ]
+            
+            # 按配置顺序追加到各工作表（不复制），共享工作表的模块顺序确定
+            for config, (success, data) in zip(self.scripts_config, module_results):
                 execution_results[config['name']] = success
                 
                 if success:
-                    logger.info(f"✅ 模块执行成功 / Module executed successfully: {config['name']}")
-                    
-                    # 处理输出文件
-                    logger.info("📤 处理输出文件 / Processing output files...")
-                    data = self.process_output_files(config)
-                    
-                    # 如果sheet_name已存在，合并数据；否则创建新的
-                    if config['sheet_name'] in all_data:
-                        if not data.empty and not all_data[config['sheet_name']].empty:
-                            all_data[config['sheet_name']] = pd.concat([all_data[config['sheet_name']], data], ignore_index=True)
-                            logger.info(f"📈 合并数据到现有工作表 / Merged data to existing sheet: {config['sheet_name']}")
-                        elif not data.empty:
-                            all_data[config['sheet_name']] = data
-                    else:
-                        all_data[config['sheet_name']] = data
-                    
-                    if not data.empty:
-                        logger.info(f"📈 获取到 {len(data)} 条数据记录 / Retrieved {len(data)} data records")
-                    else:
-                        logger.warning("⚠️  未获取到有效数据 / No valid data retrieved")
+                    with self.report.timer('merge', config['name']):
+                        if config['sheet_name'] in accumulator and not data.empty:
+                            logger.info(f"📈 合并数据到现有工作表 / Merged data to existing sheet: {config['sheet_name']} ({config['name']})")
+                        accumulator.add(config['sheet_name'], data)
                 else:
-                    logger.error(f"❌ 模块执行失败 / Module execution failed: {config['name']}")
-                    if config['sheet_name'] not in all_data:
-                        all_data[config['sheet_name']] = pd.DataFrame()
-                
-                logger.info(f"{'='*50}")
+                    accumulator.ensure(config['sheet_name'])
+            
+            # 每个工作表只拼接一次
+            with self.report.timer('materialize'):
+                all_data = accumulator.materialize()
+            self.measure_memory(all_data)
+            accumulator_stats = accumulator.report()
+            self.report.set_metric('accumulator', accumulator_stats)
+            logger.info(f"🧮 数据累积 / Accumulation: {accumulator_stats['frames_appended']} 个数据框 / frames, "
+                        f"{accumulator_stats['concat_calls']} 次拼接 / concat calls, "
+                        f"{accumulator_stats['rows_copied']} 行复制 / rows copied "
+                        f"({accumulator_stats['bytes_copied'] / 1024:.1f} KB), "
+                        f"峰值内存 / peak RSS: {accumulator_stats['peak_rss_mb']} MB")
+            
+            # 规范化为统一长格式，供可视化脚本直接加载
+            series = None
+            with self.report.timer('normalize_series'):
+                try:
+                    series = self.create_series_store(module_results)
+                except Exception as e:
+                    logger.warning(f"⚠️  写出规范化序列失败 / Failed to write normalized series: {e}")
+            
+            # 新增或修订的观测值写入时间序列数据库
+            if series is not None and not series.empty:
+                with self.report.timer('upsert_series'):
+                    try:
+                        counts = self.series_db.upsert(series)
+                        self.report.set_metric('series_db', counts)
+                        logger.info(f"🗄️  时间序列数据库 / Series database: {self.series_db.path}: "
+                                    f"新增 / inserted {counts['inserted']}, 修订 / revised {counts['revised']}, "
+                                    f"未变化 / unchanged {counts['unchanged']}")
+                    except Exception as e:
+                        logger.warning(f"⚠️  写入时间序列数据库失败 / Failed to update series database: {e}")
+            
+            # 归档本次运行的快照
+            if series is not None and not series.empty:
+                with self.report.timer('archive_snapshot'):
+                    try:
+                        stats = self.snapshots.save(self.run_id, series)
+                        self.report.set_metric('snapshot', stats)
+                        logger.info(f"📦 快照归档 / Snapshot archived: {stats['chunks']} 个数据块 / chunks, "
+                                    f"{stats['chunks_written']} 个新写出 / newly written "
+                                    f"({stats['bytes_written'] / 1024:.1f} KB)")
+                    except Exception as e:
+                        logger.warning(f"⚠️  快照归档失败 / Failed to archive snapshot: {e}")
             
             # 创建整合的Excel文件
             logger.info("\n📋 创建整合Excel文件 / Creating integrated Excel file...")
-            self.create_integrated_excel(all_data)
+            with self.report.timer('create_integrated_excel'):
+                self.create_integrated_excel(all_data, series)
+            
+            # 写出计时报告
+            self.write_run_report()
+            
+            # 清理较早运行的检查点
+            removed = self.checkpoints.prune(self.keep_checkpoints, protect=self.run_id)
+            if removed:
+                logger.info(f"🧹 已删除较早的检查点 / Removed older checkpoints: {len(removed)} 次运行 / runs "
+                            f"(保留最近 / keeping the latest {self.keep_checkpoints})")
             
             # 执行汇总
             end_time = datetime.now()
@@ -364,6 +930,8 @@ class DataIntegrator:
             logger.info("=" * 80)
             logger.info(f"⏱️  总耗时 / Total duration: {duration}")
             logger.info(f"📁 输出文件 / Output file: {self.output_filename}")
+            logger.info(f"🧾 序列文件 / Series file: {self.series_filename}")
+            logger.info(f"🆔 运行ID / Run ID: {self.run_id} (续跑 / resume: python main.py --resume {self.run_id})")
             
             # 执行结果汇总
             success_count = sum(1 for result in execution_results.values() if result)
@@ -389,18 +957,55 @@ class DataIntegrator:
             logger.error(f"堆栈跟踪 / Stack trace:\n{traceback.format_exc()}")
             raise
 
+def parse_args(argv=None):
+    """解析命令行参数 / Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="数据整合系统 / Data Integration System")
+    parser.add_argument('--output', default="integrated_data.xlsx",
+                        help="整合输出文件 / Integrated output file")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="并发执行的模块数，1表示顺序执行 / Concurrent modules, 1 runs sequentially")
+    parser.add_argument('--resume', nargs='?', const='latest', default=None, metavar='RUN_ID',
+                        help="从检查点续跑，只重新执行失败或缺失的模块（默认最近一次运行）/ "
+                             "Resume from checkpoints, re-running only failed or missing modules (default: latest run)")
+    parser.add_argument('--checkpoint-dir', default="checkpoints",
+                        help="检查点目录 / Checkpoint directory")
+    parser.add_argument('--keep-checkpoints', type=int, default=5,
+                        help="保留最近几次运行的检查点，0表示全部保留 / Runs whose checkpoints are kept, 0 keeps all")
+    parser.add_argument('--force', action='store_true',
+                        help="忽略数据源变更检测，重新执行所有模块 / Ignore change detection and re-run every module")
+    parser.add_argument('--fetch-cache', default="fetch_cache.json",
+                        help="数据源变更检测缓存文件 / Change-detection cache file")
+    parser.add_argument('--report-dir', default="run_reports",
+                        help="计时报告目录 / Timing report directory")
+    parser.add_argument('--outputs', default="parquet,xlsx,csv",
+                        help="输出格式（逗号分隔）/ Comma-separated output sinks: parquet, xlsx, csv")
+    parser.add_argument('--csv-dir', default="csv_output",
+                        help="CSV输出目录 / CSV output directory")
+    parser.add_argument('--streaming-excel', action='store_true',
+                        help="流式写出xlsx（内存占用与行数无关）/ Stream the xlsx in constant memory")
+    parser.add_argument('--snapshot-dir', default="snapshots",
+                        help="快照归档目录 / Snapshot archive directory")
+    return parser.parse_args(argv)
+
 def main():
     """主函数 / Main function"""
+    args = parse_args()
     try:
         print("🔧 数据整合系统 / Data Integration System")
         print("=" * 60)
-        print("依次执行四个数据爬虫模块并整合结果")
-        print("Execute four data scraping modules sequentially and integrate results")
+        print("并发执行四个数据爬虫模块并整合结果")
+        print("Execute four data scraping modules concurrently and integrate results")
         print("=" * 60)
         
         # 创建数据整合器并运行
-        integrator = DataIntegrator()
-        integrator.run()
+        integrator = DataIntegrator(output_filename=args.output, max_workers=args.workers,
+                                    checkpoint_dir=args.checkpoint_dir, keep_checkpoints=args.keep_checkpoints,
+                                    fetch_cache_file=args.fetch_cache, detect_changes=not args.force,
+                                    report_dir=args.report_dir,
+                                    outputs=[output.strip() for output in args.outputs.split(',') if output.strip()],
+                                    csv_dir=args.csv_dir, streaming_excel=args.streaming_excel,
+                                    snapshot_dir=args.snapshot_dir)
+        integrator.run(resume=args.resume)
         
         print(f"\n✅ 程序执行完成！请查看输出文件: {integrator.output_filename}")
         print(f"✅ Program completed! Please check output file: {integrator.output_filename}")
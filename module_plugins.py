@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据模块插件接口 / Data Module Plugin Interface
+允许子模块脚本以进程内可调用对象的形式直接返回DataFrame，而不是写入txt/xlsx再由主程序读取
+Lets sub-module scripts return DataFrames directly as an in-process callable instead of
+writing txt/xlsx files for the main program to read back
+
+插件约定 / Plugin contract:
+    脚本在模块顶层定义 fetch_data(work_dir)，work_dir 为模块目录的绝对路径（pathlib.Path）。
+    The script defines fetch_data(work_dir) at module level; work_dir is the absolute module directory (pathlib.Path).
+    返回值可以是 / The return value may be:
+        - pd.DataFrame
+        - dict: {来源名称 / source name: pd.DataFrame}
+    函数内部应使用 work_dir 拼接路径，不得调用 os.chdir。
+    Paths must be built from work_dir; the function must never call os.chdir.
+
+未定义入口函数的脚本视为旧式脚本，由主程序通过子进程执行。
+Scripts without the entry point are treated as legacy scripts and executed in a subprocess.
+"""
+
+import ast
+import importlib.util
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+# 默认插件入口函数名 / Default plugin entry point name
+PLUGIN_ENTRY_POINT = 'fetch_data'
+
+_plugin_cache = {}
+_plugin_lock = threading.Lock()
+
+
+def find_entry_point(script_path, entry_point=PLUGIN_ENTRY_POINT):
+    """
+    检查脚本是否在顶层定义了插件入口函数（只解析语法树，不执行脚本）
+    Check whether a script defines the plugin entry point at module level (parses the AST only, never executes the script)
+
+    Args:
+        script_path (str): 脚本路径
+        entry_point (str): 入口函数名
+
+    Returns:
+        bool: 定义了入口函数返回True
+    """
+    if not os.path.exists(script_path):
+        return False
+
+    try:
+        with open(script_path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=script_path)
+    except (SyntaxError, UnicodeDecodeError, OSError):
+        return False
+
+    return any(
+        isinstance(node, ast.FunctionDef) and node.name == entry_point
+        for node in tree.body
+    )
+
+
+def load_plugin(script_path, entry_point=PLUGIN_ENTRY_POINT):
+    """
+    在进程内加载插件入口函数，结果按脚本绝对路径缓存
+    Load the plugin entry point in-process; results are cached by absolute script path
+
+    Args:
+        script_path (str): 脚本路径
+        entry_point (str): 入口函数名
+
+    Returns:
+        callable: 插件入口函数；脚本不是插件时返回None
+    """
+    abs_path = os.path.abspath(script_path)
+    key = (abs_path, entry_point)
+
+    with _plugin_lock:
+        if key in _plugin_cache:
+            return _plugin_cache[key]
+
+        if not find_entry_point(abs_path, entry_point):
+            _plugin_cache[key] = None
+            return None
+
+        # 以唯一名称导入，避免不同模块目录下的同名脚本互相覆盖
+        module_name = 'rmi_plugin_' + ''.join(c if c.isalnum() else '_' for c in abs_path)
+        spec = importlib.util.spec_from_file_location(module_name, abs_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        plugin = getattr(module, entry_point, None)
+        _plugin_cache[key] = plugin if callable(plugin) else None
+        return _plugin_cache[key]
+
+
+def call_plugin(plugin, script_path):
+    """
+    调用插件并规范化返回值 / Call a plugin and normalize its return value
+
+    Args:
+        plugin (callable): 插件入口函数
+        script_path (str): 脚本路径，其所在目录作为 work_dir 传入
+
+    Returns:
+        list: [(来源名称 / source name, pd.DataFrame), ...]
+    """
+    work_dir = Path(os.path.abspath(script_path)).parent
+    result = plugin(work_dir)
+
+    if result is None:
+        return []
+    if isinstance(result, pd.DataFrame):
+        return [(os.path.basename(script_path), result)]
+    if isinstance(result, dict):
+        frames = []
+        for name, df in result.items():
+            if not isinstance(df, pd.DataFrame):
+                raise TypeError(f"插件返回值必须是DataFrame / Plugin value for '{name}' is not a DataFrame: {type(df).__name__}")
+            frames.append((str(name), df))
+        return frames
+
+    raise TypeError(f"不支持的插件返回类型 / Unsupported plugin return type: {type(result).__name__}")
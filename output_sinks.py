@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+整合结果输出 / Integrated Output Sinks
+同一组内存中的工作表数据框一次性写入多个输出（Parquet数据集、xlsx、CSV），不再先写xlsx再解析导出CSV
+Writes the same in-memory frames to several outputs (Parquet dataset, xlsx, CSV) in one pass,
+instead of writing the xlsx and parsing it back to export CSVs
+
+用法 / Usage:
+    sinks = create_sinks(['parquet', 'xlsx', 'csv'], output_filename="integrated_data.xlsx", csv_dir="csv_output")
+    for sink in sinks:
+        sink.write(sheets, series)   # sheets: {工作表名称: 数据框}，顺序即工作簿顺序；series: 规范化序列
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+from columnar_store import store_path, write_store
+from excel_cache import as_parsed_sheet, prime_excel_cache
+
+# 流式写出Excel时每批转换的行数 / Rows converted per batch when streaming Excel
+EXCEL_STREAM_CHUNK_ROWS = 10_000
+
+# 与pandas.ExcelWriter默认一致的日期时间格式 / Datetime format matching the pandas.ExcelWriter default
+EXCEL_DATETIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+
+# 表头样式（pandas 2.x to_excel 的默认表头：粗体、细边框、水平居中、顶端对齐），两种写出模式都使用
+# Header style: the pandas 2.x to_excel default (bold, thin border, centered, top-aligned), used by both write modes
+EXCEL_HEADER_FONT = Font(bold=True)
+EXCEL_HEADER_BORDER = Border(left=Side(style='thin'), right=Side(style='thin'),
+                             top=Side(style='thin'), bottom=Side(style='thin'))
+EXCEL_HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+
+# CSV文件名与工作表名称不同的情况 / CSV file names that differ from the sheet name
+CSV_FILE_NAMES = {'Rubber_Prices': 'Rubber_TSR20'}
+
+# 不导出为CSV的工作表 / Sheets not exported to CSV
+CSV_SKIP_SHEETS = ('summary',)
+
+
+def style_header_cell(cell):
+    """设置表头单元格样式 / Apply the header style to a cell"""
+    cell.font = EXCEL_HEADER_FONT
+    cell.border = EXCEL_HEADER_BORDER
+    cell.alignment = EXCEL_HEADER_ALIGNMENT
+    return cell
+
+
+def write_excel_streaming(output_filename, sheets, chunk_rows=EXCEL_STREAM_CHUNK_ROWS):
+    """
+    以openpyxl只写模式逐行写出工作簿，内存占用与行数无关
+    Write a workbook row by row in openpyxl write-only mode, with memory independent of the row count
+
+    单元格内容与 DataFrame.to_excel(index=False) 一致：表头为列名（带表头样式），缺失值为空单元格，无穷大为 inf / -inf 文本。
+    Cell contents match DataFrame.to_excel(index=False): the header holds the column names (with the header style), missing values are empty cells and infinities are inf / -inf text.
+
+    Args:
+        output_filename (str): 输出路径
+        sheets (dict): {工作表名称: 数据框}
+        chunk_rows (int): 每批转换为Python对象的行数
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    for sheet_name, df in sheets.items():
+        worksheet = workbook.create_sheet(title=sheet_name)
+        worksheet.append([style_header_cell(WriteOnlyCell(worksheet, value=column)) for column in df.columns])
+        # 日期时间列使用与pandas相同的单元格格式 / Datetime columns get the same number format as pandas
+        datetime_columns = [i for i, dtype in enumerate(df.dtypes) if pd.api.types.is_datetime64_any_dtype(dtype)]
+        infinite_columns = [i for i, dtype in enumerate(df.dtypes)
+                            if pd.api.types.is_float_dtype(dtype) and np.isinf(df.iloc[:, i]).any()]
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows].astype(object)
+            chunk = chunk.where(chunk.notna(), None)
+            for i in infinite_columns:
+                # 与pandas的inf_rep一致 / Same as pandas' inf_rep
+                column = chunk.iloc[:, i]
+                chunk.iloc[:, i] = column.mask(column == np.inf, 'inf').mask(column == -np.inf, '-inf')
+            for row in chunk.itertuples(index=False, name=None):
+                if datetime_columns:
+                    row = list(row)
+                    for i in datetime_columns:
+                        if row[i] is not None:
+                            cell = WriteOnlyCell(worksheet, value=row[i])
+                            cell.number_format = EXCEL_DATETIME_FORMAT
+                            row[i] = cell
+                worksheet.append(row)
+    workbook.save(output_filename)
+
+
+class ExcelSink:
+    """Excel输出类 / Excel Output Sink"""
+
+    name = 'xlsx'
+
+    def __init__(self, output_filename, prime_cache=True, streaming=False):
+        self.output_filename = output_filename
+        # 流式模式：逐行写出，不在内存中构建完整的工作簿对象 / Streaming mode writes row by row without building the full workbook in memory
+        self.streaming = streaming
+        # 写出后用同一组数据框填充旁路缓存，后续读取无需解析 / Prime the sidecar cache so later reads skip parsing
+        self.prime_cache = prime_cache
+
+    def write(self, sheets, series=None):
+        """
+        写出所有工作表 / Write every sheet
+
+        Args:
+            sheets (dict): {工作表名称: 数据框}
+            series (pd.DataFrame): 规范化序列（不使用）
+
+        Returns:
+            list: 写出的文件路径
+        """
+        if self.streaming:
+            write_excel_streaming(self.output_filename, sheets)
+        else:
+            with pd.ExcelWriter(self.output_filename, engine='openpyxl') as writer:
+                for sheet_name, df in sheets.items():
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+                    # pandas 3 不再设置表头样式，统一设置 / pandas 3 no longer styles the header, so set it here
+                    for cell in writer.sheets[sheet_name][1]:
+                        style_header_cell(cell)
+
+        if self.prime_cache:
+            prime_excel_cache(self.output_filename, sheets)
+        return [self.output_filename]
+
+
+def frame_hash(df):
+    """
+    数据框内容哈希（列名、类型和所有值）/ Content hash of a frame (column names, dtypes and every value)
+
+    Returns:
+        str: SHA-256十六进制字符串
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(column), str(dtype)] for column, dtype in df.dtypes.items()]).encode('utf-8'))
+    if not df.empty:
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class CsvSink:
+    """CSV输出类 / CSV Output Sink"""
+
+    name = 'csv'
+
+    # 各工作表内容哈希的清单 / Manifest of per-sheet content hashes
+    MANIFEST_FILE = '.csv_manifest.json'
+
+    def __init__(self, output_dir="csv_output", max_workers=4, incremental=True):
+        self.output_dir = output_dir
+        # 并发写出变化工作表的线程数 / Threads used to write changed sheets concurrently
+        self.max_workers = max_workers
+        # 增量模式：内容哈希未变化且文件未被修改的工作表不重写，保持原有修改时间
+        # Incremental mode skips sheets whose content hash is unchanged and whose file is untouched, keeping its mtime
+        self.incremental = incremental
+
+    @staticmethod
+    def exports(sheet_name):
+        """工作表是否导出为CSV / Whether a sheet is exported to CSV"""
+        return sheet_name.lower() not in CSV_SKIP_SHEETS
+
+    def csv_path(self, sheet_name):
+        """工作表对应的CSV路径 / CSV path of a sheet"""
+        return os.path.join(self.output_dir, f"{CSV_FILE_NAMES.get(sheet_name, sheet_name)}.csv")
+
+    def _manifest_path(self):
+        return os.path.join(self.output_dir, self.MANIFEST_FILE)
+
+    def load_manifest(self):
+        """读取清单，不存在或损坏时返回空字典 / Load the manifest, or an empty dict if missing or corrupt"""
+        try:
+            with open(self._manifest_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest):
+        tmp_path = self._manifest_path() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._manifest_path())
+
+    @staticmethod
+    def _unchanged(entry, csv_file, content_hash):
+        """清单记录与当前内容和文件一致 / The manifest entry matches the content and the file on disk"""
+        if not entry or entry.get('hash') != content_hash or not os.path.exists(csv_file):
+            return False
+        stat = os.stat(csv_file)
+        return entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size
+
+    def write_sheet(self, sheet_name, df):
+        """
+        原子写出单个工作表 / Atomically write a single sheet
+
+        Returns:
+            str: CSV文件路径
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        csv_file = self.csv_path(sheet_name)
+        df.to_csv(csv_file + '.tmp', index=False, encoding='utf-8')
+        os.replace(csv_file + '.tmp', csv_file)
+        return csv_file
+
+    def export(self, sheets):
+        """
+        导出所有工作表（除Summary外），只重写内容变化的工作表，变化的工作表并发写出
+        Export every sheet except Summary, rewriting only changed sheets and writing those concurrently
+
+        工作表按整合Excel读回的形式导出（as_parsed_sheet），main直接导出和export_to_csv读取工作簿后导出的
+        内容和哈希一致
+        Sheets are exported as the integrated workbook reads back (as_parsed_sheet), so exporting
+        straight from main and exporting from the workbook with export_to_csv give the same content and hash
+
+        Args:
+            sheets (dict): {工作表名称: 数据框}
+
+        Returns:
+            list: 每个工作表一项 {'sheet', 'path', 'rows', 'written'}，顺序与sheets一致
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = self.load_manifest() if self.incremental else {}
+
+        results, changed = [], []
+        for sheet_name, df in sheets.items():
+            if not self.exports(sheet_name):
+                continue
+            csv_file = self.csv_path(sheet_name)
+            df = as_parsed_sheet(df)
+            content_hash = frame_hash(df)
+            key = os.path.basename(csv_file)
+            written = not self._unchanged(manifest.get(key), csv_file, content_hash)
+            results.append({'sheet': sheet_name, 'path': csv_file, 'rows': len(df), 'written': written})
+            if written:
+                changed.append((key, sheet_name, df, content_hash))
+
+        if changed:
+            workers = max(1, min(self.max_workers or 1, len(changed)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='csv') as executor:
+                paths = list(executor.map(lambda item: self.write_sheet(item[1], item[2]), changed))
+            for (key, sheet_name, df, content_hash), csv_file in zip(changed, paths):
+                stat = os.stat(csv_file)
+                manifest[key] = {'sheet': sheet_name, 'hash': content_hash, 'rows': len(df),
+                                 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+            self._write_manifest(manifest)
+        return results
+
+    def write(self, sheets, series=None):
+        """
+        写出所有工作表（除Summary外）/ Write every sheet except Summary
+
+        Args:
+            sheets (dict): {工作表名称: 数据框}
+            series (pd.DataFrame): 规范化序列（不使用）
+
+        Returns:
+            list: 所有CSV文件路径（包括未变化而跳过的）
+        """
+        return [result['path'] for result in self.export(sheets)]
+
+
+class ColumnarSink:
+    """分区列式数据集输出类 / Partitioned Columnar Dataset Sink"""
+
+    name = 'parquet'
+
+    def __init__(self, output_filename):
+        self.root = store_path(output_filename)
+
+    def write(self, sheets, series=None):
+        """
+        按 series_id/year 分区写出规范化序列 / Write the normalized series partitioned by series_id/year
+
+        Args:
+            sheets (dict): {工作表名称: 数据框}（不使用）
+            series (pd.DataFrame): 规范化序列
+
+        Returns:
+            list: 写出的目录；没有序列时为空列表
+        """
+        if series is None or series.empty:
+            return []
+        return [write_store(series, self.root)]
+
+
+OUTPUT_SINKS = {
+    ColumnarSink.name: ColumnarSink,
+    ExcelSink.name: ExcelSink,
+    CsvSink.name: CsvSink,
+}
+
+
+def create_sinks(outputs, output_filename="integrated_data.xlsx", csv_dir="csv_output", streaming_excel=False):
+    """
+    按名称创建输出 / Create sinks by name
+
+    Args:
+        outputs (list): 输出名称，例如 ['parquet', 'xlsx', 'csv']
+        output_filename (str): Excel文件路径
+        csv_dir (str): CSV目录
+        streaming_excel (bool): Excel使用流式写出
+
+    Returns:
+        list: 输出对象列表
+    """
+    sinks = []
+    for output in outputs:
+        if output not in OUTPUT_SINKS:
+            raise ValueError(f"Unknown output sink: {output} (available: {', '.join(OUTPUT_SINKS)})")
+        if output == ColumnarSink.name:
+            sinks.append(ColumnarSink(output_filename))
+        elif output == ExcelSink.name:
+            sinks.append(ExcelSink(output_filename, streaming=streaming_excel))
+        elif output == CsvSink.name:
+            sinks.append(CsvSink(csv_dir))
+    return sinks
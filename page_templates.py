@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面模板 / Page Templates
+可视化页面的骨架（样式、布局、Chart.js配置）保存在 templates/ 下的普通HTML/CSS/JS文件中，
+每个模板只读取和编译一次（展开 include、切分为字面量片段和插槽）并缓存在进程内，
+之后每次渲染只填充少量数据和指标插槽，同一进程可以快速渲染大量页面
+The page skeletons (styles, layout, Chart.js config) live as plain HTML/CSS/JS files under
+templates/. Each template is read and compiled once (includes expanded, split into literal
+chunks and slots) and cached in the process; every render after that only fills the few
+data and KPI slots, so one process can render many pages quickly
+
+模板语法 / Template syntax:
+    {{ name }}                  插入 context['name']，按HTML转义 / insert context['name'], HTML-escaped
+    {{ name|raw }}              原样插入（HTML片段）/ insert as-is (HTML fragments)
+    {{ name|json }}             紧凑JSON，可嵌入 <script> / compact JSON that can be embedded in a <script>
+    {% include "_part.css" %}   编译时展开另一个模板文件 / expand another template file at compile time
+
+CSS和JS中的花括号不需要转义。/ Braces in CSS and JS need no escaping.
+
+用法 / Usage:
+    html = render_page('rubber_price.html', latest_value='1.6843', chart_data=payload, ...)
+    template_digest('rubber_price.html')    # 模板版本（含所有include）/ template version including every include
+"""
+
+import hashlib
+import html
+import os
+import re
+from datetime import datetime
+from functools import lru_cache
+
+from chart_payload import encode_payload
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+SLOT_PATTERN = re.compile(r'\{\{\s*(\w+)\s*(?:\|\s*(\w+)\s*)?\}\}')
+INCLUDE_PATTERN = re.compile(r'\{%\s*include\s+"([^"]+)"\s*%\}')
+
+# 插槽过滤器 / Slot filters
+FILTERS = {
+    'escape': lambda value: html.escape(str(value), quote=True),
+    'raw': str,
+    'json': encode_payload,
+}
+
+# 涨跌显示（与页面中的 change-* 样式对应）/ Change display matching the pages' change-* classes
+CHANGE_CLASSES = {1: 'change-positive', -1: 'change-negative', 0: 'change-neutral'}
+CHANGE_ARROWS = {1: '↗️', -1: '↘️', 0: '➡️'}
+
+
+class Template:
+    """编译后的模板类 / Compiled Template Class"""
+
+    def __init__(self, name, source):
+        self.name = name
+        self.source = source
+        self.digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+        # 字面量与插槽交替：[(字面量, 插槽名, 过滤器), ...] / Alternating literals and slots
+        self.parts = []
+        self.slots = []
+        position = 0
+        for match in SLOT_PATTERN.finditer(source):
+            name, filter_name = match.group(1), match.group(2) or 'escape'
+            if filter_name not in FILTERS:
+                raise ValueError(f"Unknown filter '{filter_name}' in template {self.name}")
+            self.parts.append((source[position:match.start()], name, FILTERS[filter_name]))
+            if name not in self.slots:
+                self.slots.append(name)
+            position = match.end()
+        self.tail = source[position:]
+
+    def render(self, context):
+        """
+        填充插槽 / Fill the slots
+
+        Args:
+            context (dict): {插槽名: 值}
+
+        Returns:
+            str: 渲染结果
+        """
+        missing = [slot for slot in self.slots if slot not in context]
+        if missing:
+            raise KeyError(f"Template {self.name} is missing slots: {', '.join(missing)}")
+        chunks = []
+        for literal, slot, apply in self.parts:
+            chunks.append(literal)
+            chunks.append(apply(context[slot]))
+        chunks.append(self.tail)
+        return ''.join(chunks)
+
+
+def expand_includes(name, stack=()):
+    """
+    读取模板文件并递归展开 include / Read a template file and expand its includes recursively
+
+    Returns:
+        str: 展开后的源文本
+    """
+    if name in stack:
+        raise ValueError(f"Recursive include: {' -> '.join(stack + (name,))}")
+    with open(os.path.join(TEMPLATE_DIR, name), 'r', encoding='utf-8') as f:
+        source = f.read()
+    return INCLUDE_PATTERN.sub(lambda match: expand_includes(match.group(1), stack + (name,)), source)
+
+
+@lru_cache(maxsize=None)
+def load_template(name):
+    """
+    读取并编译模板（每个进程每个模板只做一次）/ Read and compile a template, once per template per process
+
+    Args:
+        name (str): templates/ 下的文件名
+
+    Returns:
+        Template: 编译后的模板
+    """
+    return Template(name, expand_includes(name))
+
+
+def render_page(name, **context):
+    """
+    用缓存的模板渲染页面 / Render a page with the cached template
+
+    Args:
+        name (str): 模板文件名
+        **context: 插槽取值
+
+    Returns:
+        str: HTML文本
+    """
+    return load_template(name).render(context)
+
+
+def template_digest(name):
+    """
+    模板内容哈希（含所有include），用作模板版本 / Template content hash including every include, used as its version
+
+    Returns:
+        str: SHA-256十六进制字符串
+    """
+    return load_template(name).digest
+
+
+def generated_at():
+    """页面生成时间 / Page generation timestamp"""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def number_display(value, spec):
+    """按格式显示数值，缺失为 'N/A' / Format a value, 'N/A' where missing"""
+    return format(value, spec) if value is not None else 'N/A'
+
+
+def change_slots(change, prefix):
+    """
+    变化率的显示插槽 / Display slots of a percentage change
+
+    Args:
+        change (float): 变化率（%），可能为None
+        prefix (str): 插槽名前缀，例如 'mom'
+
+    Returns:
+        dict: {prefix_change: '+1.23%', prefix_class: 'change-positive', prefix_arrow: '↗️'}
+    """
+    sign = (change > 0) - (change < 0) if change else 0
+    return {
+        f'{prefix}_change': number_display(change, '+.2f') + ('%' if change is not None else ''),
+        f'{prefix}_class': CHANGE_CLASSES[sign],
+        f'{prefix}_arrow': CHANGE_ARROWS[sign],
+    }
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据源信息列 / Provenance Columns
+Source_File、Data_Source、Generated_At 在内存中以分类（字典编码）列保存，每个值只存一次；
+写出时从数据工作表中拆出，按连续行段保存到单独的 Provenance 工作表
+Source_File, Data_Source and Generated_At are kept in memory as categorical
+(dictionary-encoded) columns so each value is stored once; on write they are split off
+the data sheets and stored as row runs in a separate Provenance sheet
+
+Provenance 工作表 / Provenance sheet:
+    Sheet_Name, First_Row, Last_Row, Source_File, Data_Source, Generated_At
+    First_Row/Last_Row 为数据行号（从1开始，不含表头，与CSV中的数据行一致）
+    First_Row/Last_Row are 1-based data row numbers (header excluded, as in the CSV files)
+"""
+
+import numpy as np
+import pandas as pd
+
+PROVENANCE_COLUMNS = ['Source_File', 'Data_Source', 'Generated_At']
+PROVENANCE_SHEET = 'Provenance'
+RUN_COLUMNS = ['Sheet_Name', 'First_Row', 'Last_Row'] + PROVENANCE_COLUMNS
+
+
+def constant_column(value, length):
+    """
+    长度为length、只有一个取值的分类列 / A categorical column of one repeated value
+
+    只保存一个字符串和每行一个int8编码。
+    Stores the string once plus one int8 code per row.
+    """
+    return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), categories=[value])
+
+
+def add_provenance(df, source_file, data_source, generated_at):
+    """
+    原地添加数据源信息分类列 / Add provenance categorical columns in place
+
+    Args:
+        df (pd.DataFrame): 数据框
+        source_file (str): 来源文件名
+        data_source (str): 数据源模块名称
+        generated_at (str): 生成时间
+    """
+    for column, value in zip(PROVENANCE_COLUMNS, (source_file, data_source, generated_at)):
+        df[column] = constant_column(value, len(df))
+
+
+def split_provenance(sheet_name, df):
+    """
+    把数据源信息列拆分为连续行段 / Split the provenance columns off into row runs
+
+    Args:
+        sheet_name (str): 工作表名称
+        df (pd.DataFrame): 数据框
+
+    Returns:
+        tuple: (不含数据源信息列的数据框, 行段数据框 RUN_COLUMNS)
+    """
+    columns = [column for column in PROVENANCE_COLUMNS if column in df.columns]
+    if not columns or df.empty:
+        return df, pd.DataFrame(columns=RUN_COLUMNS)
+
+    provenance = df[columns].reset_index(drop=True)
+    changed = provenance.ne(provenance.shift()).any(axis=1).to_numpy()
+    starts = np.flatnonzero(changed)
+    ends = np.append(starts[1:], len(provenance)) - 1
+
+    runs = provenance.iloc[starts].astype(object).reset_index(drop=True)
+    runs.insert(0, 'Sheet_Name', sheet_name)
+    runs.insert(1, 'First_Row', starts + 1)
+    runs.insert(2, 'Last_Row', ends + 1)
+    return df.drop(columns=columns), runs.reindex(columns=RUN_COLUMNS)
+
+
+def memory_per_row(df):
+    """
+    每行占用的内存（字节，含字符串对象）/ Memory per row in bytes, including string objects
+
+    Returns:
+        float: 空数据框返回0
+    """
+    if df.empty:
+        return 0.0
+    return float(df.memory_usage(deep=True, index=False).sum()) / len(df)
+
+
+def as_object_columns(df):
+    """
+    把数据源信息列还原为逐行字符串（用于对比旧布局的内存占用）
+    Expand the provenance columns back into per-row strings (to measure the old layout)
+    """
+    columns = [column for column in PROVENANCE_COLUMNS if column in df.columns]
+    return df.astype({column: object for column in columns})
@@ -7,402 +7,111 @@ Generate Canvas charts with year-over-year and month-over-month analysis based o
 """
 
 import pandas as pd
-import json
-from datetime import datetime
 import os
-import re
 
-def parse_rubber_data(df):
+from series_db import read_series
+from chart_payload import series_payload, downsample, DEFAULT_MAX_POINTS
+from series_analytics import latest_comparisons, comparison_table, change_points, year_month_pivot, heatmap_html
+from page_templates import render_page, number_display, change_slots, generated_at
+
+# 整合Excel文件（时间序列数据库和列式数据集保存在其旁边）/ Integrated workbook; the series database and columnar store sit next to it
+INTEGRATED_FILE = "integrated_data.xlsx"
+SERIES_ID = 'RUBBER_TSR20'
+
+# 图表起始年份（数据回溯到1999年）和每个序列的图表点数预算；超过预算时用LTTB降采样，缩放后显示完整分辨率
+# First charted year (the data goes back to 1999) and the per-series chart point budget;
+# longer series are LTTB-downsampled and zooming shows full resolution
+MIN_YEAR = 2015
+MAX_CHART_POINTS = DEFAULT_MAX_POINTS
+
+# CSV回退解析的年月格式（例如 2015M01）/ Period format of the CSV fallback, e.g. 2015M01
+PERIOD_PATTERN = r'^(\d{4})M(\d{2})$'
+
+# 没有序列数据时读取的CSV、页面模板和输出文件 / CSV read when there is no series data, page template and output file
+CSV_FILES = ["csv_output/Rubber_Prices.csv"]
+TEMPLATE = 'rubber_price.html'
+OUTPUT_FILE = "rubber_price_visualization.html"
+
+def series_to_frame(series, min_year=MIN_YEAR):
+    """
+    把规范化序列转换为图表使用的数据框 / Convert normalized series into the frame used by the charts
+    """
+    series = series[series['period'].dt.year >= min_year].sort_values('period')
+    return pd.DataFrame({
+        'Year': series['period'].dt.year.astype('int64'),
+        'Month': series['period'].dt.month.astype('int64'),
+        'Value': series['value'],
+        'Date_String': series['period'].dt.strftime('%Y-%m')
+    }).reset_index(drop=True)
+
+def parse_rubber_data(df, min_year=MIN_YEAR):
     """
     解析橡胶价格数据 / Parse rubber price data
+
+    日期列整列匹配，数值整列转换，按年份掩码筛选
+    The Date column is matched as a whole, values are converted column-wise and filtered by a year mask
     """
-    data_records = []
-    
-    for _, row in df.iterrows():
-        date_str = str(row['Date'])
-        
-        # 匹配年月数据格式 (例如: 2015M01)
-        if re.match(r'^\d{4}M\d{2}$', date_str):
-            year = int(date_str[:4])
-            month = int(date_str[5:7])
-            value = float(row['Value'])
-            
-            # 只取2015年及以后的数据
-            if year >= 2015:
-                data_records.append({
-                    'Year': year,
-                    'Month': month,
-                    'Value': value,
-                    'Date_String': f"{year}-{month:02d}"
-                })
-    
-    return pd.DataFrame(data_records)
+    # 匹配年月数据格式 (例如: 2015M01)
+    parts = df['Date'].astype(str).str.extract(PERIOD_PATTERN).dropna()
+    year = parts[0].astype('int64')
+    
+    # 只取起始年份及以后的数据
+    keep = year >= min_year
+    parts = parts[keep]
+    return pd.DataFrame({
+        'Year': year[keep],
+        'Month': parts[1].astype('int64'),
+        'Value': pd.to_numeric(df.loc[parts.index, 'Value'], errors='coerce').astype('float64'),
+        'Date_String': parts[0] + '-' + parts[1]
+    }).reset_index(drop=True)
 
 def calculate_comparisons(df):
     """
     计算同比环比数据 / Calculate year-over-year and month-over-month comparisons
     """
-    # 确保数据按时间排序
-    df = df.sort_values(['Year', 'Month'])
-    
-    if len(df) == 0:
-        return None
-    
-    # 获取最新数据
-    latest_data = df.iloc[-1]
-    latest_year = latest_data['Year']
-    latest_month = latest_data['Month']
-    latest_value = latest_data['Value']
-    
-    # 上月数据 (环比)
-    prev_month_data = df.iloc[-2] if len(df) >= 2 else None
-    prev_month_value = prev_month_data['Value'] if prev_month_data is not None else None
-    
-    # 去年同月数据 (同比)
-    same_month_last_year = df[(df['Year'] == latest_year - 1) & (df['Month'] == latest_month)]
-    same_month_last_year_value = same_month_last_year['Value'].iloc[0] if not same_month_last_year.empty else None
-    
-    # 计算变化率
-    mom_change = ((latest_value - prev_month_value) / prev_month_value * 100) if prev_month_value else None
-    yoy_change = ((latest_value - same_month_last_year_value) / same_month_last_year_value * 100) if same_month_last_year_value else None
-    
-    return {
-        'latest': {
-            'year': int(latest_year),
-            'month': int(latest_month),
-            'value': float(latest_value),
-            'date_str': f"{latest_year}年{latest_month}月"
-        },
-        'prev_month': {
-            'value': float(prev_month_value) if prev_month_value else None,
-            'change': float(mom_change) if mom_change else None
-        },
-        'same_month_last_year': {
-            'value': float(same_month_last_year_value) if same_month_last_year_value else None,
-            'change': float(yoy_change) if yoy_change else None
-        }
-    }
+    return latest_comparisons(df)
 
-def generate_html_visualization(df, comparisons):
+def generate_html_visualization(df, comparisons, max_points=MAX_CHART_POINTS):
     """
     生成HTML Canvas可视化页面 / Generate HTML Canvas visualization page
-    """
     
-    # 准备图表数据
-    chart_data = []
-    for _, row in df.iterrows():
-        chart_data.append({
-            'x': row['Date_String'],
-            'y': float(row['Value'])
-        })
-    
-    # 预处理显示数据
-    prev_value_display = f"{comparisons['prev_month']['value']:.4f}" if comparisons['prev_month']['value'] is not None else 'N/A'
-    prev_change_display = f"{comparisons['prev_month']['change']:+.2f}%" if comparisons['prev_month']['change'] is not None else 'N/A'
-    prev_change_class = 'change-positive' if comparisons['prev_month']['change'] and comparisons['prev_month']['change'] > 0 else 'change-negative' if comparisons['prev_month']['change'] and comparisons['prev_month']['change'] < 0 else 'change-neutral'
-    prev_arrow = '↗️' if comparisons['prev_month']['change'] and comparisons['prev_month']['change'] > 0 else '↘️' if comparisons['prev_month']['change'] and comparisons['prev_month']['change'] < 0 else '➡️'
-    
-    yoy_value_display = f"{comparisons['same_month_last_year']['value']:.4f}" if comparisons['same_month_last_year']['value'] is not None else 'N/A'
-    yoy_change_display = f"{comparisons['same_month_last_year']['change']:+.2f}%" if comparisons['same_month_last_year']['change'] is not None else 'N/A'
-    yoy_change_class = 'change-positive' if comparisons['same_month_last_year']['change'] and comparisons['same_month_last_year']['change'] > 0 else 'change-negative' if comparisons['same_month_last_year']['change'] and comparisons['same_month_last_year']['change'] < 0 else 'change-neutral'
-    yoy_arrow = '↗️' if comparisons['same_month_last_year']['change'] and comparisons['same_month_last_year']['change'] > 0 else '↘️' if comparisons['same_month_last_year']['change'] and comparisons['same_month_last_year']['change'] < 0 else '➡️'
+    Args:
+        max_points (int): 每个图表序列的点数预算（None表示不降采样）
+    """
     
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>橡胶价格数据可视化 / Rubber Price Data Visualization</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }}
-        
-        .header {{
-            background: linear-gradient(135deg, #FF9500 0%, #FF6B35 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-        
-        .header h1 {{
-            margin: 0;
-            font-size: 2.5em;
-            font-weight: 300;
-        }}
-        
-        .header p {{
-            margin: 10px 0 0 0;
-            opacity: 0.9;
-            font-size: 1.1em;
-        }}
-        
-        .cards-container {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 20px;
-            padding: 30px;
-            background: #f8f9fa;
-        }}
-        
-        .card {{
-            background: white;
-            border-radius: 10px;
-            padding: 25px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-            transition: transform 0.3s ease;
-        }}
-        
-        .card:hover {{
-            transform: translateY(-5px);
-        }}
-        
-        .card-title {{
-            font-size: 1.1em;
-            color: #666;
-            margin: 0 0 15px 0;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-        
-        .card-value {{
-            font-size: 2.5em;
-            font-weight: bold;
-            margin: 0 0 10px 0;
-            color: #FF9500;
-        }}
-        
-        .card-meta {{
-            font-size: 0.9em;
-            color: #888;
-            margin: 0 0 15px 0;
-        }}
-        
-        .card-change {{
-            font-size: 1.2em;
-            font-weight: 600;
-            margin: 0;
-        }}
-        
-        .change-positive {{
-            color: #4CAF50;
-        }}
-        
-        .change-negative {{
-            color: #F44336;
-        }}
-        
-        .change-neutral {{
-            color: #FF9800;
-        }}
-        
-        .chart-container {{
-            padding: 30px;
-            background: white;
-        }}
-        
-        .chart-title {{
-            text-align: center;
-            margin-bottom: 30px;
-            font-size: 1.5em;
-            color: #333;
-        }}
-        
-        #rubberChart {{
-            max-height: 400px;
-        }}
-        
-        .footer {{
-            background: #333;
-            color: white;
-            text-align: center;
-            padding: 20px;
-            font-size: 0.9em;
-        }}
-        
-        .trend-arrow {{
-            font-size: 1.5em;
-            margin-left: 10px;
-        }}
-        
-        .source-links {{
-            margin-top: 15px;
-        }}
-        
-        .source-links a {{
-            color: #FF9500;
-            text-decoration: none;
-            margin: 0 10px;
-        }}
-        
-        .source-links a:hover {{
-            text-decoration: underline;
-        }}
-        
-        .prev-value {{
-            font-size: 0.8em;
-            color: #888;
-            margin-top: 5px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>橡胶价格分析</h1>
-            <p>Rubber Price Analysis Dashboard</p>
-        </div>
-        
-        <div class="cards-container">
-            <div class="card">
-                <h3 class="card-title">当前价格 / Current Price</h3>
-                <div class="card-value">${comparisons['latest']['value']:.4f}</div>
-                <p class="card-meta">{comparisons['latest']['date_str']} | USD/公斤 USD/kg</p>
-            </div>
-            
-            <div class="card">
-                <h3 class="card-title">环比变化 / Month-over-Month</h3>
-                <div class="card-value">${prev_value_display}</div>
-                <div class="prev-value">上月价格 / Previous Month</div>
-                <p class="card-change {prev_change_class}">
-                    {prev_change_display} 
-                    <span class="trend-arrow">{prev_arrow}</span>
-                </p>
-            </div>
-            
-            <div class="card">
-                <h3 class="card-title">同比变化 / Year-over-Year</h3>
-                <div class="card-value">${yoy_value_display}</div>
-                <div class="prev-value">去年同月 / Same Month Last Year</div>
-                <p class="card-change {yoy_change_class}">
-                    {yoy_change_display}
-                    <span class="trend-arrow">{yoy_arrow}</span>
-                </p>
-            </div>
-        </div>
-        
-        <div class="chart-container">
-            <h2 class="chart-title">橡胶价格趋势图 / Rubber Price Trend Chart (2015-{comparisons['latest']['year']})</h2>
-            <canvas id="rubberChart"></canvas>
-        </div>
-        
-        <div class="footer">
-            <p>数据来源 / Data Sources:</p>
-            <div class="source-links">
-                <a href="https://www.worldbank.org/en/research/commodity-markets" target="_blank">World Bank - Commodity Markets Research</a>
-            </div>
-            <p style="margin-top: 15px; font-size: 0.8em; color: #ccc;">
-                <strong>数据说明 / Data Description:</strong><br>
-                • 橡胶价格: TSR20橡胶现货价格 (美元/公斤) / Rubber Price: TSR20 Rubber Spot Price (USD/kg)<br>
-                • 数据来源: 世界银行商品市场研究数据库 / Data Source: World Bank Commodity Markets Research Database<br>
-                • 更新频率: 月度数据 / Update Frequency: Monthly Data
-            </p>
-            <p style="margin-top: 10px;">生成时间 / Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        </div>
-    </div>
+    # 准备图表数据（共用时间轴，价格保留4位小数；超过点数预算时附带LTTB总览）
+    chart_data = downsample(series_payload(df['Date_String'].tolist(), df['Value'], decimals=4), max_points)
+    
+    # 完整历史的同比变化（趋势线和热力图）
+    history = comparison_table(df)
+    yoy_data = downsample(change_points(history, 'yoy_change'), max_points)
+    yoy_heatmap = heatmap_html(year_month_pivot(history, 'yoy_change').loc[0].dropna(how='all'))
+    
+    # 页面骨架已编译缓存，这里只填充数据和指标插槽
+    return render_page(
+        TEMPLATE,
+        latest_value=f"{comparisons['latest']['value']:.4f}",
+        latest_date=comparisons['latest']['date_str'],
+        first_year=int(df['Year'].min()),
+        latest_year=comparisons['latest']['year'],
+        mom_value=number_display(comparisons['prev_month']['value'], '.4f'),
+        yoy_value=number_display(comparisons['same_month_last_year']['value'], '.4f'),
+        **change_slots(comparisons['prev_month']['change'], 'mom'),
+        **change_slots(comparisons['same_month_last_year']['change'], 'yoy'),
+        chart_data=chart_data,
+        yoy_data=yoy_data,
+        yoy_heatmap=yoy_heatmap,
+        generated_at=generated_at()
+    )
 
-    <script>
-        // 图表配置和数据
-        const ctx = document.getElementById('rubberChart').getContext('2d');
-        const chartData = {json.dumps(chart_data, indent=8)};
-        
-        const chart = new Chart(ctx, {{
-            type: 'line',
-            data: {{
-                labels: chartData.map(item => item.x),
-                datasets: [{{
-                    label: '橡胶价格 (USD/kg)',
-                    data: chartData.map(item => item.y),
-                    borderColor: '#FF9500',
-                    backgroundColor: 'rgba(255, 149, 0, 0.1)',
-                    borderWidth: 3,
-                    fill: true,
-                    tension: 0.4,
-                    pointBackgroundColor: '#FF9500',
-                    pointBorderColor: '#fff',
-                    pointBorderWidth: 2,
-                    pointRadius: 4,
-                    pointHoverRadius: 6
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {{
-                    legend: {{
-                        display: true,
-                        position: 'top',
-                        labels: {{
-                            usePointStyle: true,
-                            padding: 20,
-                            font: {{
-                                size: 14
-                            }}
-                        }}
-                    }},
-                    tooltip: {{
-                        mode: 'index',
-                        intersect: false,
-                        backgroundColor: 'rgba(0,0,0,0.8)',
-                        titleColor: '#fff',
-                        bodyColor: '#fff',
-                        borderColor: '#FF9500',
-                        borderWidth: 1,
-                        callbacks: {{
-                            label: function(context) {{
-                                return '橡胶价格: $' + context.parsed.y.toFixed(4) + '/kg';
-                            }}
-                        }}
-                    }}
-                }},
-                scales: {{
-                    x: {{
-                        grid: {{
-                            color: 'rgba(0,0,0,0.1)'
-                        }},
-                        ticks: {{
-                            maxTicksLimit: 15
-                        }}
-                    }},
-                    y: {{
-                        grid: {{
-                            color: 'rgba(0,0,0,0.1)'
-                        }},
-                        ticks: {{
-                            callback: function(value) {{
-                                return '$' + value.toFixed(2);
-                            }}
-                        }}
-                    }}
-                }},
-                interaction: {{
-                    mode: 'nearest',
-                    axis: 'x',
-                    intersect: false
-                }}
-            }}
-        }});
-    </script>
-</body>
-</html>
-"""
-    
-    return html_content
+def read_page_series():
+    """
+    页面使用的规范化序列（只读取需要的列和年份） / The normalized series this page charts, only the needed columns and years
+
+    Returns:
+        pd.DataFrame: 没有序列数据时为None或空数据框（此时读取CSV_FILES）
+    """
+    return read_series(INTEGRATED_FILE, [SERIES_ID], columns=['period', 'value'], min_year=MIN_YEAR)
 
 def main():
     """主函数 / Main function"""
@@ -410,15 +119,21 @@ def main():
     print("📊 橡胶价格数据可视化 / Rubber Price Data Visualization")
     print("=" * 60)
     
-    # 读取CSV数据
-    csv_file = "csv_output/Rubber_Prices.csv"
-    if not os.path.exists(csv_file):
-        print(f"❌ 错误：找不到CSV文件 / Error: CSV file not found: {csv_file}")
-        return 1
-    
-    print(f"📄 读取数据文件 / Reading data file: {csv_file}")
-    df_raw = pd.read_csv(csv_file)
-    df = parse_rubber_data(df_raw)
+    # 优先按索引范围查询时间序列数据库（已带类型，只读取需要的列和年份）
+    series = read_page_series()
+    if series is not None and not series.empty:
+        print(f"📄 读取序列数据 / Reading series data next to: {INTEGRATED_FILE}")
+        df = series_to_frame(series)
+    else:
+        # 读取CSV数据
+        csv_file = CSV_FILES[0]
+        if not os.path.exists(csv_file):
+            print(f"❌ 错误：找不到CSV文件 / Error: CSV file not found: {csv_file}")
+            return 1
+        
+        print(f"📄 读取数据文件 / Reading data file: {csv_file}")
+        df_raw = pd.read_csv(csv_file)
+        df = parse_rubber_data(df_raw)
     
     print(f"📊 数据概况 / Data overview:")
     print(f"   - 总记录数 / Total records: {len(df)}")
@@ -442,7 +157,7 @@ def main():
         html_content = generate_html_visualization(df, comparisons)
         
         # 保存HTML文件
-        output_file = "rubber_price_visualization.html"
+        output_file = OUTPUT_FILE
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(html_content)
         
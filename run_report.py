@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+整合运行计时报告 / Integration Run Timing Report
+记录每个模块各阶段（execute/read/parse/merge）以及整体步骤（如create_integrated_excel）的耗时，
+并写出机器可读的JSON报告和历史记录，便于逐月追踪性能回退
+Records per-module phase timings (execute/read/parse/merge) and pipeline steps
+(e.g. create_integrated_excel), and writes a machine-readable JSON report plus a
+history file for tracking regressions month over month
+
+输出 / Output:
+    run_reports/<run_id>.json   单次运行报告 / single run report
+    run_reports/history.jsonl   每次运行一行的汇总 / one summary line per run
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# 模块阶段（按执行顺序）/ Module phases in execution order
+MODULE_PHASES = ['execute', 'read', 'parse', 'merge']
+
+
+class RunReport:
+    """运行报告类 / Run Report Class"""
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id
+        self.started_at = datetime.now()
+        self.finished_at = None
+        self.modules = {}
+        self.steps = {}
+        self.metrics = {}
+        self.wall_seconds = None
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def record(self, phase, seconds, module=None):
+        """
+        累加一段耗时 / Accumulate a duration
+
+        Args:
+            phase (str): 阶段名称
+            seconds (float): 耗时（秒）
+            module (str): 模块名称；为None时记为整体步骤
+        """
+        with self._lock:
+            if module is None:
+                self.steps[phase] = self.steps.get(phase, 0.0) + seconds
+            else:
+                phases = self.modules.setdefault(module, {'status': None, 'phases': {}})['phases']
+                phases[phase] = phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, phase, module=None):
+        """
+        计时上下文管理器 / Timing context manager
+
+        用法 / Usage:
+            with report.timer('read', config['name']):
+                df = self.read_excel_data(path)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start, module)
+
+    def set_status(self, module, status):
+        """
+        记录模块状态 / Record a module status
+
+        Args:
+            module (str): 模块名称
+            status (str): executed / failed / skipped / restored
+        """
+        with self._lock:
+            self.modules.setdefault(module, {'status': None, 'phases': {}})['status'] = status
+
+    def set_metric(self, name, value):
+        """
+        记录附加指标（如内存、复制次数）/ Record an extra metric (e.g. memory, copy counts)
+
+        Args:
+            name (str): 指标名称
+            value: 可JSON序列化的值
+        """
+        with self._lock:
+            self.metrics[name] = value
+
+    def module_timings(self, module):
+        """
+        模块各阶段耗时（秒，保留3位小数）/ Phase timings of a module in seconds (3 decimals)
+
+        Returns:
+            dict: {阶段: 秒数, 'total': 秒数}
+        """
+        with self._lock:
+            phases = dict(self.modules.get(module, {}).get('phases', {}))
+        timings = {phase: round(phases.get(phase, 0.0), 3) for phase in MODULE_PHASES}
+        timings['total'] = round(sum(phases.get(phase, 0.0) for phase in MODULE_PHASES), 3)
+        return timings
+
+    def finish(self):
+        """结束计时 / Stop the wall clock"""
+        self.finished_at = datetime.now()
+        self.wall_seconds = time.perf_counter() - self._start
+
+    def to_dict(self):
+        """转换为可序列化的字典 / Convert to a JSON-serializable dict"""
+        with self._lock:
+            module_names = list(self.modules)
+            statuses = {name: self.modules[name]['status'] for name in module_names}
+            steps = {name: round(seconds, 3) for name, seconds in self.steps.items()}
+            metrics = dict(self.metrics)
+
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'finished_at': self.finished_at.strftime('%Y-%m-%d %H:%M:%S') if self.finished_at else None,
+            'wall_seconds': round(self.wall_seconds if self.wall_seconds is not None else time.perf_counter() - self._start, 3),
+            'steps': steps,
+            'metrics': metrics,
+            'modules': {
+                name: {'status': statuses[name], 'seconds': self.module_timings(name)}
+                for name in module_names
+            },
+        }
+
+    def write(self, report_dir="run_reports"):
+        """
+        写出JSON报告并追加历史记录 / Write the JSON report and append to the history
+
+        Args:
+            report_dir (str): 报告目录
+
+        Returns:
+            str: 报告文件路径
+        """
+        os.makedirs(report_dir, exist_ok=True)
+        report = self.to_dict()
+
+        path = os.path.join(report_dir, f"{self.run_id or self.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        history_entry = {
+            'run_id': report['run_id'],
+            'started_at': report['started_at'],
+            'wall_seconds': report['wall_seconds'],
+            'steps': report['steps'],
+            'metrics': report['metrics'],
+            'modules': {name: info['seconds']['total'] for name, info in report['modules'].items()},
+        }
+        with open(os.path.join(report_dir, 'history.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(history_entry, ensure_ascii=False) + '\n')
+
+        return path
+
+
+def load_history(report_dir="run_reports"):
+    """
+    读取历史运行汇总 / Load the run history
+
+    Returns:
+        list: 每次运行的汇总字典（按时间顺序）
+    """
+    path = os.path.join(report_dir, 'history.jsonl')
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
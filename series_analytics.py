@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+同比环比计算引擎 / Comparison Engine
+一次性为所有序列计算环比（相对上一条观测值）、同比（相对去年同月）和最新值，
+并给出完整历史的同比环比序列和“年份 × 月份”透视表：
+按序列分组后平移一行得到上期值，按 (序列, 月份-12) 对齐得到去年同月值，不再逐个序列排序和布尔筛选，
+耗时随序列数线性增长
+Computes month-over-month (against the previous observation), year-over-year (against
+the same month last year) and latest values for every series at once, plus full-history
+MoM/YoY series and year-by-month pivots: a grouped one-row shift gives the previous
+value and aligning on (series, period - 12) gives last year's value, instead of sorting
+and mask-scanning each series separately, so the cost grows linearly with the number of
+series
+
+用法 / Usage:
+    latest_comparisons(df)                                       # 单个序列 / single series
+    latest_comparisons(df, key='Product')                        # {产品: 对比结果} / {product: comparison}
+    latest_comparisons(df, value='Exchange_Rate', value_key='rate')
+    history = comparison_table(df, key='Product')                # 完整历史 / full history
+    change_points(history, 'yoy_change')                         # 图表数据 / chart payload
+    aligned_points(history, 'yoy_change')                        # 多序列共用时间轴 / several series on one axis
+    year_month_pivot(history, 'yoy_change')                      # (序列, 年份) × 月份 / (series, year) x month
+"""
+
+import numpy as np
+import pandas as pd
+
+from chart_payload import month_labels, series_payload, aligned_payload
+
+# comparison_table 的列 / Columns of comparison_table
+COMPARISON_COLUMNS = ['key', 'year', 'month', 'value', 'prev_value', 'mom_change', 'yoy_value', 'yoy_change']
+
+MONTHS = list(range(1, 13))
+
+# 热力图颜色（与页面中的涨跌颜色一致，单元格按深浅追加透明度）/ Heatmap colors matching the pages' rise/fall colors; cells append an alpha
+HEATMAP_POSITIVE = '#4caf50'
+HEATMAP_NEGATIVE = '#f44336'
+
+
+def percent_change(current, base):
+    """
+    百分比变化；基期缺失或为0时为NaN / Percentage change, NaN where the base is missing or zero
+    """
+    current = np.asarray(current, dtype=np.float64)
+    base = np.asarray(base, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (current - base) / base * 100
+    return np.where((base == 0) | np.isnan(base), np.nan, change)
+
+
+def comparison_table(df, key=None, year='Year', month='Month', value='Value'):
+    """
+    计算所有观测值的环比和同比 / Compute MoM and YoY for every observation
+
+    Args:
+        df (pd.DataFrame): 含年份、月份、数值列的数据框
+        key (str): 序列列名；为None时整个数据框视为一个序列
+        year (str): 年份列名
+        month (str): 月份列名
+        value (str): 数值列名
+
+    Returns:
+        pd.DataFrame: COMPARISON_COLUMNS；序列按首次出现的顺序，序列内按时间排序
+    """
+    if df.empty:
+        return pd.DataFrame(columns=COMPARISON_COLUMNS)
+
+    # 序列编码保留首次出现的顺序 / Series codes keep first-appearance order
+    codes, uniques = pd.factorize(df[key] if key is not None else pd.Series(0, index=df.index))
+    years = df[year].to_numpy(dtype=np.int64)
+    months = df[month].to_numpy(dtype=np.int64)
+    table = pd.DataFrame({
+        'code': codes,
+        'period': years * 12 + months - 1,
+        'year': years,
+        'month': months,
+        'value': df[value].to_numpy(dtype=np.float64),
+    }).sort_values(['code', 'period'], kind='stable').reset_index(drop=True)
+
+    # 环比：同一序列的上一条观测值 / MoM: previous observation of the same series
+    table['prev_value'] = table.groupby('code', sort=False)['value'].shift(1)
+
+    # 同比：(序列, 月份-12) 处的取值，同月重复时取第一条 / YoY: value at (series, period - 12), first one for duplicate months
+    lookup = table.drop_duplicates(['code', 'period']).set_index(['code', 'period'])['value']
+    last_year = pd.MultiIndex.from_arrays([table['code'], table['period'] - 12])
+    table['yoy_value'] = lookup.reindex(last_year).to_numpy()
+
+    table['mom_change'] = percent_change(table['value'], table['prev_value'])
+    table['yoy_change'] = percent_change(table['value'], table['yoy_value'])
+    table['key'] = uniques.take(table['code'].to_numpy())
+    return table[COMPARISON_COLUMNS]
+
+
+def _optional(value):
+    """NaN转换为None / NaN to None"""
+    return None if pd.isna(value) else float(value)
+
+
+def comparison_record(row, value_key='value'):
+    """
+    单条最新观测值的对比结果字典（可视化页面使用的结构）
+    Comparison dict of one latest observation, in the shape the pages use
+
+    Args:
+        row: comparison_table 的一行
+        value_key (str): 数值字段名，例如汇率页面使用 'rate'
+    """
+    year, month = int(row.year), int(row.month)
+    return {
+        'latest': {
+            'year': year,
+            'month': month,
+            value_key: float(row.value),
+            'date_str': f"{year}年{month}月"
+        },
+        'prev_month': {
+            value_key: _optional(row.prev_value),
+            'change': _optional(row.mom_change)
+        },
+        'same_month_last_year': {
+            value_key: _optional(row.yoy_value),
+            'change': _optional(row.yoy_change)
+        }
+    }
+
+
+def latest_comparisons(df, key=None, year='Year', month='Month', value='Value', value_key='value'):
+    """
+    各序列最新观测值的同比环比 / Latest-value MoM and YoY of every series
+
+    Args:
+        df (pd.DataFrame): 含年份、月份、数值列的数据框
+        key (str): 序列列名；为None时整个数据框视为一个序列
+        year (str): 年份列名
+        month (str): 月份列名
+        value (str): 数值列名
+        value_key (str): 结果中的数值字段名
+
+    Returns:
+        dict: key为None时返回单个对比结果（没有数据时为None）；否则返回 {序列: 对比结果}
+    """
+    table = comparison_table(df, key=key, year=year, month=month, value=value)
+    latest = table.groupby('key', sort=False).tail(1)
+    records = {row.key: comparison_record(row, value_key) for row in latest.itertuples(index=False)}
+
+    if key is None:
+        return next(iter(records.values()), None)
+    return records
+
+
+def period_labels(table):
+    """'YYYY-MM' 标签 / 'YYYY-MM' labels"""
+    return month_labels(table['year'], table['month'])
+
+
+def change_points(table, column='yoy_change', decimals=2):
+    """
+    完整历史的变化率序列（图表数据，缺失为None）/ Full-history change series as chart data, None where missing
+
+    Args:
+        table (pd.DataFrame): comparison_table 的结果（通常为单个序列）
+        column (str): 'mom_change' 或 'yoy_change'
+        decimals (int): 保留的小数位数
+
+    Returns:
+        dict: {'labels': ['YYYY-MM', ...], 'values': [float 或 None, ...]}
+    """
+    return series_payload(period_labels(table), table[column], decimals)
+
+
+def aligned_points(table, column='yoy_change', decimals=2):
+    """
+    多个序列对齐到同一时间轴的变化率（图表数据，缺失为None）
+    Change series of several series aligned on one period axis, as chart data with None where missing
+
+    Args:
+        table (pd.DataFrame): comparison_table 的结果
+        column (str): 'mom_change' 或 'yoy_change'
+        decimals (int): 保留的小数位数
+
+    Returns:
+        dict: {'labels': ['YYYY-MM', ...], 'series': {序列: [float 或 None, ...]}}，序列按首次出现的顺序
+    """
+    return aligned_payload(table['key'], table['year'], table['month'], table[column], decimals)
+
+
+def year_month_pivot(table, column='yoy_change'):
+    """
+    “年份 × 月份”透视表 / Year-by-month pivot
+
+    Args:
+        table (pd.DataFrame): comparison_table 的结果
+        column (str): 透视的列，例如 'yoy_change'、'mom_change' 或 'value'
+
+    Returns:
+        pd.DataFrame: 索引为 (key, year)，列为月份1-12；缺失为NaN
+    """
+    if table.empty:
+        return pd.DataFrame(columns=MONTHS, index=pd.MultiIndex.from_arrays([[], []], names=['key', 'year']))
+    pivot = (table.drop_duplicates(['key', 'year', 'month'])
+             .pivot(index=['key', 'year'], columns='month', values=column)
+             .reindex(columns=MONTHS))
+    pivot.columns.name = None
+    return pivot
+
+
+def heatmap_html(pivot, decimals=1, unit='%'):
+    """
+    单个序列透视表的HTML热力图（正值绿色、负值红色，颜色深浅按绝对值；样式见 templates/_page.css）
+    HTML heatmap of one series' pivot: green for positive, red for negative, shaded by magnitude (styled in templates/_page.css)
+
+    Args:
+        pivot (pd.DataFrame): 索引为年份、列为月份的透视表（例如 year_month_pivot(...).loc[key]）
+        decimals (int): 显示的小数位数
+        unit (str): 数值后缀
+
+    Returns:
+        str: <table class="heatmap"> 元素
+    """
+    values = pivot.to_numpy(dtype=np.float64)
+    scale = np.nanmax(np.abs(values)) if np.isfinite(values).any() else 0.0
+    alpha = np.clip(np.abs(values) / scale, 0, 1) * 0.75 + 0.1 if scale else np.full(values.shape, 0.1)
+
+    rows = []
+    for year, row_values, row_alpha in zip(pivot.index, values, alpha):
+        cells = []
+        for value, shade in zip(row_values, row_alpha):
+            if np.isnan(value):
+                cells.append('<td></td>')
+            else:
+                color = HEATMAP_POSITIVE if value >= 0 else HEATMAP_NEGATIVE
+                cells.append(f'<td style="background:{color}{round(shade * 255):02x}">{value:+.{decimals}f}{unit}</td>')
+        rows.append(f'<tr><th>{year}</th>{"".join(cells)}</tr>')
+
+    header = ''.join(f'<th>{month}月</th>' for month in MONTHS)
+    return f'<table class="heatmap"><thead><tr><th></th>{header}</tr></thead><tbody>{"".join(rows)}</tbody></table>'
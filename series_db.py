@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+嵌入式SQLite时间序列存储 / Embedded SQLite Time-Series Store
+以 (series_id, period) 为主键保存所有观测值；每次运行只插入新观测值、更新被修订的观测值，
+并在 vintages 表中记录每个取值首次出现的抓取时间；可视化按索引做范围查询
+Keeps every observation keyed on (series_id, period); each run only inserts new
+observations and updates revised ones, recording in the vintages table when each value
+was first fetched; visualizations read with indexed range queries
+
+表结构 / Tables:
+    observations(series_id, period, value, unit, source, fetched_at)
+        主键 (series_id, period)，WITHOUT ROWID：主键B树即包含所有列（覆盖索引）
+        primary key (series_id, period), WITHOUT ROWID: the key B-tree holds every column (covering index)
+    vintages(series_id, period, fetched_at, value)
+        每个 (series_id, period) 的历史取值 / value history of every (series_id, period)
+
+period 以 'YYYY-MM' 文本保存，按字典序即时间顺序。
+period is stored as 'YYYY-MM' text, so lexical order is time order.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+from columnar_store import read_series_store
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    series_id  TEXT NOT NULL,
+    period     TEXT NOT NULL,
+    value      REAL,
+    unit       TEXT,
+    source     TEXT,
+    fetched_at TEXT,
+    PRIMARY KEY (series_id, period)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS vintages (
+    series_id  TEXT NOT NULL,
+    period     TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    value      REAL,
+    PRIMARY KEY (series_id, period, fetched_at)
+) WITHOUT ROWID;
+"""
+
+PERIOD_FORMAT = '%Y-%m'
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def db_path(output_filename):
+    """
+    整合Excel旁边的数据库路径 / Database path next to the integrated workbook
+
+    例如 integrated_data.xlsx -> integrated_data.sqlite
+    """
+    return os.path.splitext(output_filename)[0] + '.sqlite'
+
+
+class SeriesDB:
+    """时间序列数据库类 / Time-Series Database Class"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connect(self):
+        """
+        打开连接并确保表结构存在；正常退出时提交，最后关闭连接
+        Open a connection with the schema in place; commit on success and always close it
+        """
+        with self._lock:
+            conn = sqlite3.connect(self.path)
+            try:
+                conn.executescript(SCHEMA)
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def upsert(self, series):
+        """
+        插入新观测值、更新被修订的观测值，未变化的不写入 / Insert new and update revised observations; unchanged rows are not written
+
+        Args:
+            series (pd.DataFrame): 规范化序列（series_id, period, value, unit, source, fetched_at）
+
+        Returns:
+            dict: {'inserted', 'revised', 'unchanged'} 行数
+        """
+        rows = pd.DataFrame({
+            'series_id': series['series_id'].astype(str),
+            'period': series['period'].dt.strftime(PERIOD_FORMAT),
+            'value': series['value'].astype(float),
+            'unit': series['unit'].astype(str),
+            'source': series['source'].astype(str),
+            'fetched_at': series['fetched_at'].dt.strftime(TIMESTAMP_FORMAT),
+        })
+        records = list(rows.itertuples(index=False, name=None))
+
+        with self.connect() as conn:
+            conn.execute("""
+                CREATE TEMP TABLE staging (
+                    series_id TEXT, period TEXT, value REAL, unit TEXT, source TEXT, fetched_at TEXT,
+                    PRIMARY KEY (series_id, period)
+                ) WITHOUT ROWID
+            """)
+            conn.executemany("INSERT OR REPLACE INTO staging VALUES (?, ?, ?, ?, ?, ?)", records)
+
+            inserted, revised = conn.execute("""
+                SELECT SUM(o.series_id IS NULL), SUM(o.series_id IS NOT NULL AND o.value IS NOT s.value)
+                FROM staging s LEFT JOIN observations o USING (series_id, period)
+            """).fetchone()
+            inserted, revised = inserted or 0, revised or 0
+
+            # 新的或被修订的取值记为一个新版本 / New or revised values become a new vintage
+            conn.execute("""
+                INSERT OR IGNORE INTO vintages (series_id, period, fetched_at, value)
+                SELECT s.series_id, s.period, s.fetched_at, s.value
+                FROM staging s LEFT JOIN observations o USING (series_id, period)
+                WHERE o.series_id IS NULL OR o.value IS NOT s.value
+            """)
+            conn.execute("""
+                INSERT INTO observations (series_id, period, value, unit, source, fetched_at)
+                SELECT series_id, period, value, unit, source, fetched_at FROM staging WHERE true
+                ON CONFLICT (series_id, period) DO UPDATE SET
+                    value = excluded.value,
+                    unit = excluded.unit,
+                    source = excluded.source,
+                    fetched_at = excluded.fetched_at
+                WHERE observations.value IS NOT excluded.value
+            """)
+            conn.execute("DROP TABLE staging")
+
+        return {'inserted': inserted, 'revised': revised, 'unchanged': len(records) - inserted - revised}
+
+    def read_range(self, series_ids=None, start_period=None, end_period=None,
+                   columns=('series_id', 'period', 'value')):
+        """
+        按主键做范围查询 / Range query on the primary key
+
+        Args:
+            series_ids (list): 序列代码（可选）
+            start_period (str): 起始月份 'YYYY-MM'（含）
+            end_period (str): 结束月份 'YYYY-MM'（含）
+            columns (tuple): 返回的列
+
+        Returns:
+            pd.DataFrame: period 为datetime64，按 series_id、period 排序
+        """
+        allowed = ('series_id', 'period', 'value', 'unit', 'source', 'fetched_at')
+        columns = [column for column in columns if column in allowed]
+        if 'series_id' not in columns:
+            columns = ['series_id'] + columns
+
+        conditions, params = [], []
+        if series_ids is not None:
+            conditions.append(f"series_id IN ({', '.join('?' * len(series_ids))})")
+            params.extend(series_ids)
+        if start_period is not None:
+            conditions.append("period >= ?")
+            params.append(start_period)
+        if end_period is not None:
+            conditions.append("period <= ?")
+            params.append(end_period)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        query = f"SELECT {', '.join(columns)} FROM observations {where} ORDER BY series_id, period"
+        with self.connect() as conn:
+            df = pd.read_sql_query(query, conn, params=params)
+
+        if 'period' in df.columns:
+            df['period'] = pd.to_datetime(df['period'], format=PERIOD_FORMAT)
+        if 'fetched_at' in df.columns:
+            df['fetched_at'] = pd.to_datetime(df['fetched_at'], format=TIMESTAMP_FORMAT)
+        return df
+
+    def vintages(self, series_id, period):
+        """
+        某个观测值的历史版本 / History of one observation
+
+        Returns:
+            pd.DataFrame: fetched_at, value（按时间排序）
+        """
+        with self.connect() as conn:
+            return pd.read_sql_query(
+                "SELECT fetched_at, value FROM vintages WHERE series_id = ? AND period = ? ORDER BY fetched_at",
+                conn, params=[series_id, period.strftime(PERIOD_FORMAT) if hasattr(period, 'strftime') else period]
+            )
+
+
+def read_series(output_filename="integrated_data.xlsx", series_ids=None, columns=('period', 'value'), min_year=None):
+    """
+    可视化读取入口：优先SQLite范围查询，其次列式数据集 / Visualization read entry: SQLite range query first, then the columnar store
+
+    Args:
+        output_filename (str): 整合Excel文件路径（在其旁边查找数据库）
+        series_ids (list): 序列代码（可选）
+        columns (tuple): 需要的列（series_id 始终包含）
+        min_year (int): 只读取该年份及以后的数据（可选）
+
+    Returns:
+        pd.DataFrame: 没有任何数据时返回None
+    """
+    path = db_path(output_filename)
+    if os.path.exists(path):
+        start_period = f"{int(min_year):04d}-01" if min_year is not None else None
+        df = SeriesDB(path).read_range(series_ids, start_period=start_period, columns=['series_id'] + list(columns))
+        if not df.empty:
+            return df
+    return read_series_store(output_filename, series_ids, columns=list(columns), min_year=min_year)
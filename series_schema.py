@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+统一长格式时间序列结构 / Canonical Long-Format Series Schema
+在整合时把四个数据源的原始布局一次性规范化为同一张整洁表，并保存在整合Excel旁边，
+可视化脚本直接加载带类型的数据，无需再次解析原始布局
+Normalizes the raw layouts of all four sources once at integration time into a single
+tidy table stored next to the integrated workbook, so the visualization scripts load
+typed data directly instead of re-parsing the raw layouts
+
+列 / Columns:
+    series_id   序列代码，例如 'PCU325211325211' / series code
+    period      月份（当月第一天，datetime64）/ month, as the first day of the month
+    value       数值（float64）/ value
+    unit        单位 / unit
+    source      数据源模块名称 / source module name
+    fetched_at  抓取时间（datetime64）/ fetch time
+
+原始布局 / Raw layouts (config['series_format']):
+    date_value  Date/Value 两列，如 rubber_prices.txt（"1999M01", 0.5979）
+    bls_wide    首列为年月，其余每列一个序列代码，前几行为标题行
+    fred_text   首列为 "2012M01 97.9" 形式的文本，列名为 "Series Id: <代码>"
+    fx_rates    Year_Month（或 Year/Month）、Exchange_Rate、Currency_Pair
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from provenance import PROVENANCE_COLUMNS
+
+SERIES_COLUMNS = ['series_id', 'period', 'value', 'unit', 'source', 'fetched_at']
+
+PERIOD_PATTERN = r'^\s*(\d{4})M(\d{2})\s*$'
+FRED_ROW_PATTERN = r'^\s*(\d{4})M(\d{2})\s+(\S+)\s*$'
+
+
+def empty_series():
+    """空的规范化数据框（列类型正确）/ Empty normalized frame with the right dtypes"""
+    return pd.DataFrame({
+        'series_id': pd.Series(dtype=object),
+        'period': pd.Series(dtype='datetime64[ns]'),
+        'value': pd.Series(dtype=np.float64),
+        'unit': pd.Series(dtype=object),
+        'source': pd.Series(dtype=object),
+        'fetched_at': pd.Series(dtype='datetime64[ns]'),
+    })
+
+
+def _to_periods(years, months):
+    """年、月字符串列转换为当月第一天 / Year and month string columns to the first day of the month"""
+    return pd.to_datetime(pd.DataFrame({
+        'year': years.astype(int), 'month': months.astype(int), 'day': 1
+    }), errors='coerce')
+
+
+def _to_float(values):
+    """
+    转换为float64，无法转换的为NaN / Convert to float64, NaN where conversion fails
+
+    文本按float()逐个转换，与各可视化脚本原有的解析结果完全一致。
+    Text goes through float() one by one so results match the visualization scripts exactly.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(np.float64)
+
+    def convert(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+    return pd.Series([convert(value) for value in values], index=values.index, dtype=np.float64)
+
+
+def _long_frame(series_id, periods, values):
+    frame = pd.DataFrame({'series_id': series_id, 'period': periods, 'value': values})
+    return frame.dropna(subset=['period', 'value'])
+
+
+def parse_date_value(df, config):
+    """Date/Value 两列 / Date and Value columns (rubber_prices.txt)"""
+    if 'Date' not in df.columns or 'Value' not in df.columns:
+        return _long_frame([], [], [])
+    parts = df['Date'].astype(str).str.extract(PERIOD_PATTERN).dropna()
+    return _long_frame(config.get('series_id', config['sheet_name']),
+                       _to_periods(parts[0], parts[1]),
+                       _to_float(df.loc[parts.index, 'Value']))
+
+
+def parse_bls_wide(df, config):
+    """首列为年月、每列一个序列的宽表 / Wide table with the period in the first column and one series per column"""
+    dates = df.iloc[:, 0].astype(str).str.extract(PERIOD_PATTERN).dropna()
+    rows = df.loc[dates.index]
+    periods = _to_periods(dates[0], dates[1])
+
+    frames = []
+    for column in df.columns[1:]:
+        if column in PROVENANCE_COLUMNS or str(column).startswith('Unnamed'):
+            continue
+        frames.append(_long_frame(str(column).strip(), periods, _to_float(rows[column])))
+    if not frames:
+        return _long_frame([], [], [])
+    return pd.concat(frames, ignore_index=True)
+
+
+def parse_fred_text(df, config):
+    """"2012M01 97.9" 形式的单列文本 / Single text column of "2012M01 97.9" rows"""
+    column = df.columns[0]
+    series_id = str(column).split(':', 1)[1].strip() if ':' in str(column) else config.get('series_id', str(column))
+    parts = df[column].astype(str).str.extract(FRED_ROW_PATTERN).dropna()
+    return _long_frame(series_id, _to_periods(parts[0], parts[1]), _to_float(parts[2]))
+
+
+def parse_fx_rates(df, config):
+    """汇率表 / Exchange rate table"""
+    if 'Exchange_Rate' not in df.columns:
+        return parse_date_value(df, config)
+    if 'Year_Month' in df.columns:
+        parts = df['Year_Month'].astype(str).str.extract(PERIOD_PATTERN).dropna()
+    elif 'Year' in df.columns and 'Month' in df.columns:
+        parts = df[['Year', 'Month']].dropna().astype(int).astype(str).set_axis([0, 1], axis=1)
+    else:
+        return _long_frame([], [], [])
+    rows = df.loc[parts.index]
+    if 'Currency_Pair' in df.columns:
+        series_id = rows['Currency_Pair'].fillna(config.get('series_id', '')).astype(str)
+    else:
+        series_id = config.get('series_id', config['sheet_name'])
+    return _long_frame(series_id, _to_periods(parts[0], parts[1]), _to_float(rows['Exchange_Rate']))
+
+
+SERIES_PARSERS = {
+    'date_value': parse_date_value,
+    'bls_wide': parse_bls_wide,
+    'fred_text': parse_fred_text,
+    'fx_rates': parse_fx_rates,
+}
+
+
+def normalize_module(config, df):
+    """
+    把单个模块的原始数据规范化为长格式 / Normalize one module's raw data into the long format
+
+    Args:
+        config (dict): 脚本配置，需包含 'series_format'，可选 'series_id'、'unit'
+        df (pd.DataFrame): 模块数据（可包含数据源信息列）
+
+    Returns:
+        pd.DataFrame: SERIES_COLUMNS 列；同一 (series_id, period) 只保留第一条
+    """
+    parser = SERIES_PARSERS.get(config.get('series_format'))
+    if parser is None or df is None or df.empty:
+        return empty_series()
+
+    long_df = parser(df, config)
+    if long_df.empty:
+        return empty_series()
+
+    fetched_at = pd.NaT
+    if 'Generated_At' in df.columns:
+        # 分类列只需转换各个取值 / For categorical columns only the distinct values are converted
+        fetched_at = pd.to_datetime(pd.Series(df['Generated_At'].unique()).astype(object), errors='coerce').max()
+    if pd.isna(fetched_at):
+        fetched_at = pd.Timestamp(datetime.now().replace(microsecond=0))
+
+    long_df = long_df.drop_duplicates(subset=['series_id', 'period'], keep='first')
+    long_df['unit'] = config.get('unit', '')
+    long_df['source'] = config['name']
+    long_df['fetched_at'] = fetched_at
+    long_df['fetched_at'] = long_df['fetched_at'].astype('datetime64[ns]')
+    long_df['period'] = long_df['period'].astype('datetime64[ns]')
+    return long_df[SERIES_COLUMNS].sort_values(['series_id', 'period'], kind='stable').reset_index(drop=True)
+
+
+def series_path(output_filename):
+    """
+    整合Excel旁边的规范化数据文件路径 / Path of the normalized file next to the integrated workbook
+
+    例如 integrated_data.xlsx -> integrated_data.series.parquet
+    """
+    return os.path.splitext(output_filename)[0] + '.series.parquet'
+
+
+def write_series(df, path):
+    """原子写出规范化数据 / Atomically write the normalized data"""
+    tmp_path = path + '.tmp'
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def load_series(output_filename="integrated_data.xlsx", series_ids=None):
+    """
+    加载规范化数据 / Load the normalized data
+
+    Args:
+        output_filename (str): 整合Excel文件路径（在其旁边查找 .series.parquet）
+        series_ids (list): 只返回这些序列（可选）
+
+    Returns:
+        pd.DataFrame: SERIES_COLUMNS 列；文件不存在时返回None
+    """
+    path = series_path(output_filename)
+    if not os.path.exists(path):
+        return None
+    df = pd.read_parquet(path)
+    if series_ids is not None:
+        df = df[df['series_id'].isin(series_ids)].reset_index(drop=True)
+    return df
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内容寻址的月度快照归档 / Content-Addressed Monthly Snapshot Archive
+每次整合运行的规范化序列按“序列 × 年份”切分为数据块，以内容的SHA-256命名保存；
+各月份之间相同的历史数据块只保存一次。diff 只比较两次运行清单中哈希不同的数据块，
+不需要加载完整文件
+Each integration run's normalized series is split into per-series, per-year chunks
+stored under the SHA-256 of their content, so history that is identical across months
+is stored once. diff only compares chunks whose hashes differ between the two run
+manifests, without loading whole files
+
+目录结构 / Layout:
+    snapshots/objects/<hash[:2]>/<hash>.csv.gz   数据块（period,value）/ chunk (period,value)
+    snapshots/runs/<run_id>.json                 运行清单：每个序列的单位、来源、抓取时间和各年份数据块哈希
+                                                 run manifest: unit, source, fetch time and per-year chunk hashes of every series
+
+用法 / Usage:
+    python snapshot_archive.py list
+    python snapshot_archive.py diff previous latest
+    python snapshot_archive.py diff 20250901_080000_000000 latest --all
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+PERIOD_FORMAT = '%Y-%m'
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# diff 结果列 / diff result columns
+DIFF_COLUMNS = ['series_id', 'period', 'change', 'old_value', 'new_value']
+CHANGE_REVISED = 'revised'
+CHANGE_ADDED = 'added'
+CHANGE_REMOVED = 'removed'
+
+
+def chunk_bytes(chunk):
+    """
+    数据块的规范文本（period,value；浮点数按最短往返表示）
+    Canonical text of a chunk (period,value; floats in shortest round-trip form)
+
+    Args:
+        chunk (pd.DataFrame): 同一序列、同一年份的 period、value
+
+    Returns:
+        bytes: UTF-8文本
+    """
+    text = pd.DataFrame({
+        'period': chunk['period'].dt.strftime(PERIOD_FORMAT).to_numpy(),
+        'value': chunk['value'].to_numpy(),
+    }).to_csv(index=False, lineterminator='\n')
+    return text.encode('utf-8')
+
+
+def parse_chunk(data):
+    """
+    解析数据块文本 / Parse chunk text
+
+    Returns:
+        pd.DataFrame: period（datetime64）、value（float64）
+    """
+    df = pd.read_csv(io.BytesIO(data), dtype={'period': str, 'value': 'float64'}, float_precision='round_trip')
+    df['period'] = pd.to_datetime(df['period'], format=PERIOD_FORMAT)
+    return df
+
+
+class SnapshotArchive:
+    """快照归档类 / Snapshot Archive Class"""
+
+    def __init__(self, root_dir="snapshots"):
+        self.root_dir = root_dir
+        self.objects_dir = os.path.join(root_dir, 'objects')
+        self.runs_dir = os.path.join(root_dir, 'runs')
+
+    def object_path(self, content_hash):
+        """数据块文件路径 / Path of a chunk object"""
+        return os.path.join(self.objects_dir, content_hash[:2], f"{content_hash}.csv.gz")
+
+    def manifest_path(self, run_id):
+        """运行清单路径 / Path of a run manifest"""
+        return os.path.join(self.runs_dir, f"{run_id}.json")
+
+    def list_runs(self):
+        """
+        列出所有已归档的运行ID（按时间升序）/ List archived run IDs in chronological order
+
+        Returns:
+            list: 运行ID列表
+        """
+        if not os.path.isdir(self.runs_dir):
+            return []
+        return sorted(name[:-len('.json')] for name in os.listdir(self.runs_dir) if name.endswith('.json'))
+
+    def resolve_run(self, run_id):
+        """
+        解析运行ID，支持 latest / previous / Resolve a run ID, accepting latest and previous
+
+        Raises:
+            ValueError: 运行不存在
+        """
+        runs = self.list_runs()
+        aliases = {'latest': -1, 'previous': -2}
+        if run_id in aliases:
+            if len(runs) < -aliases[run_id]:
+                raise ValueError(f"Not enough archived runs for '{run_id}' ({len(runs)} archived)")
+            return runs[aliases[run_id]]
+        if run_id not in runs:
+            raise ValueError(f"Unknown snapshot run: {run_id}")
+        return run_id
+
+    def load_manifest(self, run_id):
+        """读取运行清单 / Load a run manifest"""
+        with open(self.manifest_path(self.resolve_run(run_id)), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_object(self, content_hash, data):
+        """
+        写出数据块；已存在时跳过 / Write a chunk object, skipping it if it already exists
+
+        Returns:
+            bool: 是否新写出
+        """
+        path = self.object_path(content_hash)
+        if os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            # mtime=0 使压缩结果只取决于内容 / mtime=0 keeps the compressed bytes content-only
+            f.write(gzip.compress(data, mtime=0))
+        os.replace(tmp_path, path)
+        return True
+
+    def read_chunk(self, content_hash):
+        """读取数据块 / Read a chunk object"""
+        with open(self.object_path(content_hash), 'rb') as f:
+            return parse_chunk(gzip.decompress(f.read()))
+
+    def save(self, run_id, series):
+        """
+        归档一次运行的规范化序列 / Archive the normalized series of one run
+
+        Args:
+            run_id (str): 运行ID
+            series (pd.DataFrame): 规范化序列（series_id, period, value, unit, source, fetched_at）
+
+        Returns:
+            dict: {'run_id', 'series', 'chunks', 'chunks_written', 'bytes_written'}
+        """
+        manifest = {
+            'run_id': run_id,
+            'created_at': datetime.now().strftime(TIMESTAMP_FORMAT),
+            'series': {},
+        }
+        chunks = written = bytes_written = 0
+
+        ordered = series.sort_values(['series_id', 'period'], kind='stable')
+        for series_id, group in ordered.groupby('series_id', sort=True):
+            entry = {
+                'unit': str(group['unit'].iloc[0]),
+                'source': str(group['source'].iloc[0]),
+                'fetched_at': group['fetched_at'].max().strftime(TIMESTAMP_FORMAT),
+                'rows': int(len(group)),
+                'chunks': {},
+            }
+            for year, chunk in group.groupby(group['period'].dt.year, sort=True):
+                data = chunk_bytes(chunk)
+                content_hash = hashlib.sha256(data).hexdigest()
+                entry['chunks'][str(year)] = content_hash
+                chunks += 1
+                if self._write_object(content_hash, data):
+                    written += 1
+                    bytes_written += os.path.getsize(self.object_path(content_hash))
+            manifest['series'][str(series_id)] = entry
+
+        # 清单最后写出，数据块齐全后运行才可见 / The manifest goes last so a run is visible only once its chunks exist
+        os.makedirs(self.runs_dir, exist_ok=True)
+        path = self.manifest_path(run_id)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(path + '.tmp', path)
+
+        return {'run_id': run_id, 'series': len(manifest['series']), 'chunks': chunks,
+                'chunks_written': written, 'bytes_written': bytes_written}
+
+    def diff(self, old_run, new_run, include_all=False):
+        """
+        比较两次运行的观测值 / Compare the observations of two runs
+
+        只加载哈希不同的数据块，相同的年份直接跳过。
+        Only chunks whose hashes differ are loaded; identical years are skipped.
+
+        Args:
+            old_run (str): 旧运行ID（或 latest / previous）
+            new_run (str): 新运行ID（或 latest / previous）
+            include_all (bool): 同时列出新增和删除的观测值（默认只列出修订）
+
+        Returns:
+            tuple: (diff数据框 DIFF_COLUMNS, 统计 {'chunks_compared', 'chunks_loaded'})
+        """
+        old_series = self.load_manifest(old_run)['series']
+        new_series = self.load_manifest(new_run)['series']
+
+        frames, compared, loaded = [], 0, 0
+        for series_id in sorted(set(old_series) | set(new_series)):
+            old_chunks = old_series.get(series_id, {}).get('chunks', {})
+            new_chunks = new_series.get(series_id, {}).get('chunks', {})
+            for year in sorted(set(old_chunks) | set(new_chunks)):
+                compared += 1
+                old_hash, new_hash = old_chunks.get(year), new_chunks.get(year)
+                if old_hash == new_hash:
+                    continue
+
+                old_df = self.read_chunk(old_hash) if old_hash else parse_chunk(b'period,value\n')
+                new_df = self.read_chunk(new_hash) if new_hash else parse_chunk(b'period,value\n')
+                loaded += bool(old_hash) + bool(new_hash)
+
+                merged = old_df.merge(new_df, on='period', how='outer', suffixes=('_old', '_new'), indicator=True)
+                change = pd.Series(CHANGE_REVISED, index=merged.index)
+                change[merged['_merge'] == 'right_only'] = CHANGE_ADDED
+                change[merged['_merge'] == 'left_only'] = CHANGE_REMOVED
+                both = merged['_merge'] == 'both'
+                revised = both & (merged['value_old'].ne(merged['value_new'])
+                                  & ~(merged['value_old'].isna() & merged['value_new'].isna()))
+                keep = revised | (~both if include_all else False)
+                if keep.any():
+                    frames.append(pd.DataFrame({
+                        'series_id': series_id,
+                        'period': merged.loc[keep, 'period'],
+                        'change': change[keep],
+                        'old_value': merged.loc[keep, 'value_old'],
+                        'new_value': merged.loc[keep, 'value_new'],
+                    }))
+
+        stats = {'chunks_compared': compared, 'chunks_loaded': loaded}
+        if not frames:
+            return pd.DataFrame(columns=DIFF_COLUMNS), stats
+        result = pd.concat(frames, ignore_index=True)
+        return result.sort_values(['series_id', 'period'], kind='stable').reset_index(drop=True), stats
+
+
+def cmd_list(args):
+    """列出已归档的运行 / List archived runs"""
+    archive = SnapshotArchive(args.snapshot_dir)
+    runs = archive.list_runs()
+    if not runs:
+        print(f"⚠️  没有已归档的运行 / No archived runs in {args.snapshot_dir}")
+        return 0
+
+    seen = set()
+    for run_id in runs:
+        manifest = archive.load_manifest(run_id)
+        hashes = [h for entry in manifest['series'].values() for h in entry['chunks'].values()]
+        new = len(set(hashes) - seen)
+        seen.update(hashes)
+        rows = sum(entry['rows'] for entry in manifest['series'].values())
+        print(f"📦 {run_id}  {manifest['created_at']}  {len(manifest['series'])} 个序列 / series, "
+              f"{rows} 行 / rows, {len(hashes)} 个数据块 / chunks ({new} 个新增 / new)")
+    return 0
+
+
+def cmd_diff(args):
+    """列出两次运行之间的修订 / List revisions between two runs"""
+    archive = SnapshotArchive(args.snapshot_dir)
+    try:
+        old_run, new_run = archive.resolve_run(args.old), archive.resolve_run(args.new)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    result, stats = archive.diff(old_run, new_run, include_all=args.all)
+    print(f"🔍 {old_run} → {new_run}: 比较 / compared {stats['chunks_compared']} 个数据块 / chunks, "
+          f"加载 / loaded {stats['chunks_loaded']}")
+    if result.empty:
+        print("✅ 没有变化 / No changes")
+        return 0
+
+    if args.output:
+        result.to_csv(args.output, index=False, encoding='utf-8')
+        print(f"💾 已保存 / Saved: {args.output}")
+    else:
+        display = result.assign(period=result['period'].dt.strftime(PERIOD_FORMAT))
+        print(display.to_string(index=False))
+    counts = result['change'].value_counts()
+    print("📊 " + ", ".join(f"{change}: {counts[change]}" for change in counts.index))
+    return 0
+
+
+def main():
+    """主函数 / Main function"""
+    parser = argparse.ArgumentParser(description="快照归档 / Snapshot Archive")
+    parser.add_argument('--snapshot-dir', default="snapshots", help="快照目录 / Snapshot directory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help="列出已归档的运行 / list archived runs")
+    list_parser.set_defaults(func=cmd_list)
+
+    diff_parser = subparsers.add_parser('diff', help="列出两次运行之间修订的观测值 / list revised observations between two runs")
+    diff_parser.add_argument('old', help="旧运行ID或 previous / old run ID or previous")
+    diff_parser.add_argument('new', nargs='?', default='latest', help="新运行ID或 latest / new run ID or latest")
+    diff_parser.add_argument('--all', action='store_true',
+                             help="同时列出新增和删除的观测值 / also list added and removed observations")
+    diff_parser.add_argument('--output', help="保存为CSV / save as CSV")
+    diff_parser.set_defaults(func=cmd_diff)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+        // 三个页面共用的Chart.js配置 / Chart.js config shared by the three pages
+        if (window.ChartZoom) {
+            Chart.register(ChartZoom);
+        }
+        
+        // 图表数据的数值列（单个序列或多个序列）/ Value columns of a payload, one or several series
+        function payloadColumns(payload) {
+            return payload.values ? [payload.values] : Object.values(payload.series);
+        }
+        
+        // 总览绘制的点：服务器端LTTB选出的 overview，没有时为全部点
+        // Points drawn in the overview: the server-side LTTB overview, or every point
+        function overviewIndices(payload) {
+            return payload.overview || payload.labels.map((_, i) => i);
+        }
+        
+        // 范围 [start, end) 内非空点的LTTB降采样（与 chart_payload.lttb_indices 相同的分桶）
+        // LTTB over the non-null points in [start, end), bucketed like chart_payload.lttb_indices
+        function lttbRange(values, start, end, budget) {
+            const points = [];
+            for (let i = start; i < end; i++) {
+                if (values[i] !== null) {
+                    points.push(i);
+                }
+            }
+            const n = points.length;
+            if (n <= budget) {
+                return points;
+            }
+            const edge = b => Math.floor(1 + b * (n - 2) / (budget - 2));
+            const kept = [points[0]];
+            let a = points[0];
+            for (let b = 0; b < budget - 2; b++) {
+                let nextX = points[n - 1];
+                let nextY = values[nextX];
+                if (b < budget - 3) {
+                    nextX = 0;
+                    nextY = 0;
+                    for (let j = edge(b + 1); j < edge(b + 2); j++) {
+                        nextX += points[j];
+                        nextY += values[points[j]];
+                    }
+                    nextX /= edge(b + 2) - edge(b + 1);
+                    nextY /= edge(b + 2) - edge(b + 1);
+                }
+                let best = a;
+                let bestArea = -1;
+                for (let j = edge(b); j < edge(b + 1); j++) {
+                    const p = points[j];
+                    const area = Math.abs((a - nextX) * (values[p] - values[a]) - (a - p) * (nextY - values[a]));
+                    if (area > bestArea) {
+                        bestArea = area;
+                        best = p;
+                    }
+                }
+                a = best;
+                kept.push(a);
+            }
+            kept.push(points[n - 1]);
+            return kept;
+        }
+        
+        // 可见范围 [start, end) 的完整分辨率切片，超过点数预算时取各序列LTTB点的并集；
+        // 两侧各多留一个可见宽度的总览点，便于继续缩小
+        // Full-resolution slice of the visible range [start, end), or the union of each series' LTTB
+        // points when over the point budget; overview points one visible width to either side are
+        // kept so that zooming back out keeps working
+        function detailIndices(payload, start, end) {
+            const width = end - start;
+            const kept = new Set([start, end - 1]);
+            payloadColumns(payload).forEach(values => {
+                lttbRange(values, start, end, payload.maxPoints).forEach(i => kept.add(i));
+            });
+            overviewIndices(payload).forEach(i => {
+                if ((i < start && i >= start - width) || (i >= end && i < end + width)) {
+                    kept.add(i);
+                }
+            });
+            return Array.from(kept).sort((a, b) => a - b);
+        }
+        
+        function showIndices(chart, payload, indices) {
+            chart.data.labels = indices.map(i => payload.labels[i]);
+            payloadColumns(payload).forEach((values, k) => {
+                chart.data.datasets[k].data = indices.map(i => values[i]);
+            });
+        }
+        
+        // 缩放：滚轮或拖动放大，放大后换成可见范围的切片 / Zoom with the wheel or by dragging, then swap in a slice of the visible range
+        function zoomOptions(payload) {
+            return {
+                zoom: {
+                    wheel: {
+                        enabled: true,
+                        speed: 0.1
+                    },
+                    drag: {
+                        enabled: true,
+                        backgroundColor: 'rgba(54, 162, 235, 0.1)',
+                        borderColor: 'rgba(54, 162, 235, 0.8)',
+                        borderWidth: 1
+                    },
+                    mode: 'x',
+                    onZoomComplete: function({chart}) {
+                        if (!payload.overview) {
+                            return;
+                        }
+                        const labels = chart.data.labels;
+                        const first = labels[Math.max(0, Math.ceil(chart.scales.x.min))];
+                        const last = labels[Math.min(labels.length - 1, Math.floor(chart.scales.x.max))];
+                        showIndices(chart, payload, detailIndices(payload, payload.labels.indexOf(first),
+                                                                  payload.labels.indexOf(last) + 1));
+                        chart.options.scales.x.min = first;
+                        chart.options.scales.x.max = last;
+                        chart.update('none');
+                    }
+                }
+            };
+        }
+        
+        // 折线图：初始绘制总览，双击还原缩放 / Line chart drawing the overview first; double-click resets the zoom
+        function lineChart(canvasId, payload, datasets, options) {
+            const chart = new Chart(document.getElementById(canvasId).getContext('2d'), {
+                type: 'line',
+                data: {
+                    labels: [],
+                    datasets: datasets
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    plugins: {
+                        zoom: zoomOptions(payload),
+                        legend: {
+                            display: true,
+                            position: 'top',
+                            labels: {
+                                usePointStyle: true,
+                                padding: 20,
+                                font: {
+                                    size: options.legendSize || 14
+                                }
+                            }
+                        },
+                        tooltip: {
+                            mode: 'index',
+                            intersect: false,
+                            backgroundColor: 'rgba(0,0,0,0.8)',
+                            titleColor: '#fff',
+                            bodyColor: '#fff',
+                            borderColor: options.accent,
+                            borderWidth: 1,
+                            callbacks: {
+                                label: options.tooltipLabel
+                            }
+                        }
+                    },
+                    scales: {
+                        x: {
+                            grid: {
+                                color: 'rgba(0,0,0,0.1)'
+                            },
+                            ticks: {
+                                maxTicksLimit: options.maxTicks
+                            }
+                        },
+                        y: {
+                            grid: {
+                                color: 'rgba(0,0,0,0.1)'
+                            },
+                            ticks: {
+                                callback: options.yTick
+                            }
+                        }
+                    },
+                    interaction: {
+                        mode: 'nearest',
+                        axis: 'x',
+                        intersect: false
+                    }
+                }
+            });
+            showIndices(chart, payload, overviewIndices(payload));
+            chart.update('none');
+            chart.canvas.addEventListener('dblclick', () => {
+                if (chart.resetZoom) {
+                    chart.resetZoom('none');
+                }
+                chart.options.scales.x.min = undefined;
+                chart.options.scales.x.max = undefined;
+                showIndices(chart, payload, overviewIndices(payload));
+                chart.update('none');
+            });
+            return chart;
+        }
+        
+        // 单个序列的面积线（数据由 lineChart 填入）/ Filled line of a single series; lineChart fills in the data
+        function areaDataset(label, color, fillColor) {
+            return {
+                label: label,
+                borderColor: color,
+                backgroundColor: fillColor,
+                borderWidth: 3,
+                fill: true,
+                tension: 0.4,
+                pointBackgroundColor: color,
+                pointBorderColor: '#fff',
+                pointBorderWidth: 2,
+                pointRadius: 4,
+                pointHoverRadius: 6
+            };
+        }
+        
+        // 单个序列的变化率线 / Change line of a single series
+        function changeDataset(label, color, fillColor) {
+            return {
+                label: label,
+                borderColor: color,
+                backgroundColor: fillColor,
+                borderWidth: 2,
+                fill: true,
+                tension: 0.3,
+                pointRadius: 0,
+                spanGaps: false
+            };
+        }
+        
+        // 共用时间轴的多个序列，按顺序取色 / Several series on one axis, colored in order
+        function seriesDatasets(series, colors, style) {
+            return Object.keys(series).map((label, i) => Object.assign({
+                label: label,
+                borderColor: colors[i % colors.length],
+                backgroundColor: colors[i % colors.length] + '20',
+                fill: false
+            }, style));
+        }
+        
+        function percentLabel(context) {
+            return context.dataset.label + ': ' + context.parsed.y.toFixed(2) + '%';
+        }
+        
+        function percentTick(value) {
+            return value.toFixed(1) + '%';
+        }
\ No newline at end of file
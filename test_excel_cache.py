@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel旁路缓存测试 / Excel sidecar cache tests
+
+运行 / Run:
+    python -m pytest -q test_excel_cache.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from excel_cache import ExcelSidecarCache
+from output_sinks import CsvSink, ExcelSink
+from provenance import add_provenance
+
+
+def written_sheets():
+    """与main写出的工作表类型相同的数据框 / Frames with the same kinds of columns main writes"""
+    data = pd.DataFrame({
+        'Date': pd.date_range('1999-01-01', periods=24, freq='MS'),
+        'Value': np.linspace(0.5979, 2.1, 24),
+        'Volume': np.arange(24, dtype=float),
+        'Gaps': [np.nan if i % 5 == 0 else i * 1.5 for i in range(24)],
+        'Change': [np.inf if i == 3 else -np.inf if i == 4 else i / 7 for i in range(24)],
+        'Period': [f"1999M{i % 12 + 1:02d}" for i in range(24)],
+        'Code': [str(100 + i) for i in range(24)],
+    })
+    add_provenance(data, 'func1/output/rubber_prices.txt', 'Rubber', '2026-01-01 00:00:00')
+    summary = pd.DataFrame([{
+        'Module': 'func1', 'Rows': 24, 'Merge_Seconds': 0.0, 'Read_Seconds': 0.25, 'Note': None,
+    }])
+    return {'Summary': summary, 'Rubber_TSR20': data, 'Empty': pd.DataFrame({'Date': pd.Series([], dtype=object)})}
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_primed_read_equals_read_excel(tmp_path, streaming):
+    workbook = str(tmp_path / "integrated_data.xlsx")
+    cache = ExcelSidecarCache(str(tmp_path / ".excel_cache"))
+    ExcelSink(workbook, prime_cache=False, streaming=streaming).write(written_sheets())
+    cache.store(workbook, written_sheets())
+
+    primed = cache.read(workbook, sheet_name=None)
+    assert cache.stats == {'hits': 1, 'misses': 0}
+    parsed = pd.read_excel(workbook, sheet_name=None)
+    assert list(primed) == list(parsed)
+    for name in parsed:
+        pd.testing.assert_frame_equal(primed[name], parsed[name], check_exact=True)
+
+
+def test_csv_export_from_workbook_is_unchanged(tmp_path):
+    workbook = str(tmp_path / "integrated_data.xlsx")
+    ExcelSink(workbook, prime_cache=False).write(written_sheets())
+    sink = CsvSink(str(tmp_path / "csv_output"))
+
+    # main直接导出后，export_to_csv从工作簿导出时没有变化 / After main exports directly, exporting from the workbook changes nothing
+    assert all(result['written'] for result in sink.export(written_sheets()))
+    results = sink.export(pd.read_excel(workbook, sheet_name=None))
+    assert results and not any(result['written'] for result in results)
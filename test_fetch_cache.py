@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据源变更检测缓存测试（本地替身HTTP服务器）/ Fetch cache tests against a local stand-in HTTP server
+
+运行 / Run:
+    python -m pytest -q test_fetch_cache.py
+"""
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fetch_cache import FetchCache
+
+
+class StandInSource:
+    """可修改内容的替身数据源 / Stand-in source whose content can be changed"""
+
+    def __init__(self, content, etag=True):
+        self.content = content
+        # 是否发送ETag并响应If-None-Match / Whether to send an ETag and honour If-None-Match
+        self.etag = etag
+        self.requests = 0
+
+    def current_etag(self):
+        return '"' + hashlib.sha256(self.content).hexdigest()[:16] + '"'
+
+
+@pytest.fixture
+def source():
+    """启动本地替身服务器，返回 (数据源, URL) / Start the local stand-in server and yield (source, URL)"""
+    stand_in = StandInSource(b"period,value\n2025-01,1.61\n")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            stand_in.requests += 1
+            etag = stand_in.current_etag()
+            if stand_in.etag and self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            if stand_in.etag:
+                self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(stand_in.content)))
+            self.end_headers()
+            self.wfile.write(stand_in.content)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield stand_in, f"http://127.0.0.1:{server.server_address[1]}/CMO-Historical-Data-Monthly.xlsx"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_new_not_modified_changed(source, tmp_path):
+    stand_in, url = source
+    cache = FetchCache(str(tmp_path / "fetch_cache.json"))
+
+    probe = cache.probe(url, ttl_hours=0)
+    assert (probe['changed'], probe['reason']) == (True, 'new')
+    cache.commit(probe)
+
+    # 服务器按ETag返回304 / The server answers 304 for the stored ETag
+    probe = cache.probe(url, ttl_hours=0)
+    assert (probe['changed'], probe['reason']) == (False, 'not_modified')
+    cache.commit(probe)
+
+    stand_in.content += b"2025-02,1.67\n"
+    probe = cache.probe(url, ttl_hours=0)
+    assert (probe['changed'], probe['reason']) == (True, 'content_changed')
+    # 探测结果只保留哈希和长度，不保留内容 / The probe result keeps the hash and length, not the content
+    assert probe['entry']['content_hash'] == hashlib.sha256(stand_in.content).hexdigest()
+    assert probe['entry']['content_length'] == len(stand_in.content)
+    assert stand_in.content not in probe['entry'].values()
+
+
+def test_fetch_returns_changed_content(source, tmp_path):
+    stand_in, url = source
+    cache = FetchCache(str(tmp_path / "fetch_cache.json"))
+
+    assert cache.fetch(url, ttl_hours=0) == (True, stand_in.content)
+    assert cache.fetch(url, ttl_hours=0) == (False, None)
+    stand_in.content += b"2025-02,1.67\n"
+    assert cache.fetch(url, ttl_hours=0) == (True, stand_in.content)
+
+
+def test_uncommitted_probe_is_not_a_baseline(source, tmp_path):
+    stand_in, url = source
+    cache = FetchCache(str(tmp_path / "fetch_cache.json"))
+
+    cache.probe(url, ttl_hours=0)
+    # 模块失败时不提交，下一次仍视为新数据源 / Not committed when the module fails, so it is still new next time
+    probe = cache.probe(url, ttl_hours=0)
+    assert (probe['changed'], probe['reason']) == (True, 'new')
+
+
+def test_same_hash_without_etag(source, tmp_path):
+    stand_in, url = source
+    stand_in.etag = False
+    cache = FetchCache(str(tmp_path / "fetch_cache.json"))
+
+    cache.commit(cache.probe(url, ttl_hours=0))
+    probe = cache.probe(url, ttl_hours=0)
+    assert (probe['changed'], probe['reason']) == (False, 'same_hash')
+
+
+def test_ttl_skips_the_request(source, tmp_path):
+    stand_in, url = source
+    cache_file = str(tmp_path / "fetch_cache.json")
+    FetchCache(cache_file).commit(FetchCache(cache_file).probe(url, ttl_hours=24))
+    requests = stand_in.requests
+
+    # 重新加载的缓存在TTL内不发请求，即使内容已变化 / A reloaded cache within its TTL sends no request, even if the content changed
+    stand_in.content += b"2025-02,1.67\n"
+    probe = FetchCache(cache_file).probe(url, ttl_hours=24)
+    assert (probe['changed'], probe['reason']) == (False, 'ttl')
+    assert stand_in.requests == requests
+
+    probe = FetchCache(cache_file).probe(url, ttl_hours=0)
+    assert (probe['changed'], probe['reason']) == (True, 'content_changed')
+
+
+def test_unreachable_source_counts_as_changed(tmp_path):
+    cache = FetchCache(str(tmp_path / "fetch_cache.json"), timeout=2)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), BaseHTTPRequestHandler)
+    port = server.server_address[1]
+    server.server_close()
+
+    probe = cache.probe(f"http://127.0.0.1:{port}/missing.xlsx", ttl_hours=0)
+    assert probe['changed'] and probe['entry'] is None
+    assert probe['reason'].startswith('error')
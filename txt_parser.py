@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文本数据向量化解析 / Vectorized Text Data Parser
+解析 rubber_prices.txt 格式（例如 "1999M01: 0.5979 $/kg"）的文件，结果与逐行解析完全一致：
+跳过空行和#注释行，按第一个冒号拆分，冒号后的第一个词转换为float，无法转换的行被丢弃
+Parses rubber_prices.txt-style files (e.g. "1999M01: 0.5979 $/kg") with output identical to
+the line-by-line reader: blank and # comment lines are skipped, lines split on the first
+colon, the first token after it becomes a float and rows that fail conversion are dropped
+
+整个文件一次读入，用预编译的多行正则在全文上一次提取日期列和数值列（不逐行切分字符串），
+数值列整体转换。
+The whole file is read at once and precompiled multiline regexes pull the date column and
+the value column out of the full text in one scan each (no per-line splitting); the value
+column is converted in one go.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# 有效行：首个非空白字符不是#，第一个冒号后同一行内有一个词
+# A valid line: its first non-blank character is not #, and a token follows the first colon on the same line
+
+# 日期（含尾部空白）/ Date, trailing whitespace included
+TXT_DATE_PATTERN = re.compile(r'^[^\S\n]*([^\s#:][^:\n]*)?(?=:[^\S\n]*\S)', re.MULTILINE)
+# 数值词；与日期匹配完全相同的行，两列一一对应 / Value token; matches exactly the same lines, so the columns line up
+TXT_VALUE_PATTERN = re.compile(r'^[^\S\n]*(?:[^\s#:][^:\n]*)?:[^\S\n]*(\S+)', re.MULTILINE)
+
+
+def _float_or_none(token):
+    """float()转换，失败时为None / float(), None where it fails"""
+    try:
+        return float(token)
+    except ValueError:
+        return None
+
+
+def parse_text_columns(text):
+    """
+    按列解析文本 / Parse text column-wise
+
+    Args:
+        text (str): 文件内容（已按文本模式解码，换行为 \\n）
+
+    Returns:
+        pd.DataFrame: Date/Value 数据框；没有有效行时返回空数据框
+    """
+    dates = TXT_DATE_PATTERN.findall(text)
+    tokens = TXT_VALUE_PATTERN.findall(text)
+    if not tokens:
+        return pd.DataFrame()
+
+    try:
+        values = np.fromiter(map(float, tokens), dtype=np.float64, count=len(tokens))
+    except ValueError:
+        # 丢弃float()无法转换的行（如 n/a）/ Drop rows whose token float() rejects, such as n/a
+        converted = [_float_or_none(token) for token in tokens]
+        dates = [date for date, value in zip(dates, converted) if value is not None]
+        values = np.array([value for value in converted if value is not None], dtype=np.float64)
+        if not dates:
+            return pd.DataFrame()
+
+    return pd.DataFrame({'Date': [date.rstrip() for date in dates], 'Value': values})
+
+
+def read_txt_columns(file_path):
+    """
+    读取文本数据文件为 Date/Value 数据框 / Read a text data file into a Date/Value DataFrame
+
+    Args:
+        file_path (str): 文件路径
+
+    Returns:
+        pd.DataFrame: 数据框；没有有效行时返回空数据框
+    """
+    # 文本模式读取：换行与逐行读取一致（\r\n 和 \r 转换为 \n）/ Text mode gives the same newlines as line-by-line reading
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return parse_text_columns(f.read())